@@ -6,6 +6,4 @@ set -eu
 SCRIPT_DIR=$(dirname "$(readlink -f "$0")")
 
 
-make -j1 "$@" | ts '[%H:%M:%.S]' | tee compile-log.txt
-
-"${SCRIPT_DIR}"/maketime/main.py --compilelogfile "compile-log.txt"
+"${SCRIPT_DIR}"/maketime/main.py run --outlogfile "compile-log.txt" -- make -j1 "$@"
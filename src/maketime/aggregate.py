@@ -0,0 +1,223 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import csv
+import glob
+import logging
+from array import array
+from typing import Any, Dict, List
+from concurrent.futures import ProcessPoolExecutor
+
+from maketime.backend import get_backend
+from maketime.store import CompileStore, MICROSECONDS_PER_SECOND
+
+try:
+    ## optional dependency
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+STATS_COLUMNS = ["object", "count", "total", "mean", "p50", "p95", "max", "variance"]
+
+
+class TimesCollector:
+    """Collect compilation times of objects from many logs.
+
+    Times are stored in two flat columns: interned object id and time in microseconds.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self.object_ids = array("I")
+        self.times = array("q")
+
+    def add_store(self, store: CompileStore):
+        name_ids = self._name_ids
+        names = self.names
+        object_ids = self.object_ids
+        get_object_name = store.get_object_name
+        for index in range(store.objects_num()):
+            name = get_object_name(index)
+            name_id = name_ids.get(name)
+            if name_id is None:
+                name_id = len(names)
+                name_ids[name] = name_id
+                names.append(name)
+            object_ids.append(name_id)
+        self.times.extend(store.obj_time)
+
+    ## returns list of rows (columns as in STATS_COLUMNS) sorted by total time descending
+    def get_stats(self, use_numpy=True) -> List[List[Any]]:
+        if not self.times:
+            return []
+        if use_numpy and numpy is not None:
+            stats_list = calculate_stats_numpy(self.object_ids, self.times)
+        else:
+            stats_list = calculate_stats(self.object_ids, self.times)
+        rows_list = []
+        for name_id, stats in stats_list:
+            rows_list.append([self.names[name_id]] + stats)
+        rows_list.sort(key=lambda item: item[2], reverse=True)
+        return rows_list
+
+
+## returns list of tuples: (object id, [count, total, mean, p50, p95, max, variance])
+def calculate_stats_numpy(object_ids, times) -> List[Any]:
+    ids_array = numpy.frombuffer(object_ids, dtype=numpy.uint32)
+    times_array = numpy.frombuffer(times, dtype=numpy.int64)
+    ## sort by object, then by time
+    order = numpy.lexsort((times_array, ids_array))
+    ids_array = ids_array[order]
+    times_array = times_array[order]
+
+    starts = numpy.flatnonzero(numpy.concatenate(([True], ids_array[1:] != ids_array[:-1])))
+    counts = numpy.diff(numpy.append(starts, len(ids_array)))
+    ## sum of integer microseconds is exact
+    totals = numpy.add.reduceat(times_array, starts) / MICROSECONDS_PER_SECOND
+    times_array = times_array / MICROSECONDS_PER_SECOND
+    means = totals / counts
+    maxs = times_array[starts + counts - 1]
+    deviations = times_array - numpy.repeat(means, counts)
+    variances = numpy.add.reduceat(deviations * deviations, starts) / counts
+    p50 = percentile_sorted_numpy(times_array, starts, counts, 0.5)
+    p95 = percentile_sorted_numpy(times_array, starts, counts, 0.95)
+
+    columns = zip(
+        ids_array[starts].tolist(),
+        counts.tolist(),
+        totals.tolist(),
+        means.tolist(),
+        p50.tolist(),
+        p95.tolist(),
+        maxs.tolist(),
+        variances.tolist(),
+    )
+    return [(item[0], list(item[1:])) for item in columns]
+
+
+## linear interpolation between closest ranks of groups of sorted values
+def percentile_sorted_numpy(values, starts, counts, fraction):
+    position = (counts - 1) * fraction
+    lower = numpy.floor(position).astype(numpy.int64)
+    upper = numpy.minimum(lower + 1, counts - 1)
+    lower_values = values[starts + lower]
+    upper_values = values[starts + upper]
+    return lower_values + (upper_values - lower_values) * (position - lower)
+
+
+## pure Python variant of 'calculate_stats_numpy'
+def calculate_stats(object_ids, times) -> List[Any]:
+    groups: Dict[int, List[int]] = {}
+    for name_id, value in zip(object_ids, times):
+        values_list = groups.get(name_id)
+        if values_list is None:
+            values_list = []
+            groups[name_id] = values_list
+        values_list.append(value)
+
+    ret_list = []
+    for name_id in sorted(groups):
+        values_list = sorted(groups[name_id])
+        count = len(values_list)
+        ## sum of integer microseconds is exact
+        total = sum(values_list) / MICROSECONDS_PER_SECOND
+        values_list = [value / MICROSECONDS_PER_SECOND for value in values_list]
+        mean = total / count
+        variance = sum((value - mean) * (value - mean) for value in values_list) / count
+        stats = [
+            count,
+            total,
+            mean,
+            percentile_sorted(values_list, 0.5),
+            percentile_sorted(values_list, 0.95),
+            values_list[-1],
+            variance,
+        ]
+        ret_list.append((name_id, stats))
+    return ret_list
+
+
+def percentile_sorted(values_list, fraction):
+    position = (len(values_list) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values_list) - 1)
+    return values_list[lower] + (values_list[upper] - values_list[lower]) * (position - lower)
+
+
+## ===================================================================
+
+
+## paths: list of directories, files or glob patterns
+def find_logs(paths: List[str]) -> List[str]:
+    ret_list = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dir_entry in sorted(os.scandir(path), key=lambda item: item.name):
+                if dir_entry.is_file():
+                    ret_list.append(dir_entry.path)
+        elif os.path.isfile(path):
+            ret_list.append(path)
+        else:
+            ret_list.extend(sorted(item for item in glob.glob(path, recursive=True) if os.path.isfile(item)))
+    return ret_list
+
+
+## returns store of parsed log, None if log can not be parsed
+def read_log_store(log_path: str) -> CompileStore:
+    try:
+        build_log = get_backend(log_path).read_build_log(log_path)
+    except (OSError, RuntimeError) as exc:
+        _LOGGER.warning("unable to parse file %s: %s", log_path, exc)
+        return None
+    return build_log.store
+
+
+## parse logs in multiple processes and collect objects times
+def collect_times(logs_list: List[str], jobs: int = None) -> TimesCollector:
+    collector = TimesCollector()
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 2:
+        for log_path in logs_list:
+            store = read_log_store(log_path)
+            if store is not None:
+                collector.add_store(store)
+        return collector
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunk_size = max(1, len(logs_list) // (jobs * 4))
+        for store in executor.map(read_log_store, logs_list, chunksize=chunk_size):
+            if store is not None:
+                collector.add_store(store)
+    return collector
+
+
+def write_stats_csv(rows_list: List[List[Any]], out_path: str):
+    with open(out_path, "w", encoding="utf-8", newline="") as out_file:
+        writer = csv.writer(out_file)
+        writer.writerow(STATS_COLUMNS)
+        writer.writerows(rows_list)
+
+
+def print_stats(rows_list: List[List[Any]], limit: int = None):
+    if limit is not None:
+        rows_list = rows_list[:limit]
+    max_length = max((len(item[0]) for item in rows_list), default=0) + 2
+    lines_list = [f"{'object': <{max_length}} {'count':>6} " + " ".join(f"{label:>12}" for label in STATS_COLUMNS[2:])]
+    for row in rows_list:
+        values = " ".join(f"{value:12.6f}" for value in row[2:])
+        lines_list.append(f"{row[0]: <{max_length}} {row[1]:6} {values}")
+    print("\n".join(lines_list))
@@ -0,0 +1,142 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+from maketime.io import read_log_lines
+from maketime.parser import BuildLog, BytesLineClassifier, parse_build_log, read_compile_log as read_compile_log_serial
+from maketime.multiparser import read_compile_log
+from maketime.ninja import is_ninja_log, read_ninja_build_log, read_ninja_log
+from maketime.records import is_records_dir, read_records_build_log, read_records_compile_list
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+class ParserBackend(ABC):
+    """Interface of parser of build log of given build system.
+
+    Backends fill BuildLog, so results of all backends share the same model of targets and objects.
+    """
+
+    name: str = None
+
+    ## returns True if log can be parsed by backend
+    @abstractmethod
+    def detect(self, log_path: str) -> bool:
+        raise NotImplementedError()
+
+    ## parse whole log in current process
+    @abstractmethod
+    def read_build_log(self, log_path: str, build_log: BuildLog = None) -> BuildLog:
+        raise NotImplementedError()
+
+    ## returns compile list (format of 'get_compile_list') or None if log can not be read
+    ## build_log: BuildLog filled with log entries (e.g. with custom store)
+    @abstractmethod
+    def read_compile_log(
+        self, log_path: str, sort_data=True, *, jobs=1, checkpoint_path: str = None, build_log: BuildLog = None
+    ) -> List[Any]:
+        raise NotImplementedError()
+
+
+class MakeBackend(ParserBackend):
+    """Parser of output of CMake Makefile generator timestamped by 'ts'."""
+
+    name = "make"
+
+    def detect(self, log_path: str) -> bool:
+        ## default backend
+        return True
+
+    def read_build_log(self, log_path: str, build_log: BuildLog = None) -> BuildLog:
+        return parse_build_log(read_log_lines(log_path), BytesLineClassifier(), build_log)
+
+    def read_compile_log(
+        self, log_path: str, sort_data=True, *, jobs=1, checkpoint_path: str = None, build_log: BuildLog = None
+    ) -> List[Any]:
+        if build_log is not None:
+            return read_compile_log_serial(log_path, sort_data, build_log)
+        return read_compile_log(log_path, sort_data, jobs, checkpoint_path)
+
+
+class NinjaBackend(ParserBackend):
+    """Parser of '.ninja_log' of Ninja generator, times of jobs are exact also in parallel builds.
+
+    Only last build recorded in log is taken into account.
+    """
+
+    name = "ninja"
+
+    def detect(self, log_path: str) -> bool:
+        return os.path.isfile(log_path) and is_ninja_log(log_path)
+
+    def read_build_log(self, log_path: str, build_log: BuildLog = None) -> BuildLog:
+        return read_ninja_build_log(log_path, build_log)
+
+    def read_compile_log(
+        self, log_path: str, sort_data=True, *, jobs=1, checkpoint_path: str = None, build_log: BuildLog = None
+    ) -> List[Any]:
+        ## log contains one line per job, so it is parsed in single process
+        del jobs
+        return read_ninja_log(log_path, sort_data, checkpoint_path, build_log)
+
+
+class LauncherBackend(ParserBackend):
+    """Merger of records written by 'maketime-launcher', times of invocations of compiler are exact.
+
+    Log path is directory of record files.
+    """
+
+    name = "launcher"
+
+    def detect(self, log_path: str) -> bool:
+        return is_records_dir(log_path)
+
+    def read_build_log(self, log_path: str, build_log: BuildLog = None) -> BuildLog:
+        return read_records_build_log(log_path, build_log)
+
+    def read_compile_log(
+        self, log_path: str, sort_data=True, *, jobs=1, checkpoint_path: str = None, build_log: BuildLog = None
+    ) -> List[Any]:
+        ## records are small, so they are always read whole
+        del jobs, checkpoint_path
+        return read_records_compile_list(log_path, sort_data, build_log)
+
+
+## backends in order of detection, last one is default
+BACKENDS_DICT: Dict[str, ParserBackend] = {
+    LauncherBackend.name: LauncherBackend(),
+    NinjaBackend.name: NinjaBackend(),
+    MakeBackend.name: MakeBackend(),
+}
+
+BACKEND_NAMES = ["auto"] + list(BACKENDS_DICT.keys())
+
+
+## name: name of backend, if "auto" then backend is detected by content of log
+def get_backend(log_path: str, name: str = "auto") -> ParserBackend:
+    if name != "auto":
+        backend = BACKENDS_DICT.get(name)
+        if backend is None:
+            raise ValueError(f"unsupported backend: {name}")
+        return backend
+    if log_path == "-" or not os.path.exists(log_path):
+        ## standard input can not be inspected
+        return BACKENDS_DICT[MakeBackend.name]
+    for backend in BACKENDS_DICT.values():
+        if backend.detect(log_path):
+            _LOGGER.debug("detected %s backend for file %s", backend.name, log_path)
+            return backend
+    return BACKENDS_DICT[MakeBackend.name]
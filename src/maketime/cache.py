@@ -0,0 +1,190 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import pickle
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, List
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+## increment when format of cached results changes
+CACHE_VERSION = 1
+
+CACHE_SUFFIX = ".pickle"
+
+
+def get_default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME")
+    if not cache_home:
+        cache_home = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "maketime")
+
+
+class ResultCache:
+    """On-disk cache of parsed results of log files.
+
+    Entry is identified by absolute path, size and modification time of log file
+    (optionally also by hash of content) and by parsing options. Results are stored
+    in pickle files. Modification time of entry file is updated on each hit, so least
+    recently used entries are removed first when size of cache exceeds limit.
+
+    Optionally recently used results are also kept in memory (e.g. in long running process).
+    Results kept in memory are shared between callers, so they should not be modified.
+    """
+
+    def __init__(
+        self, cache_dir: str = None, size_limit: int = 256 * 1024 * 1024, use_hash=False, memory_size: int = 0
+    ):
+        self.cache_dir = cache_dir
+        if not self.cache_dir:
+            self.cache_dir = get_default_cache_dir()
+        self.size_limit = size_limit
+        self.use_hash = use_hash
+        ## number of results kept in memory
+        self.memory_size = memory_size
+        self._memory: OrderedDict = OrderedDict()
+
+    ## returns cached result, calls 'parse_function' and stores result on cache miss
+    ## options: parsing options affecting result (e.g. mode)
+    def get(self, log_path: str, parse_function: Callable[[], Any], options=None):
+        key = self.get_key(log_path, options)
+        if key is None:
+            return parse_function()
+        result = self._memory.get(key)
+        if result is not None:
+            _LOGGER.debug("using result of file %s kept in memory", log_path)
+            self._memory.move_to_end(key)
+            return result
+        entry_path = self.get_entry_path(key)
+        result = self.load(entry_path, key)
+        if result is not None:
+            _LOGGER.debug("using cached result of file %s", log_path)
+            self.store_memory(key, result)
+            return result
+        result = parse_function()
+        if result is not None:
+            self.store(entry_path, key, result)
+            self.store_memory(key, result)
+        return result
+
+    def store_memory(self, key, result):
+        if self.memory_size < 1:
+            return
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    ## returns None if file can not be cached
+    def get_key(self, log_path: str, options=None):
+        if log_path == "-" or not os.path.isfile(log_path):
+            return None
+        log_path = os.path.abspath(log_path)
+        file_stat = os.stat(log_path)
+        content_hash = None
+        if self.use_hash:
+            content_hash = calculate_file_hash(log_path)
+        return (CACHE_VERSION, log_path, file_stat.st_size, file_stat.st_mtime_ns, content_hash, options)
+
+    def get_entry_path(self, key) -> str:
+        key_hash = hashlib.sha1(repr(key).encode(), usedforsecurity=False).hexdigest()
+        return os.path.join(self.cache_dir, key_hash + CACHE_SUFFIX)
+
+    def load(self, entry_path: str, key):
+        try:
+            with open(entry_path, "rb") as entry_file:
+                entry_key, result = pickle.load(entry_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError) as exc:
+            _LOGGER.warning("removing invalid cache entry %s: %s", entry_path, exc)
+            remove_file(entry_path)
+            return None
+        if entry_key != key:
+            ## collision of names
+            return None
+        try:
+            ## mark as recently used
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return result
+
+    def store(self, entry_path: str, key, result):
+        entry_file = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            ## write to temporary file and rename, so other processes never see partial entry
+            with tempfile.NamedTemporaryFile("wb", dir=self.cache_dir, suffix=".tmp", delete=False) as entry_file:
+                pickle.dump((key, result), entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(entry_file.name, entry_path)
+        except OSError as exc:
+            _LOGGER.warning("unable to store cache entry %s: %s", entry_path, exc)
+            if entry_file is not None:
+                remove_file(entry_file.name)
+            return
+        self.evict()
+
+    ## remove least recently used entries exceeding size limit
+    def evict(self):
+        entries_list = self.get_entries()
+        total_size = sum(item[2] for item in entries_list)
+        if total_size <= self.size_limit:
+            return
+        entries_list.sort()
+        for _, entry_path, entry_size in entries_list:
+            if total_size <= self.size_limit:
+                break
+            remove_file(entry_path)
+            total_size -= entry_size
+
+    ## returns list of tuples (access time, path, size)
+    def get_entries(self) -> List[Any]:
+        entries_list = []
+        try:
+            dir_entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return entries_list
+        for dir_entry in dir_entries:
+            if not dir_entry.name.endswith(CACHE_SUFFIX):
+                continue
+            try:
+                entry_stat = dir_entry.stat()
+            except OSError:
+                continue
+            entries_list.append((entry_stat.st_mtime_ns, dir_entry.path, entry_stat.st_size))
+        return entries_list
+
+    def clear(self):
+        self._memory.clear()
+        for _, entry_path, _ in self.get_entries():
+            remove_file(entry_path)
+
+
+def calculate_file_hash(file_path: str) -> str:
+    content_hash = hashlib.sha256()
+    with open(file_path, "rb") as content_file:
+        for chunk in iter(lambda: content_file.read(1024 * 1024), b""):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def remove_file(file_path: str):
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
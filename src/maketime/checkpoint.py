@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import pickle
+import hashlib
+import logging
+from typing import Any, Dict, List
+
+from maketime.io import read_lines_mmap
+from maketime.parser import BuildLog, BytesLineClassifier
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+## increment when format of checkpoint changes
+CHECKPOINT_VERSION = 1
+
+## number of bytes preceding checkpoint offset used to detect replaced or rewritten log
+TAIL_SIZE = 4096
+
+
+class Checkpoint:
+    """State of parsing of append-only log after last complete line."""
+
+    def __init__(self, log_path: str = None):
+        self.version = CHECKPOINT_VERSION
+        self.log_path = log_path
+        ## position after last parsed line
+        self.offset = 0
+        self.tail_hash: str = None
+        self.build_log = BuildLog()
+        self.decoder_state: Dict[str, Any] = {}
+
+
+def load_checkpoint(checkpoint_path: str):
+    try:
+        with open(checkpoint_path, "rb") as checkpoint_file:
+            checkpoint = pickle.load(checkpoint_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, pickle.UnpicklingError) as exc:
+        _LOGGER.warning("unable to load checkpoint %s: %s", checkpoint_path, exc)
+        return None
+    if not isinstance(checkpoint, Checkpoint) or checkpoint.version != CHECKPOINT_VERSION:
+        _LOGGER.warning("unsupported checkpoint %s", checkpoint_path)
+        return None
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path: str, checkpoint: Checkpoint):
+    temp_path = checkpoint_path + ".tmp"
+    with open(temp_path, "wb") as checkpoint_file:
+        pickle.dump(checkpoint, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, checkpoint_path)
+
+
+## returns hash of bytes preceding offset
+def calculate_tail_hash(log_path: str, offset: int) -> str:
+    start_pos = max(0, offset - TAIL_SIZE)
+    with open(log_path, "rb") as log_file:
+        log_file.seek(start_pos)
+        content = log_file.read(offset - start_pos)
+    return hashlib.sha1(content, usedforsecurity=False).hexdigest()
+
+
+## returns position after last new line character
+def find_lines_end(log_path: str) -> int:
+    with open(log_path, "rb") as log_file:
+        end_pos = log_file.seek(0, os.SEEK_END)
+        while end_pos > 0:
+            start_pos = max(0, end_pos - TAIL_SIZE)
+            log_file.seek(start_pos)
+            content = log_file.read(end_pos - start_pos)
+            index = content.rfind(b"\n")
+            if index >= 0:
+                return start_pos + index + 1
+            end_pos = start_pos
+    return 0
+
+
+## checkpoint is valid if log still contains parsed content
+def is_checkpoint_valid(checkpoint: Checkpoint, log_path: str) -> bool:
+    if checkpoint.log_path != os.path.abspath(log_path):
+        return False
+    if os.path.getsize(log_path) < checkpoint.offset:
+        ## truncated
+        return False
+    return calculate_tail_hash(log_path, checkpoint.offset) == checkpoint.tail_hash
+
+
+## parse only content appended since last call
+## checkpoint_path: path to file storing state of parsing between calls
+def read_compile_log_resumed(log_path: str, checkpoint_path: str, sort_data=True) -> List[Any]:
+    if not os.path.isfile(log_path):
+        _LOGGER.warning("unable to read content from file '%s'", log_path)
+        return None
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint is not None and not is_checkpoint_valid(checkpoint, log_path):
+        _LOGGER.info("log file %s changed, parsing from beginning", log_path)
+        checkpoint = None
+    if checkpoint is None:
+        checkpoint = Checkpoint(os.path.abspath(log_path))
+
+    classifier = BytesLineClassifier()
+    classifier.decoder.set_state(checkpoint.decoder_state)
+    build_log = checkpoint.build_log
+    classify = classifier.classify
+    add_entry = build_log.add_entry
+
+    ## incomplete last line will be parsed in next call
+    end_pos = find_lines_end(log_path)
+    if end_pos == checkpoint.offset and checkpoint.tail_hash is not None:
+        ## nothing new
+        return build_log.get_compile_list(sort_data)
+    _LOGGER.debug("parsing file %s from %s to %s", log_path, checkpoint.offset, end_pos)
+    for line in read_lines_mmap(log_path, checkpoint.offset, end_pos):
+        add_entry(*classify(line))
+
+    checkpoint.offset = end_pos
+    checkpoint.tail_hash = calculate_tail_hash(log_path, checkpoint.offset)
+    checkpoint.decoder_state = classifier.decoder.get_state()
+    save_checkpoint(checkpoint_path, checkpoint)
+    return build_log.get_compile_list(sort_data)
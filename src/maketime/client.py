@@ -0,0 +1,78 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Thin client of 'maketime serve' daemon. Arguments are the same as of 'maketime'.
+# If daemon is not running or it passes request back (e.g. request reads standard input)
+# then arguments are executed in current process.
+# Module is executed for every request, so it imports only built-in modules and protocol.
+#
+
+import sys
+import os
+import json
+import socket
+
+from maketime.protocol import get_socket_path, encode_message
+
+
+## ===================================================================
+
+
+RECEIVE_SIZE = 1024 * 1024
+
+
+def receive_line(sock) -> bytes:
+    chunks = []
+    while True:
+        chunk = sock.recv(RECEIVE_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    return b"".join(chunks)
+
+
+## returns response of daemon (dict: exit_code, stdout, stderr), None if daemon is not running
+## response contains only 'local' key if request has to be executed by client
+def send_request(args, socket_path: str = None):
+    if socket_path is None:
+        socket_path = get_socket_path()
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        sock.sendall(encode_message({"args": list(args), "cwd": os.getcwd()}))
+        response_data = receive_line(sock)
+    if not response_data:
+        ## e.g. daemon stopped while handling request
+        return None
+    return json.loads(response_data)
+
+
+def main(args=None) -> int:
+    if args is None:
+        args = sys.argv[1:]
+    response = send_request(args)
+    if response is not None and not response.get("local"):
+        sys.stdout.write(response.get("stdout", ""))
+        sys.stderr.write(response.get("stderr", ""))
+        return response.get("exit_code", 1)
+
+    ## pylint: disable=C0415
+    from maketime.main import main as main_local
+
+    return main_local(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import logging
+from typing import Any, Dict, List
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+## returns dict: object name -> compilation time (times of duplicated names are summed)
+def get_objects_times(compile_list: List[Any]) -> Dict[str, float]:
+    times_dict: Dict[str, float] = {}
+    for target_data in compile_list:
+        objects_list = target_data.get("objects")
+        if objects_list is None:
+            continue
+        for object_name, object_time in objects_list:
+            prev_time = times_dict.get(object_name)
+            if prev_time is not None:
+                object_time += prev_time
+            times_dict[object_name] = object_time
+    return times_dict
+
+
+## returns dict: target name -> target data
+def get_targets(compile_list: List[Any]) -> Dict[str, Any]:
+    targets_dict = {}
+    for target_data in compile_list:
+        target_name = target_data.get("target")
+        if target_name is not None:
+            targets_dict[target_name] = target_data
+    return targets_dict
+
+
+def get_total_time(compile_list: List[Any]) -> float:
+    for target_data in compile_list:
+        total_time = target_data.get("total_time")
+        if total_time is not None:
+            return total_time
+    return 0.0
+
+
+def calculate_relative(old_time, new_time):
+    if not old_time:
+        return None
+    return (new_time - old_time) / old_time
+
+
+## returns True if change of time is not lower than thresholds
+def is_significant(old_time, new_time, threshold=0.0, rel_threshold=0.0) -> bool:
+    if abs(new_time - old_time) < threshold:
+        return False
+    relative = calculate_relative(old_time, new_time)
+    if relative is not None and abs(relative) < rel_threshold:
+        return False
+    return True
+
+
+## compare results of two builds
+## threshold: minimal absolute change of time of object, build or link of target in seconds
+## rel_threshold: minimal relative change of time (e.g. 0.1 means 10%)
+## targets are reported if change of build or link time exceeds thresholds
+## returns dict with keys: total_time, objects, new_objects, removed_objects, targets
+def diff_compile_lists(old_list: List[Any], new_list: List[Any], threshold=0.0, rel_threshold=0.0) -> Dict[str, Any]:
+    old_times = get_objects_times(old_list)
+    new_times = get_objects_times(new_list)
+
+    ## hash join by object name
+    changed_list = []
+    new_objects = []
+    for object_name, new_time in new_times.items():
+        old_time = old_times.get(object_name)
+        if old_time is None:
+            new_objects.append((object_name, new_time))
+            continue
+        if not is_significant(old_time, new_time, threshold, rel_threshold):
+            continue
+        delta = new_time - old_time
+        relative = calculate_relative(old_time, new_time)
+        changed_list.append(
+            {"object": object_name, "old_time": old_time, "new_time": new_time, "delta": delta, "relative": relative}
+        )
+    removed_objects = [(name, old_time) for name, old_time in old_times.items() if name not in new_times]
+
+    changed_list.sort(key=lambda item: item["delta"], reverse=True)
+    new_objects.sort(key=lambda item: item[1], reverse=True)
+    removed_objects.sort(key=lambda item: item[1], reverse=True)
+
+    old_targets = get_targets(old_list)
+    new_targets = get_targets(new_list)
+    targets_list = []
+    for target_name, new_data in new_targets.items():
+        old_data = old_targets.get(target_name)
+        if old_data is not None:
+            build_changed = is_significant(old_data["build_time"], new_data["build_time"], threshold, rel_threshold)
+            link_changed = is_significant(old_data["link_time"], new_data["link_time"], threshold, rel_threshold)
+            if not build_changed and not link_changed:
+                continue
+        targets_list.append(diff_targets(target_name, old_data, new_data))
+    for target_name, old_data in old_targets.items():
+        if target_name not in new_targets:
+            targets_list.append(diff_targets(target_name, old_data, None))
+    targets_list.sort(key=lambda item: abs(item["build_delta"]), reverse=True)
+
+    old_total = get_total_time(old_list)
+    new_total = get_total_time(new_list)
+    return {
+        "total_time": {"old_time": old_total, "new_time": new_total, "delta": new_total - old_total},
+        "objects": changed_list,
+        "new_objects": new_objects,
+        "removed_objects": removed_objects,
+        "targets": targets_list,
+    }
+
+
+def diff_targets(target_name, old_data, new_data) -> Dict[str, Any]:
+    old_build = old_data["build_time"] if old_data else None
+    old_link = old_data["link_time"] if old_data else None
+    new_build = new_data["build_time"] if new_data else None
+    new_link = new_data["link_time"] if new_data else None
+    return {
+        "target": target_name,
+        "old_build_time": old_build,
+        "new_build_time": new_build,
+        "build_delta": (new_build or 0.0) - (old_build or 0.0),
+        "old_link_time": old_link,
+        "new_link_time": new_link,
+        "link_delta": (new_link or 0.0) - (old_link or 0.0),
+    }
+
+
+def print_diff(diff_data: Dict[str, Any], limit: int = None):
+    lines_list = []
+    total_data = diff_data["total_time"]
+    lines_list.append(
+        f"total time: {total_data['old_time']:.6f} -> {total_data['new_time']:.6f} sec ({total_data['delta']:+.6f})"
+    )
+
+    targets_list = diff_data["targets"][:limit]
+    if targets_list:
+        lines_list.append("targets:")
+        for item in targets_list:
+            build_text = format_change(item["old_build_time"], item["new_build_time"], item["build_delta"])
+            link_text = format_change(item["old_link_time"], item["new_link_time"], item["link_delta"])
+            lines_list.append(f"   {item['target']}  build: {build_text}  link: {link_text}")
+
+    objects_list = diff_data["objects"][:limit]
+    if objects_list:
+        lines_list.append("changed objects:")
+        max_length = max(len(item["object"]) for item in objects_list) + 2
+        for item in objects_list:
+            relative = item["relative"]
+            relative_text = "" if relative is None else f" {relative * 100:+8.2f}%"
+            lines_list.append(
+                f"   {item['object']: <{max_length}} {item['old_time']:12.6f} -> {item['new_time']:12.6f} sec"
+                f" {item['delta']:+12.6f}{relative_text}"
+            )
+
+    for label, key in (("new objects:", "new_objects"), ("removed objects:", "removed_objects")):
+        objects_list = diff_data[key][:limit]
+        if not objects_list:
+            continue
+        lines_list.append(label)
+        max_length = max(len(item[0]) for item in objects_list) + 2
+        for object_name, object_time in objects_list:
+            lines_list.append(f"   {object_name: <{max_length}} {object_time:12.6f} sec")
+
+    print("\n".join(lines_list))
+
+
+def format_change(old_time, new_time, delta) -> str:
+    old_text = "-" if old_time is None else f"{old_time:.6f}"
+    new_text = "-" if new_time is None else f"{new_time:.6f}"
+    return f"{old_text} -> {new_text} ({delta:+.6f})"
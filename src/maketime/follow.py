@@ -0,0 +1,189 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+import time
+import select
+import logging
+from typing import Any, List
+
+from maketime.parser import BuildLog, BytesLineClassifier, MICROSECONDS_PER_SECOND, PROGRESS_REGEX, calculate_time_diff
+from maketime.store import push_bounded
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+class FollowBuildLog(BuildLog):
+    """BuildLog keeping rolling statistics updated on each finished object and target."""
+
+    def __init__(self, slowest_num=10):
+        super().__init__()
+        self.slowest_num = slowest_num
+        ## min-heaps of (time, name)
+        self.slowest_objects: List[Any] = []
+        self.slowest_targets: List[Any] = []
+        self.objects_num = 0
+
+    def add_object_end(self, end_time):
+        object_name = self._curr_object_name
+        super().add_object_end(end_time)
+        if object_name is None:
+            return
+        self.objects_num += 1
+        object_data = self.store.get_object(-1)
+        push_bounded(self.slowest_objects, (object_data[1], object_data[0]), self.slowest_num)
+
+    def add_target_finish(self, target_name, end_time):
+        super().add_target_finish(target_name, end_time)
+        build_secs = self.store.target_build[-1] / MICROSECONDS_PER_SECOND
+        push_bounded(self.slowest_targets, (build_secs, target_name), self.slowest_num)
+
+    def get_current_object(self):
+        return self._curr_object_name, self._curr_object_time
+
+    def get_target_start(self):
+        return self._target_start
+
+
+class LogFollower:
+    """Follow growing compile log and print rolling report in given interval."""
+
+    def __init__(self, interval=2.0, slowest_num=10, out_stream=None):
+        self.interval = interval
+        self.out_stream = out_stream
+        if self.out_stream is None:
+            self.out_stream = sys.stdout
+        self.build_log = FollowBuildLog(slowest_num)
+        self.classifier = BytesLineClassifier()
+        self.progress = None
+        self._remainder = b""
+
+    ## feed chunk of log content, incomplete last line is kept until next call
+    def feed(self, data: bytes):
+        if not data:
+            return
+        lines = (self._remainder + data).split(b"\n")
+        self._remainder = lines.pop()
+        classify = self.classifier.classify
+        add_entry = self.build_log.add_entry
+        for line in lines:
+            entry = classify(line)
+            add_entry(*entry)
+            if entry[0] is None:
+                continue
+            found = PROGRESS_REGEX.search(line)
+            if found:
+                self.progress = int(found.group(1))
+
+    ## feed rest of data (line without new line character)
+    def flush(self):
+        remainder = self._remainder
+        self._remainder = b""
+        if remainder:
+            self.feed(remainder + b"\n")
+
+    ## returns estimated remaining time in seconds based on progress field
+    def get_remaining_time(self):
+        build_log = self.build_log
+        if not self.progress or build_log.first_time is None:
+            return None
+        elapsed_secs = calculate_time_diff(build_log.first_time, build_log.last_time)
+        return elapsed_secs * (100 - self.progress) / self.progress
+
+    def get_report(self) -> str:
+        build_log = self.build_log
+        lines_list = []
+        if build_log.first_time is None:
+            return "no timestamped entries yet\n"
+
+        elapsed_secs = calculate_time_diff(build_log.first_time, build_log.last_time)
+        progress_text = "unknown" if self.progress is None else f"{self.progress}%"
+        lines_list.append(f"elapsed: {elapsed_secs:.2f} sec   progress: {progress_text}")
+        remaining_secs = self.get_remaining_time()
+        if remaining_secs is not None:
+            lines_list.append(f"estimated remaining: {remaining_secs:.2f} sec")
+        lines_list.append(f"objects: {build_log.objects_num}   targets: {build_log.store.targets_num()}")
+
+        object_name, object_time = build_log.get_current_object()
+        if object_name is not None:
+            object_secs = calculate_time_diff(object_time, build_log.last_time)
+            lines_list.append(f"current object: {object_name} ({object_secs:.2f} sec)")
+        target_start = build_log.get_target_start()
+        if target_start is not None:
+            target_secs = calculate_time_diff(target_start, build_log.last_time)
+            lines_list.append(f"current target elapsed: {target_secs:.2f} sec")
+
+        if build_log.slowest_targets:
+            lines_list.append("slowest targets:")
+            for build_time, target_name in sorted(build_log.slowest_targets, reverse=True):
+                lines_list.append(f"   {build_time:12.6f} sec  {target_name}")
+        if build_log.slowest_objects:
+            lines_list.append("slowest objects:")
+            for object_secs, object_name in sorted(build_log.slowest_objects, reverse=True):
+                lines_list.append(f"   {object_secs:12.6f} sec  {object_name}")
+        return "\n".join(lines_list) + "\n"
+
+    def print_report(self):
+        report = self.get_report()
+        if self.out_stream.isatty():
+            ## clear screen
+            report = "\033[2J\033[H" + report
+        else:
+            report = "\n" + report
+        self.out_stream.write(report)
+        self.out_stream.flush()
+
+    ## follow file (or stdin if log_path is '-') until interrupted or stdin closed
+    def follow(self, log_path: str, poll_interval=0.2):
+        if log_path == "-":
+            self._follow_stream(sys.stdin.buffer.fileno())
+            return
+        with open(log_path, "rb") as log_file:
+            self._follow_file(log_file, poll_interval)
+
+    def _follow_file(self, log_file, poll_interval):
+        next_report = time.monotonic() + self.interval
+        try:
+            while True:
+                data = log_file.read(1024 * 1024)
+                if data:
+                    self.feed(data)
+                else:
+                    time.sleep(poll_interval)
+                curr_time = time.monotonic()
+                if curr_time >= next_report:
+                    self.print_report()
+                    next_report = curr_time + self.interval
+        except KeyboardInterrupt:
+            pass
+        self.flush()
+
+    def _follow_stream(self, file_descriptor):
+        next_report = time.monotonic() + self.interval
+        try:
+            while True:
+                timeout = max(0.0, next_report - time.monotonic())
+                ready, _, _ = select.select([file_descriptor], [], [], timeout)
+                if ready:
+                    data = os.read(file_descriptor, 1024 * 1024)
+                    if not data:
+                        ## end of stream
+                        break
+                    self.feed(data)
+                curr_time = time.monotonic()
+                if curr_time >= next_report:
+                    self.print_report()
+                    next_report = curr_time + self.interval
+        except KeyboardInterrupt:
+            pass
+        self.flush()
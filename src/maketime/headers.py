@@ -0,0 +1,308 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import re
+import csv
+import logging
+from array import array
+from typing import Any, Dict, List
+
+from maketime.store import MICROSECONDS_PER_SECOND, to_microseconds
+
+try:
+    ## optional dependency
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+HEADERS_COLUMNS = ["header", "objects", "total", "mean", "slope", "estimated"]
+
+## dependency file written by compiler next to object (e.g. 'file.cpp.o.d')
+DEPFILE_SUFFIX = ".d"
+
+## dependency files of CMake target placed in 'CMakeFiles/<target>.dir'
+TARGET_DEPFILES = ["compiler_depend.make", "depend.make"]
+
+SOURCE_EXTENSIONS = {".c", ".cc", ".cpp", ".cxx", ".c++", ".C", ".m", ".mm", ".cu"}
+
+## directory of objects of CMake target, e.g.: src/CMakeFiles/<target>.dir/file.cpp.o
+TARGET_DIR_REGEX = re.compile(r"^(.*?)(CMakeFiles/[^/]+\.dir)/")
+
+## rule of Makefile, colon of target has to be followed by whitespace (e.g. not 'C:/file.h')
+RULE_REGEX = re.compile(r"^((?:\\.|[^:\\]|:(?![\s]|$))+):(?:\s+|$)(.*)$")
+TOKEN_REGEX = re.compile(r"(?:\\.|[^\s\\])+")
+
+## absolute path of Windows, e.g.: C:/include/file.h
+DRIVE_PATH_REGEX = re.compile(r"^[A-Za-z]:[/\\]")
+
+
+class HeaderIndex:
+    """Index of headers included by objects.
+
+    Headers and objects are interned to integer ids. Edges are stored in CSR layout: headers of
+    object 'i' are 'edge_headers[edge_offsets[i]:edge_offsets[i + 1]]'.
+    """
+
+    def __init__(self):
+        self.header_names: List[str] = []
+        self._header_ids: Dict[str, int] = {}
+        self.object_names: List[str] = []
+        ## compilation time of objects in microseconds
+        self.object_time = array("q")
+        self.edge_offsets = array("Q", [0])
+        self.edge_headers = array("I")
+
+    def headers_num(self) -> int:
+        return len(self.header_names)
+
+    def objects_num(self) -> int:
+        return len(self.object_names)
+
+    def edges_num(self) -> int:
+        return len(self.edge_headers)
+
+    def add_object(self, name: str, duration: int, headers_list: List[str]):
+        header_ids = self._header_ids
+        header_names = self.header_names
+        ids_set = set()
+        for header in headers_list:
+            header_id = header_ids.get(header)
+            if header_id is None:
+                header_id = len(header_names)
+                header_ids[header] = header_id
+                header_names.append(header)
+            ids_set.add(header_id)
+        self.object_names.append(name)
+        self.object_time.append(duration)
+        self.edge_headers.extend(sorted(ids_set))
+        self.edge_offsets.append(len(self.edge_headers))
+
+    ## returns inverted index in CSR layout: objects of header 'h' are 'objects[offsets[h]:offsets[h + 1]]'
+    def get_inverted(self):
+        counts = [0] * (self.headers_num() + 1)
+        for header_id in self.edge_headers:
+            counts[header_id + 1] += 1
+        for index in range(1, len(counts)):
+            counts[index] += counts[index - 1]
+        offsets = array("Q", counts)
+        objects = array("I", bytes(4 * self.edges_num()))
+        edge_offsets = self.edge_offsets
+        edge_headers = self.edge_headers
+        positions = counts[:-1]
+        for object_id in range(self.objects_num()):
+            for edge_index in range(edge_offsets[object_id], edge_offsets[object_id + 1]):
+                header_id = edge_headers[edge_index]
+                objects[positions[header_id]] = object_id
+                positions[header_id] += 1
+        return offsets, objects
+
+    def get_header_objects(self, header: str) -> List[str]:
+        header_id = self._header_ids.get(header)
+        if header_id is None:
+            return []
+        offsets, objects = self.get_inverted()
+        return [self.object_names[item] for item in objects[offsets[header_id] : offsets[header_id + 1]]]
+
+    ## returns list of rows (columns as in HEADERS_COLUMNS)
+    ## total: sum of compilation time of objects including header, slope: coefficient of univariate
+    ## regression of object time against inclusion of header (difference of mean time of objects
+    ## including and not including header), estimated: slope multiplied by number of objects
+    def get_costs(self, use_numpy=True) -> List[List[Any]]:
+        if not self.header_names:
+            return []
+        if use_numpy and numpy is not None:
+            counts, totals = calculate_sums_numpy(self)
+        else:
+            counts, totals = calculate_sums(self)
+        objects_num = self.objects_num()
+        all_total = sum(self.object_time) / MICROSECONDS_PER_SECOND
+        rows_list = []
+        for header_id, header in enumerate(self.header_names):
+            count = int(counts[header_id])
+            total = float(totals[header_id]) / MICROSECONDS_PER_SECOND
+            mean = total / count
+            slope = 0.0
+            if count < objects_num:
+                ## header included by all objects does not explain differences of times
+                slope = mean - (all_total - total) / (objects_num - count)
+            rows_list.append([header, count, total, mean, slope, slope * count])
+        return rows_list
+
+
+## returns tuple (number of objects, sum of time of objects) of each header
+def calculate_sums_numpy(index: HeaderIndex):
+    offsets_array = numpy.frombuffer(index.edge_offsets, dtype=numpy.uint64)
+    headers_array = numpy.frombuffer(index.edge_headers, dtype=numpy.uint32)
+    times_array = numpy.frombuffer(index.object_time, dtype=numpy.int64)
+    ## time of object of each edge
+    edge_times = numpy.repeat(times_array, numpy.diff(offsets_array).astype(numpy.int64))
+    counts = numpy.bincount(headers_array, minlength=index.headers_num())
+    totals = numpy.bincount(headers_array, weights=edge_times, minlength=index.headers_num())
+    return counts, totals
+
+
+## pure Python variant of 'calculate_sums_numpy'
+def calculate_sums(index: HeaderIndex):
+    offsets, objects = index.get_inverted()
+    object_time = index.object_time
+    counts = []
+    totals = []
+    for header_id in range(index.headers_num()):
+        header_objects = objects[offsets[header_id] : offsets[header_id + 1]]
+        counts.append(len(header_objects))
+        totals.append(sum(map(object_time.__getitem__, header_objects)))
+    return counts, totals
+
+
+## ===================================================================
+
+
+def split_tokens(content: str) -> List[str]:
+    return [token.replace("\\ ", " ").replace("\\#", "#").replace("$$", "$") for token in TOKEN_REGEX.findall(content)]
+
+
+## parse dependency file in Makefile syntax, returns dict: target -> list of prerequisites
+def parse_depfile(content: str) -> Dict[str, List[str]]:
+    rules_dict: Dict[str, List[str]] = {}
+    content = content.replace("\\\r\n", " ").replace("\\\n", " ")
+    for line in content.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        found = RULE_REGEX.match(line)
+        if not found:
+            continue
+        prerequisites = split_tokens(found.group(2))
+        for target in split_tokens(found.group(1)):
+            rules_dict.setdefault(target, []).extend(prerequisites)
+    return rules_dict
+
+
+def read_depfile(file_path: str) -> Dict[str, List[str]]:
+    try:
+        with open(file_path, encoding="utf-8", errors="replace") as dep_file:
+            return parse_depfile(dep_file.read())
+    except OSError:
+        return None
+
+
+class DepfilesReader:
+    """Find headers included by objects of CMake build directory.
+
+    Dependency file written by compiler next to object is preferred, otherwise dependency files
+    of target are used. Relative paths are resolved against binary directory of object.
+    """
+
+    def __init__(self, build_dir: str):
+        self.build_dir = build_dir
+        ## path of dependency file of target -> parsed rules
+        self._targets_cache: Dict[str, Dict[str, List[str]]] = {}
+        ## (binary directory, prerequisite) -> path of header or None
+        self._paths_cache: Dict[Any, str] = {}
+
+    ## returns None if dependencies of object are not found
+    def get_headers(self, object_name: str) -> List[str]:
+        found = TARGET_DIR_REGEX.match(object_name)
+        if found:
+            binary_dir = found.group(1)
+            target_dir = os.path.join(self.build_dir, binary_dir, found.group(2))
+        else:
+            binary_dir = os.path.dirname(object_name)
+            if binary_dir:
+                binary_dir += "/"
+            target_dir = None
+        ## target of rule is relative to binary directory
+        rule_target = object_name[len(binary_dir) :]
+
+        prerequisites = None
+        rules_dict = read_depfile(os.path.join(self.build_dir, object_name + DEPFILE_SUFFIX))
+        if rules_dict:
+            prerequisites = rules_dict.get(rule_target)
+            if prerequisites is None:
+                prerequisites = [item for rule_list in rules_dict.values() for item in rule_list]
+        elif target_dir is not None:
+            prerequisites = self.get_target_prerequisites(target_dir, rule_target)
+        if prerequisites is None:
+            return None
+
+        ## the same headers are included by many objects, so resolved paths are cached
+        paths_cache = self._paths_cache
+        headers_list = []
+        for item in prerequisites:
+            cache_key = (binary_dir, item)
+            header = paths_cache.get(cache_key, False)
+            if header is False:
+                header = self.resolve_path(binary_dir, item)
+                paths_cache[cache_key] = header
+            if header is not None:
+                headers_list.append(header)
+        return headers_list
+
+    ## returns normalized path of header, None if prerequisite is source file
+    def resolve_path(self, binary_dir: str, item: str) -> str:
+        if os.path.splitext(item)[1] in SOURCE_EXTENSIONS:
+            return None
+        if os.path.isabs(item) or DRIVE_PATH_REGEX.match(item):
+            return item
+        return os.path.normpath(os.path.join(self.build_dir, binary_dir, item))
+
+    def get_target_prerequisites(self, target_dir: str, rule_target: str) -> List[str]:
+        for depfile_name in TARGET_DEPFILES:
+            depfile_path = os.path.join(target_dir, depfile_name)
+            rules_dict = self._targets_cache.get(depfile_path)
+            if rules_dict is None:
+                rules_dict = read_depfile(depfile_path) or {}
+                self._targets_cache[depfile_path] = rules_dict
+            prerequisites = rules_dict.get(rule_target)
+            if prerequisites:
+                return prerequisites
+        return None
+
+
+## build index of headers of objects of compile list (format of 'get_compile_list')
+def read_header_index(build_dir: str, compile_list: List[Any]) -> HeaderIndex:
+    index = HeaderIndex()
+    reader = DepfilesReader(build_dir)
+    missing_num = 0
+    for target_data in compile_list:
+        for object_name, object_time in target_data.get("objects", []):
+            headers_list = reader.get_headers(object_name)
+            if headers_list is None:
+                missing_num += 1
+                continue
+            index.add_object(object_name, to_microseconds(object_time), headers_list)
+    if missing_num:
+        _LOGGER.info("dependencies of %s objects not found", missing_num)
+    return index
+
+
+def write_headers_csv(rows_list: List[List[Any]], out_path: str):
+    with open(out_path, "w", encoding="utf-8", newline="") as out_file:
+        writer = csv.writer(out_file)
+        writer.writerow(HEADERS_COLUMNS)
+        writer.writerows(rows_list)
+
+
+def print_headers(rows_list: List[List[Any]], limit: int = None):
+    if limit is not None:
+        rows_list = rows_list[:limit]
+    max_length = max((len(item[0]) for item in rows_list), default=0) + 2
+    lines_list = [
+        f"{'header': <{max_length}} {'objects':>8} " + " ".join(f"{label:>12}" for label in HEADERS_COLUMNS[2:])
+    ]
+    for row in rows_list:
+        values = " ".join(f"{value:12.6f}" for value in row[2:])
+        lines_list.append(f"{row[0]: <{max_length}} {row[1]:8} {values}")
+    print("\n".join(lines_list))
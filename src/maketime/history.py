@@ -0,0 +1,304 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import time
+import sqlite3
+import logging
+from typing import Any, List
+
+from maketime.store import MICROSECONDS_PER_SECOND, to_microseconds
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+## times of builds are unix time in seconds, durations are integer microseconds
+SCHEMA_SCRIPT = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    build_time INTEGER NOT NULL,
+    total_time INTEGER NOT NULL,
+    label TEXT,
+    log_path TEXT,
+    log_size INTEGER,
+    log_mtime INTEGER
+);
+CREATE INDEX IF NOT EXISTS builds_time ON builds (build_time);
+CREATE UNIQUE INDEX IF NOT EXISTS builds_log ON builds (log_path, log_size, log_mtime);
+
+CREATE TABLE IF NOT EXISTS target_names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS object_names (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+
+CREATE TABLE IF NOT EXISTS targets (
+    build_id INTEGER NOT NULL REFERENCES builds (id),
+    target_id INTEGER NOT NULL REFERENCES target_names (id),
+    build_time INTEGER NOT NULL,
+    link_time INTEGER NOT NULL,
+    objects_num INTEGER NOT NULL,
+    objects_time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS targets_target ON targets (target_id, build_id);
+
+CREATE TABLE IF NOT EXISTS objects (
+    build_id INTEGER NOT NULL REFERENCES builds (id),
+    target_id INTEGER NOT NULL REFERENCES target_names (id),
+    object_id INTEGER NOT NULL REFERENCES object_names (id),
+    time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS objects_build ON objects (build_id);
+-- covers per object aggregates of queries, so rows of table are not read
+CREATE INDEX IF NOT EXISTS objects_object ON objects (object_id, build_id, time);
+"""
+
+## rows of ingested build are inserted into temporary tables first, then names are resolved to ids in SQL
+STAGING_SCRIPT = """
+CREATE TEMP TABLE IF NOT EXISTS staging_targets (
+    target TEXT, build_time INTEGER, link_time INTEGER, objects_num INTEGER, objects_time INTEGER
+);
+CREATE TEMP TABLE IF NOT EXISTS staging_objects (target TEXT, name TEXT, time INTEGER);
+"""
+
+TOP_COLUMNS = ["object", "count", "mean", "max", "total"]
+TREND_COLUMNS = ["build_time", "label", "build", "link", "objects_num", "objects_time", "delta", "moving_mean"]
+PERCENTILE_COLUMNS = ["object", "count", "percentile"]
+
+
+def get_default_history_path() -> str:
+    data_home = os.environ.get("XDG_DATA_HOME")
+    if not data_home:
+        data_home = os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(data_home, "maketime", "history.sqlite")
+
+
+class HistoryStore:
+    """History of builds stored in SQLite database.
+
+    Names of targets and objects are normalized into separate tables, rows of builds refer them
+    by ids. Build is inserted in single transaction, queries are aggregated by SQL.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA_SCRIPT)
+        self.connection.executescript(STAGING_SCRIPT)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def builds_num(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM builds").fetchone()[0]
+
+    ## returns True if build of log file (identified by path, size and modification time) is stored
+    def has_log(self, log_path: str) -> bool:
+        log_key = get_log_key(log_path)
+        row = self.connection.execute(
+            "SELECT 1 FROM builds WHERE log_path = ? AND log_size = ? AND log_mtime = ?", log_key
+        ).fetchone()
+        return row is not None
+
+    ## store compile list (format of 'get_compile_list'), returns id of build
+    ## build_time: unix time of build (if not given then modification time of log or current time)
+    def add_build(
+        self, compile_list: List[Any], log_path: str = None, build_time: int = None, label: str = None
+    ) -> int:
+        log_key = (None, None, None)
+        if log_path:
+            log_key = get_log_key(log_path)
+        if build_time is None:
+            build_time = log_key[2] // 1000000000 if log_key[2] is not None else int(time.time())
+        total_time = 0.0
+        targets_rows = []
+        objects_rows = []
+        for target_data in compile_list:
+            target_name = target_data.get("target")
+            if target_name is None:
+                total_time = target_data.get("total_time", total_time)
+                continue
+            objects_list = target_data.get("objects") or []
+            objects_times = [to_microseconds(item[1]) for item in objects_list]
+            objects_rows.extend(
+                (target_name, item[0], item_time) for item, item_time in zip(objects_list, objects_times)
+            )
+            targets_rows.append(
+                (
+                    target_name,
+                    to_microseconds(target_data.get("build_time", 0.0)),
+                    to_microseconds(target_data.get("link_time", 0.0)),
+                    target_data.get("objects_num", len(objects_list)),
+                    to_microseconds(target_data.get("objects_time", sum(objects_times) / MICROSECONDS_PER_SECOND)),
+                )
+            )
+
+        connection = self.connection
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO builds (build_time, total_time, label, log_path, log_size, log_mtime)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (build_time, to_microseconds(total_time), label) + log_key,
+            )
+            build_id = cursor.lastrowid
+            connection.executemany("INSERT INTO staging_targets VALUES (?, ?, ?, ?, ?)", targets_rows)
+            connection.executemany("INSERT INTO staging_objects VALUES (?, ?, ?)", objects_rows)
+            connection.execute("INSERT OR IGNORE INTO target_names (name) SELECT target FROM staging_targets")
+            connection.execute("INSERT OR IGNORE INTO object_names (name) SELECT name FROM staging_objects")
+            connection.execute(
+                "INSERT INTO targets SELECT ?, names.id, staged.build_time, staged.link_time, staged.objects_num,"
+                " staged.objects_time FROM staging_targets AS staged JOIN target_names AS names"
+                " ON names.name = staged.target",
+                (build_id,),
+            )
+            connection.execute(
+                "INSERT INTO objects SELECT ?, targets.id, names.id, staged.time FROM staging_objects AS staged"
+                " JOIN target_names AS targets ON targets.name = staged.target"
+                " JOIN object_names AS names ON names.name = staged.name",
+                (build_id,),
+            )
+            connection.execute("DELETE FROM staging_targets")
+            connection.execute("DELETE FROM staging_objects")
+        _LOGGER.debug("stored build %s: %s targets, %s objects", build_id, len(targets_rows), len(objects_rows))
+        return build_id
+
+    ## returns rows (columns as in TOP_COLUMNS) of objects with highest mean time in builds of last days
+    def get_top(self, days: float = None, limit: int = None) -> List[List[Any]]:
+        query = """
+            SELECT names.name, COUNT(*), AVG(objects.time), MAX(objects.time), SUM(objects.time)
+            FROM objects
+            JOIN builds ON builds.id = objects.build_id
+            JOIN object_names AS names ON names.id = objects.object_id
+            WHERE builds.build_time >= ?
+            GROUP BY objects.object_id
+            ORDER BY AVG(objects.time) DESC
+            LIMIT ?
+        """
+        rows = self.connection.execute(query, (get_min_time(days), get_limit(limit)))
+        return [[row[0], row[1]] + [value / MICROSECONDS_PER_SECOND for value in row[2:]] for row in rows]
+
+    ## returns rows (columns as in TREND_COLUMNS) of builds of target ordered by time of build
+    ## delta: change of build time since previous build, moving_mean: mean build time of last 'window' builds
+    def get_trend(self, target: str, days: float = None, window: int = 5) -> List[List[Any]]:
+        if window < 1:
+            raise ValueError(f"invalid size of window: {window}")
+        query = f"""
+            SELECT builds.build_time, builds.label, targets.build_time, targets.link_time,
+                targets.objects_num, targets.objects_time,
+                targets.build_time - LAG(targets.build_time) OVER build_order,
+                AVG(targets.build_time) OVER (build_order ROWS BETWEEN {int(window) - 1} PRECEDING AND CURRENT ROW)
+            FROM targets
+            JOIN builds ON builds.id = targets.build_id
+            WHERE targets.target_id = (SELECT id FROM target_names WHERE name = ?) AND builds.build_time >= ?
+            WINDOW build_order AS (ORDER BY builds.build_time, builds.id)
+            ORDER BY builds.build_time, builds.id
+        """
+        rows = self.connection.execute(query, (target, get_min_time(days)))
+        ret_list = []
+        for row in rows:
+            durations = [None if value is None else value / MICROSECONDS_PER_SECOND for value in row[2:]]
+            durations[2] = row[4]
+            ret_list.append([row[0], row[1]] + durations)
+        return ret_list
+
+    ## returns rows (columns as in PERCENTILE_COLUMNS) of objects ordered by percentile of time descending
+    ## fraction: percentile in range [0, 1], values are linearly interpolated between closest ranks
+    def get_percentile(self, fraction: float, days: float = None, limit: int = None) -> List[List[Any]]:
+        query = """
+            WITH ranked AS (
+                SELECT objects.object_id, objects.time,
+                    ROW_NUMBER() OVER object_order - 1 AS position,
+                    COUNT(*) OVER object_order AS objects_num
+                FROM objects
+                JOIN builds ON builds.id = objects.build_id
+                WHERE builds.build_time >= :min_time
+                WINDOW object_order AS (
+                    PARTITION BY objects.object_id ORDER BY objects.time
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+                )
+            ),
+            bounds AS (
+                SELECT object_id, objects_num, CAST((objects_num - 1) * :fraction AS INTEGER) AS lower_position,
+                    position, time
+                FROM ranked
+            ),
+            percentiles AS (
+                SELECT object_id, objects_num,
+                    MAX(CASE WHEN position = lower_position THEN time END) AS lower,
+                    MAX(CASE WHEN position = MIN(lower_position + 1, objects_num - 1) THEN time END) AS upper,
+                    (objects_num - 1) * :fraction - lower_position AS weight
+                FROM bounds
+                WHERE position BETWEEN lower_position AND lower_position + 1
+                GROUP BY object_id
+            )
+            SELECT names.name, percentiles.objects_num,
+                percentiles.lower + (percentiles.upper - percentiles.lower) * percentiles.weight AS value
+            FROM percentiles
+            JOIN object_names AS names ON names.id = percentiles.object_id
+            ORDER BY value DESC
+            LIMIT :limit
+        """
+        params = {"min_time": get_min_time(days), "fraction": fraction, "limit": get_limit(limit)}
+        rows = self.connection.execute(query, params)
+        return [[row[0], row[1], row[2] / MICROSECONDS_PER_SECOND] for row in rows]
+
+
+## returns tuple (absolute path, size, modification time in nanoseconds) identifying log file
+def get_log_key(log_path: str):
+    log_path = os.path.abspath(log_path)
+    try:
+        file_stat = os.stat(log_path)
+    except OSError:
+        return (log_path, None, None)
+    return (log_path, file_stat.st_size, file_stat.st_mtime_ns)
+
+
+## returns minimal unix time of builds of last days, 0 if days is not given
+def get_min_time(days: float = None) -> int:
+    if days is None:
+        return 0
+    return int(time.time() - days * SECONDS_PER_DAY)
+
+
+## returns limit of rows of query, -1 (no limit) if not given
+def get_limit(limit: int = None) -> int:
+    if limit is None:
+        return -1
+    return limit
+
+
+def format_build_time(build_time: int) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(build_time))
+
+
+def print_rows(columns: List[str], rows_list: List[List[Any]]):
+    max_length = max([len(columns[0])] + [len(str(row[0])) for row in rows_list]) + 2
+    lines_list = [f"{columns[0]: <{max_length}} " + " ".join(f"{label:>12}" for label in columns[1:])]
+    for row in rows_list:
+        values = []
+        for value in row[1:]:
+            if value is None:
+                values.append(f"{'-':>12}")
+            elif isinstance(value, float):
+                values.append(f"{value:12.6f}")
+            else:
+                values.append(f"{value:>12}")
+        lines_list.append(f"{row[0]: <{max_length}} " + " ".join(values))
+    print("\n".join(lines_list))
@@ -7,9 +7,22 @@
 
 import os
 import logging
+import mmap
+import gzip
+import bz2
+import lzma
+import queue
+import threading
+from io import BytesIO
 
 import json
 
+try:
+    ## optional dependency
+    import zstandard
+except ImportError:
+    zstandard = None
+
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -26,6 +39,141 @@ def read_file(file_path=None):
     return content
 
 
+## iterate over lines of file as bytes (without decoding)
+## file is memory-mapped, so content is not copied into process memory
+## start_pos and end_pos allow to read range of file, range have to be aligned to lines
+def read_lines_mmap(file_path, start_pos=0, end_pos=None):
+    _LOGGER.debug("mapping lines from file: %s", file_path)
+    with open(file_path, "rb") as content_file:
+        file_size = os.fstat(content_file.fileno()).st_size
+        if file_size < 1:
+            ## empty file can not be mapped
+            return
+        with mmap.mmap(content_file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                content.madvise(mmap.MADV_SEQUENTIAL)
+            content.seek(start_pos)
+            readline = content.readline
+            if end_pos is None or end_pos >= file_size:
+                yield from iter(readline, b"")
+                return
+            curr_pos = start_pos
+            while curr_pos < end_pos:
+                line = readline()
+                if not line:
+                    break
+                curr_pos += len(line)
+                yield line
+
+
+## magic bytes of supported compression formats
+COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "xz": b"\xfd7zXZ\x00",
+    "bz2": b"BZh",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+DECOMPRESS_BLOCK_SIZE = 1024 * 1024
+
+
+## returns name of compression format detected by magic bytes or None if file is not compressed
+def detect_compression(file_path):
+    with open(file_path, "rb") as content_file:
+        header = content_file.read(8)
+    for compression, magic in COMPRESSION_MAGIC.items():
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+## open compressed file for reading of decompressed bytes
+def open_compressed(file_path, compression):
+    if compression == "gzip":
+        return gzip.open(file_path, "rb")
+    if compression == "xz":
+        return lzma.open(file_path, "rb")
+    if compression == "bz2":
+        return bz2.open(file_path, "rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("'zstandard' module is required to read zstd files")
+        ## pylint: disable=R1732
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, "rb"), closefd=True)
+    raise ValueError(f"unsupported compression: {compression}")
+
+
+## iterate over lines of log file as bytes, compressed files are decompressed on the fly
+def read_log_lines(file_path):
+    compression = detect_compression(file_path)
+    if compression is None:
+        return read_lines_mmap(file_path)
+    _LOGGER.debug("detected %s compression of file: %s", compression, file_path)
+    return read_lines_compressed(file_path, compression)
+
+
+## iterate over lines of compressed file as bytes
+## content is decompressed in background thread into bounded queue of blocks of whole lines,
+## decompressors release GIL, so decompression and parsing of lines overlap
+def read_lines_compressed(file_path, compression=None, block_size=DECOMPRESS_BLOCK_SIZE, queue_size=8):
+    if compression is None:
+        compression = detect_compression(file_path)
+    blocks_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    worker = threading.Thread(
+        target=decompress_blocks,
+        args=(file_path, compression, block_size, blocks_queue, stop_event),
+        name="decompress",
+        daemon=True,
+    )
+    worker.start()
+    try:
+        while True:
+            block = blocks_queue.get()
+            if block is None:
+                break
+            if isinstance(block, Exception):
+                raise RuntimeError(f"unable to decompress file {file_path}: {block}") from block
+            ## splits only by new line character (as 'read_lines_mmap')
+            yield from BytesIO(block)
+    finally:
+        ## consumer may stop before end of file
+        stop_event.set()
+        worker.join()
+
+
+## put blocks of whole lines to queue, last item is None or exception raised while decompressing
+def decompress_blocks(file_path, compression, block_size, blocks_queue, stop_event):
+    def put_item(item):
+        while not stop_event.is_set():
+            try:
+                blocks_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        with open_compressed(file_path, compression) as content_file:
+            rest = b""
+            while True:
+                data = content_file.read(block_size)
+                if not data:
+                    break
+                lines_end = data.rfind(b"\n") + 1
+                if lines_end < 1:
+                    rest += data
+                    continue
+                if not put_item(rest + data[:lines_end]):
+                    return
+                rest = data[lines_end:]
+            if rest and not put_item(rest):
+                return
+        put_item(None)
+    except Exception as exc:  # pylint: disable=W0718
+        put_item(exc)
+
+
 def read_list(file_path):
     if not os.path.isfile(file_path):
         return []
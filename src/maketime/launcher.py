@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Compiler launcher (e.g. CMAKE_CXX_COMPILER_LAUNCHER) recording time of each compiler invocation.
+# Module is executed for every compilation, so it imports only built-in modules.
+#
+
+import sys
+import os
+import time
+
+
+## ===================================================================
+
+
+## directory of record files
+RECORDS_DIR_ENV = "MAKETIME_RECORDS_DIR"
+
+RECORDS_PREFIX = "records-"
+RECORDS_SUFFIX = ".tsv"
+
+
+def get_records_dir() -> str:
+    records_dir = os.environ.get(RECORDS_DIR_ENV)
+    if records_dir:
+        return records_dir
+    temp_dir = os.environ.get("TMPDIR") or os.environ.get("TEMP") or "/tmp"
+    return os.path.join(temp_dir, "maketime-records")
+
+
+## returns path of output file given to compiler or linker (e.g. '-o file.o'), empty string if not found
+def find_output(args) -> str:
+    output = ""
+    args_iter = iter(args)
+    for arg in args_iter:
+        if arg == "-o":
+            output = next(args_iter, "")
+        elif arg.startswith("-o"):
+            output = arg[2:]
+        elif arg.startswith(("/Fo", "-Fo")):
+            ## MSVC compiler
+            output = arg[3:]
+        elif arg.upper().startswith(("/OUT:", "-OUT:")):
+            ## MSVC linker
+            output = arg[5:]
+    return output
+
+
+## run command and return its exit code
+def run_command(args) -> int:
+    if not hasattr(os, "posix_spawnp"):
+        ## pylint: disable=C0415
+        import subprocess
+
+        return subprocess.run(args, check=False).returncode
+    try:
+        pid = os.posix_spawnp(args[0], args, os.environ)
+    except OSError as exc:
+        sys.stderr.write(f"maketime-launcher: unable to execute {args[0]}: {exc}\n")
+        return 127
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status)
+
+
+## append record of invocation to file of current process, single write without locking
+## record: start (monotonic ns), end (monotonic ns), exit code, output file, working directory
+def write_record(start_time: int, end_time: int, exit_code: int, output: str):
+    record = f"{start_time}\t{end_time}\t{exit_code}\t{output}\t{os.getcwd()}\n".encode("utf-8", errors="replace")
+    records_dir = get_records_dir()
+    records_path = os.path.join(records_dir, f"{RECORDS_PREFIX}{os.getpid()}{RECORDS_SUFFIX}")
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    try:
+        records_fd = os.open(records_path, flags, 0o644)
+    except FileNotFoundError:
+        os.makedirs(records_dir, exist_ok=True)
+        records_fd = os.open(records_path, flags, 0o644)
+    try:
+        os.write(records_fd, record)
+    finally:
+        os.close(records_fd)
+
+
+def main(args=None) -> int:
+    if args is None:
+        args = sys.argv[1:]
+    if not args:
+        sys.stderr.write("usage: maketime-launcher <compiler> [args...]\n")
+        return 2
+    start_time = time.monotonic_ns()
+    exit_code = run_command(args)
+    end_time = time.monotonic_ns()
+    try:
+        write_record(start_time, end_time, exit_code, find_output(args[1:]))
+    except OSError as exc:
+        ## build should not fail because of measurement
+        sys.stderr.write(f"maketime-launcher: unable to write record: {exc}\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,15 +18,24 @@ except ImportError:
     pass
 
 import sys
+import os
 import argparse
 import logging
+import functools
 
 import json
 
 from maketime import logger
 from maketime.io import write_file
-from maketime.parser import read_compile_log, print_log
+from maketime.parser import BuildLog, print_log
+from maketime.store import TopCompileStore, SummaryCompileStore
+from maketime.backend import get_backend, BACKEND_NAMES
+from maketime.parallel import read_parallel_log, print_parallel_summary, ParallelBuildLog, BytesParallelLineClassifier
+from maketime.cache import ResultCache
+from maketime.writer import write_compile_list, OUTPUT_FORMATS
 
+## modules of tools are imported by functions processing the tools, so start of application
+## does not load modules of not used tools and their dependencies (e.g. numpy, sqlite3, asyncio)
 
 if __name__ == "__main__":
     _LOGGER = logging.getLogger("maketime.main")
@@ -37,20 +46,351 @@ else:
 # =======================================================================
 
 
-def process(compilelogfile: str, outfile: str):
-    compile_list = read_compile_log(compilelogfile, True)
+## load_args: additional arguments of 'load_compile_list'
+def process(
+    compilelogfile: str, outfile: str, jobs: int = 1, parallel: bool = False, *, outformat: str = "json", **load_args
+):
+    compile_list = load_compile_list(compilelogfile, jobs, parallel, **load_args)
+    if compile_list is None:
+        return
+    output_compile_list(compile_list, outfile, parallel, outformat)
 
-    content = json.dumps(compile_list, indent=4)
+
+def load_compile_list(
+    compilelogfile: str,
+    jobs: int = 1,
+    parallel: bool = False,
+    *,
+    cache: ResultCache = None,
+    checkpoint: str = None,
+    top: int = None,
+    summary: bool = False,
+    backend: str = "auto",
+):
+    log_backend = get_backend(compilelogfile, backend)
+    mode = "serial"
+    if log_backend.name != "make":
+        mode = log_backend.name
+    build_log = None
+    if parallel and log_backend.name == "make":
+        mode = "parallel"
+        parse_function = functools.partial(read_parallel_log, compilelogfile, True)
+    else:
+        if top is not None or summary:
+            ## objects are reduced while parsing, so checkpoint and multiple processes are not supported
+            if summary:
+                mode += ":summary"
+                build_log = BuildLog(SummaryCompileStore())
+            else:
+                mode += f":top:{top}"
+                build_log = BuildLog(TopCompileStore(top))
+            checkpoint = None
+        parse_function = functools.partial(
+            log_backend.read_compile_log,
+            compilelogfile,
+            True,
+            jobs=jobs,
+            checkpoint_path=checkpoint,
+            build_log=build_log,
+        )
+    if cache is not None and not checkpoint:
+        compile_list = cache.get(compilelogfile, parse_function, options=mode)
+    else:
+        compile_list = parse_function()
+    return compile_list
+
+
+def create_cache(args) -> ResultCache:
+    if args.no_cache:
+        return None
+    ## results are kept in memory only by daemon
+    memory_size = getattr(args, "memory_cache", 0)
+    return get_result_cache(args.cachedir, args.cachesize * 1024 * 1024, args.cachehash, memory_size)
+
+
+## the same cache is returned for the same options, so results kept in memory are reused by requests of daemon
+@functools.lru_cache(maxsize=None)
+def get_result_cache(cache_dir: str, size_limit: int, use_hash: bool, memory_size: int) -> ResultCache:
+    return ResultCache(cache_dir, size_limit, use_hash=use_hash, memory_size=memory_size)
+
+
+def process_follow(compilelogfile: str, outfile: str, interval: float, outformat: str = "json"):
+    ## pylint: disable=C0415
+    from maketime.follow import LogFollower
+
+    if compilelogfile != "-" and not os.path.isfile(compilelogfile):
+        _LOGGER.warning("unable to read content from file '%s'", compilelogfile)
+        return
+    follower = LogFollower(interval)
+    follower.follow(compilelogfile)
+    compile_list = follower.build_log.get_compile_list(True)
+    output_compile_list(compile_list, outfile, outformat=outformat)
+
+
+def process_run(args):
+    ## pylint: disable=C0415
+    from maketime.runner import BuildRunner
+
+    command = args.command
+    if command and command[0] == "--":
+        command = command[1:]
+    if not command:
+        _LOGGER.error("missing build command")
+        return 1
+
+    if args.parallel:
+        runner = BuildRunner(args.outlogfile, ParallelBuildLog(), BytesParallelLineClassifier())
+    else:
+        runner = BuildRunner(args.outlogfile)
+    exit_code = runner.run(command)
+    if not runner.started:
+        return exit_code
+
+    compile_list = runner.build_log.get_compile_list(True)
+    output_compile_list(compile_list, args.outfile, args.parallel, args.outformat)
+    return exit_code
+
+
+def process_aggregate(args):
+    ## pylint: disable=C0415
+    from maketime.aggregate import find_logs, collect_times, write_stats_csv, print_stats
+
+    logs_list = find_logs(args.paths)
+    if not logs_list:
+        _LOGGER.error("no log files found")
+        return 1
+    _LOGGER.info("parsing %s log files", len(logs_list))
+    collector = collect_times(logs_list, args.jobs)
+    rows_list = collector.get_stats()
+    if args.outfile:
+        write_stats_csv(rows_list, args.outfile)
+    print_stats(rows_list, args.limit)
+    return 0
+
+
+def process_diff(args):
+    ## pylint: disable=C0415
+    from maketime.diff import diff_compile_lists, print_diff
+
+    cache = create_cache(args)
+    old_list = load_compile_list(args.oldlog, args.jobs, cache=cache, backend=args.backend)
+    new_list = load_compile_list(args.newlog, args.jobs, cache=cache, backend=args.backend)
+    if old_list is None or new_list is None:
+        return 1
+    diff_data = diff_compile_lists(old_list, new_list, args.threshold, args.relthreshold / 100.0)
+    if args.outfile:
+        write_file(args.outfile, json.dumps(diff_data, indent=4))
+    print_diff(diff_data, args.limit)
+    return 0
+
+
+def process_trace(args):
+    ## pylint: disable=C0415
+    from maketime.trace import export_trace
+
+    if not export_trace(args.compilelog, args.outfile):
+        return 1
+    _LOGGER.info("trace written to %s", args.outfile)
+    return 0
+
+
+def process_simulate(args):
+    ## pylint: disable=C0415
+    from maketime.simulate import build_graph, read_graphviz_dependencies, simulate_build, print_simulation
+
+    dependencies = None
+    if args.graphviz:
+        dependencies = read_graphviz_dependencies(args.graphviz)
+    ## order of targets is needed to infer dependencies, so results are not sorted
+    compile_list = get_backend(args.compilelog, args.backend).read_compile_log(args.compilelog, False, jobs=args.jobs)
+    if compile_list is None:
+        return 1
+    graph = build_graph(compile_list, dependencies)
+    _LOGGER.info("simulating build graph of %s nodes", graph.nodes_num())
+    try:
+        result = simulate_build(graph, args.workers)
+    except ValueError as exc:
+        _LOGGER.error("unable to simulate build: %s", exc)
+        return 1
+    if args.outfile:
+        write_file(args.outfile, json.dumps(result, indent=4))
+    print_simulation(result, args.limit)
+    return 0
+
+
+def process_timetrace(args):
+    ## pylint: disable=C0415
+    from maketime.timetrace import find_object_traces, find_dir_traces, collect_traces, print_timetrace
+
+    if not os.path.isdir(args.builddir):
+        _LOGGER.error("build directory not found: %s", args.builddir)
+        return 1
+    if args.compilelog:
+        ## object times from log weight traces of objects
+        backend = get_backend(args.compilelog, args.backend)
+        compile_list = backend.read_compile_log(args.compilelog, False, jobs=args.jobs or 1)
+        if compile_list is None:
+            return 1
+        traces_list = find_object_traces(args.builddir, compile_list)
+    else:
+        traces_list = find_dir_traces(args.builddir)
+    if not traces_list:
+        _LOGGER.error("no time trace files found")
+        return 1
+    _LOGGER.info("parsing %s time trace files", len(traces_list))
+    collector = collect_traces(traces_list, args.jobs)
+    summary = collector.get_summary(args.limit)
+    if args.outfile:
+        write_file(args.outfile, json.dumps(summary, indent=4))
+    print_timetrace(summary)
+    return 0
+
+
+def process_headers(args):
+    ## pylint: disable=C0415
+    from maketime.headers import HEADERS_COLUMNS, read_header_index, write_headers_csv, print_headers
+
+    compile_list = get_backend(args.compilelog, args.backend).read_compile_log(args.compilelog, False, jobs=args.jobs)
+    if compile_list is None:
+        return 1
+    index = read_header_index(args.builddir, compile_list)
+    if index.objects_num() < 1:
+        _LOGGER.error("no dependency files found")
+        return 1
+    _LOGGER.info(
+        "found %s headers included by %s objects (%s includes)",
+        index.headers_num(),
+        index.objects_num(),
+        index.edges_num(),
+    )
+    rows_list = index.get_costs()
+    if args.prefix:
+        rows_list = [row for row in rows_list if row[0].startswith(args.prefix)]
+    sort_column = HEADERS_COLUMNS.index(args.sort)
+    rows_list.sort(key=lambda item: item[sort_column], reverse=True)
+    if args.outfile:
+        write_headers_csv(rows_list, args.outfile)
+    print_headers(rows_list, args.limit)
+    return 0
+
+
+def process_serve(args):
+    ## pylint: disable=C0415
+    from maketime.protocol import get_socket_path
+    from maketime.server import LocalRequest, serve
+
+    parser, subparsers = create_parser()
+
+    def execute_request(args_list):
+        request_args = parser.parse_args(args_list, namespace=argparse.Namespace(memory_cache=args.memorysize))
+        if is_local_request(request_args):
+            raise LocalRequest()
+        ## log messages of request are sent to client
+        loglevel = get_loglevel(request_args) or logging.INFO
+        handler = logger.create_stdout_handler()
+        prev_level = logging.root.level
+        logging.root.addHandler(handler)
+        logging.root.setLevel(loglevel)
+        try:
+            return execute(parser, subparsers, request_args)
+        finally:
+            logging.root.removeHandler(handler)
+            logging.root.setLevel(prev_level)
+
+    socket_path = args.socket or get_socket_path()
+    try:
+        serve(socket_path, execute_request)
+    except (OSError, RuntimeError) as exc:
+        _LOGGER.error("unable to start daemon: %s", exc)
+        return 1
+    return 0
+
+
+## returns True if parsed arguments can not be executed by daemon: request runs build, follows log,
+## starts daemon or reads standard input of client
+def is_local_request(args) -> bool:
+    if args.follow or getattr(args, "func", None) in (process_run, process_serve):
+        return True
+    for value in vars(args).values():
+        if value == "-" or (isinstance(value, list) and "-" in value):
+            return True
+    return False
+
+
+def process_history(args):
+    ## pylint: disable=C0415
+    import sqlite3
+    from maketime.history import HistoryStore, get_default_history_path, format_build_time, print_rows
+    from maketime.history import TOP_COLUMNS, TREND_COLUMNS, PERCENTILE_COLUMNS
+
+    db_path = args.db or get_default_history_path()
+    try:
+        store = HistoryStore(db_path)
+    except (OSError, sqlite3.Error) as exc:
+        _LOGGER.error("unable to open history database %s: %s", db_path, exc)
+        return 1
+    with store:
+        if args.command == "ingest":
+            return process_history_ingest(args, store)
+        if args.command == "top":
+            rows_list = store.get_top(args.days, args.limit)
+            print_rows(TOP_COLUMNS, rows_list)
+        elif args.command == "trend":
+            rows_list = store.get_trend(args.target, args.days, args.window)
+            for row in rows_list:
+                row[0] = format_build_time(row[0])
+            print_rows(TREND_COLUMNS, rows_list)
+        elif args.command == "percentile":
+            rows_list = store.get_percentile(args.percentile / 100.0, args.days, args.limit)
+            print_rows(PERCENTILE_COLUMNS, rows_list)
+    return 0
+
+
+def process_history_ingest(args, store):
+    ## pylint: disable=C0415
+    from maketime.aggregate import find_logs
+
+    for log_path in find_logs(args.logs):
+        if store.has_log(log_path):
+            _LOGGER.info("build of log %s already stored", log_path)
+            continue
+        compile_list = get_backend(log_path, args.backend).read_compile_log(log_path, False, jobs=args.jobs)
+        if compile_list is None:
+            return 1
+        build_id = store.add_build(compile_list, log_path, label=args.label)
+        _LOGGER.info("stored build %s of log %s", build_id, log_path)
+    return 0
+
+
+def output_compile_list(compile_list, outfile: str, parallel: bool = False, outformat: str = "json"):
     if outfile:
-        write_file(outfile, content)
+        write_compile_list(compile_list, outfile, outformat)
 
+    if parallel:
+        print_parallel_summary(compile_list)
     print_log(compile_list)
 
 
 # =======================================================================
 
 
-def main():
+## type of arguments accepting only integers greater than zero
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected positive integer, got {value}")
+    return number
+
+
+## type of arguments accepting percents in range [0, 100]
+def percent_float(value: str) -> float:
+    number = float(value)
+    if not 0.0 <= number <= 100.0:
+        raise argparse.ArgumentTypeError(f"expected value in range [0, 100], got {value}")
+    return number
+
+
+def create_parser():
     parser = argparse.ArgumentParser(
         prog="python3 -m maketime.main",
         description="calculate C++ object files compilation time based on `make` output",
@@ -58,32 +398,365 @@ def main():
     )
     parser.add_argument("--loglevel", action="store", default=None, help="Set log level")
     parser.add_argument("-la", "--logall", action="store_true", help="Log all messages")
+    parser.add_argument("--listtools", action="store_true", help="List tools")
     # pylint: disable=C0301
-    parser.add_argument("-clf", "--compilelogfile", action="store", required=True, help="Path to make compile log file")
+    parser.add_argument(
+        "-clf",
+        "--compilelogfile",
+        action="store",
+        required=False,
+        help="Path to make compile log file ('-' to read from standard input), required if no tool given",
+    )
     parser.add_argument("--outfile", action="store", required=False, default="", help="Path to output file")
+    parser.add_argument(
+        "--outformat", action="store", choices=OUTPUT_FORMATS, default="json", help="Format of output file"
+    )
+    parser.add_argument(
+        "-j", "--jobs", action="store", type=positive_int, default=1, help="Number of processes used to parse log file"
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="Analyze log of parallel build (make -jN): attribute time to interleaved objects by their targets",
+    )
+    parser.add_argument(
+        "--backend",
+        action="store",
+        choices=BACKEND_NAMES,
+        default="auto",
+        help="Format of log: output of make timestamped by 'ts', '.ninja_log' or directory of records of"
+        " 'maketime-launcher' (auto: detected by content of log)",
+    )
+
+    parser.add_argument(
+        "--top",
+        action="store",
+        type=positive_int,
+        default=None,
+        help="Keep only given number of slowest objects of whole build and of each target",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Keep only number of objects and sum of their compilation time for each target",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store",
+        default=None,
+        help="Path to file storing state of parsing: next run parses only content appended to compile log",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Do not use cache of parsed results")
+    parser.add_argument(
+        "--cachedir",
+        action="store",
+        default=None,
+        help="Directory of cache of parsed results (if not given then '$XDG_CACHE_HOME/maketime' or '~/.cache/maketime')",
+    )
+    parser.add_argument(
+        "--cachesize", action="store", type=int, default=256, help="Size limit of cache of parsed results in MB"
+    )
+    parser.add_argument(
+        "--cachehash",
+        action="store_true",
+        help="Identify cached results also by hash of log content (not only by path, size and modification time)",
+    )
+
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Follow growing compile log (or standard input) and periodically print rolling statistics",
+    )
+    parser.add_argument(
+        "--interval", action="store", type=float, default=2.0, help="Interval of report refresh in follow mode"
+    )
+
+    subparsers = parser.add_subparsers(help="one of tools", description="use one of tools", dest="tool", required=False)
+
+    ## =================================================
+
+    description = "run build command, timestamp its output and calculate compilation time"
+    subparser = subparsers.add_parser("run", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    subparser.description = description + ", e.g.: run -- make -j1"
+    subparser.set_defaults(func=process_run)
+    subparser.add_argument(
+        "--outlogfile", action="store", default="compile-log.txt", help="Path to output timestamped compile log"
+    )
+    subparser.add_argument("--outfile", action="store", required=False, default="", help="Path to output file")
+    subparser.add_argument(
+        "--outformat", action="store", choices=OUTPUT_FORMATS, default="json", help="Format of output file"
+    )
+    subparser.add_argument("--parallel", action="store_true", help="Analyze output of parallel build (make -jN)")
+    subparser.add_argument("command", nargs=argparse.REMAINDER, help="Build command to execute")
+
+    ## =================================================
+
+    description = "calculate statistics (p50, p95, max, variance) of objects compilation time across many logs"
+    subparser = subparsers.add_parser(
+        "aggregate", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    subparser.description = description
+    subparser.set_defaults(func=process_aggregate)
+    subparser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=positive_int,
+        default=None,
+        help="Number of processes (if not given then number of CPUs)",
+    )
+    subparser.add_argument("--outfile", action="store", required=False, default="", help="Path to output CSV file")
+    subparser.add_argument("--limit", action="store", type=int, default=None, help="Number of printed objects")
+    subparser.add_argument("paths", nargs="+", help="Log files, directories containing logs or glob patterns")
+
+    ## =================================================
+
+    description = "compare compilation times of two builds"
+    subparser = subparsers.add_parser("diff", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    subparser.description = description + ", e.g.: diff old-log.txt new-log.txt"
+    subparser.set_defaults(func=process_diff)
+    subparser.add_argument(
+        "--threshold",
+        action="store",
+        type=float,
+        default=0.01,
+        help="Minimal change of time of object, target build or link in seconds",
+    )
+    subparser.add_argument(
+        "--relthreshold",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Minimal change of time of object, target build or link in percents",
+    )
+    subparser.add_argument("--outfile", action="store", required=False, default="", help="Path to output JSON file")
+    subparser.add_argument("--limit", action="store", type=int, default=None, help="Number of printed items of lists")
+    subparser.add_argument("oldlog", help="Compile log of reference build")
+    subparser.add_argument("newlog", help="Compile log of compared build")
+
+    ## =================================================
+
+    description = "export timeline of build to Chrome Trace Event format (viewable in Perfetto UI or chrome://tracing)"
+    subparser = subparsers.add_parser("trace", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    subparser.description = description
+    subparser.set_defaults(func=process_trace)
+    subparser.add_argument("--outfile", action="store", default="trace.json", help="Path to output trace file")
+    subparser.add_argument("compilelog", help="Path to make compile log file ('-' to read from standard input)")
+
+    ## =================================================
+
+    description = "predict wall time of parallel build (make -jN) based on log of serial build"
+    subparser = subparsers.add_parser(
+        "simulate", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    subparser.description = description + ", e.g.: simulate --workers 8 32 --graphviz deps.dot compile-log.txt"
+    subparser.set_defaults(func=process_simulate)
+    subparser.add_argument(
+        "-w",
+        "--workers",
+        action="store",
+        type=positive_int,
+        nargs="+",
+        default=[8, 32, 64],
+        help="Numbers of parallel jobs",
+    )
+    subparser.add_argument(
+        "--graphviz",
+        action="store",
+        default=None,
+        help="Dependencies of targets generated by 'cmake --graphviz=<file>' (if not given then each target"
+        " depends on target built before it)",
+    )
+    subparser.add_argument("--outfile", action="store", required=False, default="", help="Path to output JSON file")
+    subparser.add_argument("--limit", action="store", type=int, default=None, help="Number of printed items of lists")
+    subparser.add_argument("compilelog", help="Path to compile log file of serial build (make -j1)")
+
+    ## =================================================
+
+    description = "aggregate clang time traces (-ftime-trace) of objects: top phases, headers and templates"
+    subparser = subparsers.add_parser(
+        "timetrace", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    subparser.description = description + ", e.g.: timetrace --compilelog compile-log.txt build"
+    subparser.set_defaults(func=process_timetrace)
+    subparser.add_argument(
+        "--compilelog",
+        action="store",
+        default=None,
+        help="Compile log of build: traces of its objects are weighted by objects compilation time (if not given"
+        " then all traces placed next to object files in build directory are taken with their own times)",
+    )
+    subparser.add_argument(
+        "-j",
+        "--jobs",
+        action="store",
+        type=positive_int,
+        default=None,
+        help="Number of processes (if not given then number of CPUs)",
+    )
+    subparser.add_argument("--outfile", action="store", required=False, default="", help="Path to output JSON file")
+    subparser.add_argument("--limit", action="store", type=int, default=20, help="Number of items of each category")
+    subparser.add_argument("builddir", help="Build directory containing objects and their time trace files")
+
+    ## =================================================
+
+    description = "estimate cost of headers based on dependency files (.d, depend.make) of objects of build"
+    subparser = subparsers.add_parser(
+        "headers", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    subparser.description = description + ", e.g.: headers compile-log.txt build"
+    subparser.set_defaults(func=process_headers)
+    subparser.add_argument(
+        "--sort",
+        action="store",
+        choices=["objects", "total", "mean", "slope", "estimated"],
+        default="total",
+        help="Column of sorting (total: sum of time of objects including header, estimated: cost estimated by"
+        " regression of objects time)",
+    )
+    subparser.add_argument(
+        "--prefix", action="store", default=None, help="Report only headers of paths starting with prefix"
+    )
+    subparser.add_argument("--outfile", action="store", required=False, default="", help="Path to output CSV file")
+    subparser.add_argument("--limit", action="store", type=int, default=20, help="Number of printed headers")
+    subparser.add_argument("compilelog", help="Path to compile log file")
+    subparser.add_argument("builddir", help="Build directory containing objects and their dependency files")
 
     ## =================================================
 
-    args = parser.parse_args()
+    description = "run daemon executing requests of 'maketime-client' received over unix socket"
+    subparser = subparsers.add_parser("serve", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    subparser.description = (
+        description + ", imported modules and parsed results are kept in memory, so requests avoid cost of startup"
+    )
+    subparser.set_defaults(func=process_serve)
+    subparser.add_argument(
+        "--socket",
+        action="store",
+        default=None,
+        help="Path to unix socket (if not given then '$MAKETIME_SOCKET', '$XDG_RUNTIME_DIR/maketime.sock' or"
+        " '/tmp/maketime-<uid>.sock')",
+    )
+    subparser.add_argument(
+        "--memorysize", action="store", type=int, default=64, help="Number of parsed results kept in memory"
+    )
+
+    ## =================================================
 
+    description = "store results of builds in SQLite database and query history of builds"
+    subparser = subparsers.add_parser(
+        "history", help=description, formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    subparser.description = description + ", e.g.: history ingest compile-log.txt, history top --days 90"
+    subparser.set_defaults(func=process_history)
+    subparser.add_argument(
+        "--db",
+        action="store",
+        default=None,
+        help="Path to database (if not given then '$XDG_DATA_HOME/maketime/history.sqlite' or"
+        " '~/.local/share/maketime/history.sqlite')",
+    )
+    commands = subparser.add_subparsers(help="one of commands", dest="command", required=True)
+
+    command = commands.add_parser(
+        "ingest",
+        help="parse logs and store their results, time of build is modification time of log",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    command.add_argument("--label", action="store", default=None, help="Label of builds (e.g. branch or revision)")
+    command.add_argument("logs", nargs="+", help="Log files, directories containing logs or glob patterns")
+
+    command = commands.add_parser(
+        "top", help="objects of highest mean compilation time", formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    command.add_argument("--days", action="store", type=float, default=90, help="Take builds of last days")
+    command.add_argument("--limit", action="store", type=int, default=20, help="Number of printed objects")
+
+    command = commands.add_parser(
+        "trend",
+        help="build time of target in subsequent builds",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    command.add_argument("--days", action="store", type=float, default=None, help="Take builds of last days")
+    command.add_argument(
+        "--window", action="store", type=positive_int, default=5, help="Number of builds of moving mean"
+    )
+    command.add_argument("target", help="Name of target")
+
+    command = commands.add_parser(
+        "percentile",
+        help="objects of highest percentile of compilation time",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    command.add_argument(
+        "-p", "--percentile", action="store", type=percent_float, default=95, help="Percentile (0-100)"
+    )
+    command.add_argument("--days", action="store", type=float, default=90, help="Take builds of last days")
+    command.add_argument("--limit", action="store", type=int, default=20, help="Number of printed objects")
+
+    ## =================================================
+
+    return parser, subparsers
+
+
+def get_loglevel(args) -> int:
     if args.logall is True:
-        logger.configure(logLevel=logging.DEBUG, use_file=False)
-    elif args.loglevel is not None:
-        loglevel_map = logging.getLevelNamesMapping()
-        loglevel = loglevel_map.get(args.loglevel)
-        if loglevel is not None:
-            logger.configure(logLevel=loglevel, use_file=False)
-        else:
-            logger.configure(logLevel=logging.INFO, use_file=False)
-            _LOGGER.warning("loglevel not found - invalid loglevel name: %s", args.loglevel)
+        return logging.DEBUG
+    if args.loglevel is not None:
+        ## None if name is invalid
+        return logging.getLevelNamesMapping().get(args.loglevel)
+    # default log level
+    return logging.INFO
+
+
+def configure_logging(args):
+    loglevel = get_loglevel(args)
+    if loglevel is not None:
+        logger.configure(logLevel=loglevel, use_file=False)
     else:
-        # default log level
         logger.configure(logLevel=logging.INFO, use_file=False)
+        _LOGGER.warning("loglevel not found - invalid loglevel name: %s", args.loglevel)
+
+
+## execute parsed arguments
+def execute(parser, subparsers, args):
+    if args.listtools is True:
+        tools_list = list(subparsers.choices.keys())
+        print(", ".join(tools_list))
+        return 0
 
-    process(args.compilelogfile, args.outfile)
+    if args.tool is not None:
+        return args.func(args)
+
+    if not args.compilelogfile:
+        parser.error("the following arguments are required: -clf/--compilelogfile")
+    if args.follow:
+        process_follow(args.compilelogfile, args.outfile, args.interval, args.outformat)
+        return 0
+    cache = create_cache(args)
+    process(
+        args.compilelogfile,
+        args.outfile,
+        jobs=args.jobs,
+        parallel=args.parallel,
+        cache=cache,
+        checkpoint=args.checkpoint,
+        top=args.top,
+        summary=args.summary,
+        backend=args.backend,
+        outformat=args.outformat,
+    )
     return 0
 
 
+## args_list: command line arguments (if not given then arguments of process)
+def main(args_list=None):
+    parser, subparsers = create_parser()
+    args = parser.parse_args(args_list)
+    configure_logging(args)
+    return execute(parser, subparsers, args)
+
+
 if __name__ == "__main__":
     code = main()
     sys.exit(code)
@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+from maketime.io import read_lines_mmap, detect_compression
+from maketime.parser import BuildLog, BytesLineClassifier, ENTRY_TARGET, MICROSECONDS_PER_DAY, is_midnight_passed
+from maketime.parser import read_compile_log as read_compile_log_serial, get_compile_list
+from maketime.checkpoint import read_compile_log_resumed
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+class ChunkResult:
+    """Result of parsing part of log file.
+
+    Entries preceding first finished target depend on state of previous chunk, so they
+    are stored unprocessed and replayed during merge. Rest of chunk is processed by own BuildLog.
+    """
+
+    def __init__(self):
+        self.head_entries: List[Tuple] = []
+        self.build_log: BuildLog = None
+        ## state of time-only timestamps
+        self.first_day_time = None
+        self.last_day_time = None
+        self.day_offset = 0
+
+
+## split file to byte ranges aligned to line boundaries
+def split_file(log_path: str, parts: int) -> List[Tuple[int, int]]:
+    file_size = os.path.getsize(log_path)
+    ranges_list = []
+    start_pos = 0
+    with open(log_path, "rb") as log_file:
+        for index in range(1, parts):
+            split_pos = file_size * index // parts
+            if split_pos <= start_pos:
+                continue
+            ## find end of line containing byte preceding split position
+            log_file.seek(split_pos - 1)
+            log_file.readline()
+            end_pos = log_file.tell()
+            if end_pos >= file_size:
+                break
+            ranges_list.append((start_pos, end_pos))
+            start_pos = end_pos
+    ranges_list.append((start_pos, file_size))
+    return ranges_list
+
+
+def parse_chunk(log_path: str, start_pos: int, end_pos: int) -> ChunkResult:
+    result = ChunkResult()
+    classifier = BytesLineClassifier()
+    classify = classifier.classify
+    head_entries = result.head_entries
+    add_entry = None
+
+    for line in read_lines_mmap(log_path, start_pos, end_pos):
+        entry = classify(line)
+        if add_entry is not None:
+            add_entry(*entry)
+            continue
+        head_entries.append(entry)
+        if entry[1] == ENTRY_TARGET:
+            ## state after finished target does not depend on previous entries
+            result.build_log = BuildLog()
+            result.build_log.set_state({"target_start": entry[0]})
+            add_entry = result.build_log.add_entry
+
+    decoder = classifier.decoder
+    result.first_day_time = decoder.first_day_time
+    result.last_day_time = decoder.last_day_time
+    result.day_offset = decoder.day_offset
+    return result
+
+
+## merge results of consecutive chunks into one BuildLog
+def merge_chunks(chunks_list: List[ChunkResult]) -> BuildLog:
+    build_log = BuildLog()
+    day_offset = 0
+    last_day_time = None
+
+    for chunk in chunks_list:
+        ## chunk decoded time-only timestamps starting from day zero
+        if last_day_time is not None and chunk.first_day_time is not None:
+            if is_midnight_passed(last_day_time, chunk.first_day_time):
+                day_offset += MICROSECONDS_PER_DAY
+        shift = day_offset
+
+        for entry_time, kind, payload in chunk.head_entries:
+            build_log.add_entry(shift_time(entry_time, shift), kind, payload)
+
+        if chunk.last_day_time is not None:
+            last_day_time = chunk.last_day_time
+        day_offset += chunk.day_offset
+
+        chunk_log = chunk.build_log
+        if chunk_log is None:
+            continue
+        ## store of chunk contains also objects of not finished target
+        build_log.store.extend(chunk_log.store)
+
+        first_time = build_log.first_time
+        last_time = build_log.last_time
+        state = chunk_log.get_state()
+        for key in ("curr_object_time", "linking_start", "target_start", "first_time", "last_time"):
+            state[key] = shift_time(state[key], shift)
+        build_log.set_state(state)
+        if first_time is not None:
+            build_log.first_time = first_time
+        if build_log.last_time is None:
+            build_log.last_time = last_time
+
+    return build_log
+
+
+def shift_time(entry_time, shift):
+    if entry_time is None:
+        return None
+    return entry_time + shift
+
+
+## jobs: number of processes parsing the file
+## checkpoint_path: file storing state of parsing, next call parses only content appended to log
+def read_compile_log(log_path: str, sort_data=True, jobs=1, checkpoint_path: str = None):
+    if log_path == "-" or not os.path.isfile(log_path):
+        return read_compile_log_serial(log_path, sort_data)
+    if detect_compression(log_path) is not None:
+        ## compressed content can not be split nor resumed
+        if jobs > 1 or checkpoint_path:
+            _LOGGER.info("file %s is compressed, parsing in single process without checkpoint", log_path)
+        return read_compile_log_serial(log_path, sort_data)
+    if checkpoint_path:
+        return read_compile_log_resumed(log_path, checkpoint_path, sort_data)
+    if jobs < 2:
+        return read_compile_log_serial(log_path, sort_data)
+    build_log = read_build_log(log_path, jobs)
+    return get_compile_list(build_log, sort_data)
+
+
+## parse log file in multiple processes
+def read_build_log(log_path: str, jobs: int) -> BuildLog:
+    ranges_list = split_file(log_path, jobs)
+    _LOGGER.debug("parsing file %s in %s chunks", log_path, len(ranges_list))
+    paths_list = [log_path] * len(ranges_list)
+    starts_list = [item[0] for item in ranges_list]
+    ends_list = [item[1] for item in ranges_list]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        chunks_list = list(executor.map(parse_chunk, paths_list, starts_list, ends_list))
+    return merge_chunks(chunks_list)
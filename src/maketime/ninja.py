@@ -0,0 +1,231 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import re
+import logging
+from typing import Any, Dict, List, Set, Tuple
+
+from maketime.io import read_lines_mmap, read_log_lines, detect_compression
+from maketime.parser import BuildLog, get_compile_list
+from maketime.checkpoint import Checkpoint, load_checkpoint, save_checkpoint, is_checkpoint_valid
+from maketime.checkpoint import calculate_tail_hash, find_lines_end
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+MICROSECONDS_PER_MILLISECOND = 1000
+
+## e.g.: # ninja log v5
+NINJA_HEADER_REGEX = re.compile(rb"^# ninja log v(\d+)")
+
+## outputs of jobs of CMake target, e.g.: src/CMakeFiles/<target>.dir/file.cpp.o
+OBJECT_DIR_REGEX = re.compile(r"(?:^|/)CMakeFiles/([^/]+)\.dir/")
+
+## version suffix of shared library, e.g.: libfoo.so.1.2
+VERSION_SUFFIX_REGEX = re.compile(r"(?:\.\d+)+$")
+
+LINK_EXTENSIONS = {".a", ".so", ".dylib", ".dll", ".lib", ".exe"}
+
+## target of outputs not belonging to any target (e.g. generated files)
+OTHER_TARGET = "(other)"
+
+
+class NinjaLogParser:
+    """Parse lines of '.ninja_log' keeping entries of last build only.
+
+    Ninja appends entry when job finishes, times are milliseconds since start of build, so end
+    times grow within build. New build is detected when end time decreases or output repeats.
+    """
+
+    def __init__(self):
+        ## tuples (start ms, end ms, output)
+        self.entries: List[Tuple[int, int, str]] = []
+        self.version: int = None
+        self._outputs: Set[str] = set()
+        self._last_end = -1
+
+    def get_state(self) -> Dict[str, Any]:
+        return {"format": "ninja", "version": self.version, "entries": self.entries, "last_end": self._last_end}
+
+    def set_state(self, state: Dict[str, Any]):
+        self.version = state.get("version")
+        self.entries = list(state.get("entries", []))
+        self._outputs = {item[2] for item in self.entries}
+        self._last_end = state.get("last_end", -1)
+
+    def add_line(self, line: bytes):
+        if line.startswith(b"#"):
+            found = NINJA_HEADER_REGEX.match(line)
+            if found:
+                self.version = int(found.group(1))
+            return
+        fields = line.rstrip(b"\r\n").split(b"\t")
+        if len(fields) < 4:
+            return
+        try:
+            start_time = int(fields[0])
+            end_time = int(fields[1])
+        except ValueError:
+            return
+        output = fields[3].decode("utf-8", errors="replace")
+        if end_time < self._last_end or output in self._outputs:
+            ## next build
+            self.entries = []
+            self._outputs.clear()
+        self._last_end = end_time
+        self._outputs.add(output)
+        self.entries.append((start_time, end_time, output))
+
+    def add_lines(self, lines):
+        add_line = self.add_line
+        for line in lines:
+            add_line(line)
+
+
+## returns name of target linked by job producing output, None if output is not library nor executable
+## target_names: names of targets known from objects
+def get_link_target(output: str, target_names: Set[str]) -> str:
+    name = VERSION_SUFFIX_REGEX.sub("", os.path.basename(output))
+    base_name, extension = os.path.splitext(name)
+    if not extension:
+        ## executable
+        return name
+    if extension not in LINK_EXTENSIONS:
+        ## e.g. generated source
+        return None
+    if base_name in target_names:
+        return base_name
+    if base_name.startswith("lib") and len(base_name) > 3:
+        return base_name[3:]
+    return base_name
+
+
+## fill build log with entries of build
+## time_unit: number of microseconds in unit of times of entries
+## outputs placed in 'CMakeFiles/<target>.dir' are objects of target, linked file of target is found by
+## its name, other outputs are objects of 'OTHER_TARGET', outputs of one job (same times) are counted once
+def fill_build_log(
+    entries: List[Tuple[int, int, str]], build_log: BuildLog = None, time_unit: int = MICROSECONDS_PER_MILLISECOND
+) -> BuildLog:
+    if build_log is None:
+        build_log = BuildLog()
+    if not entries:
+        return build_log
+
+    ## target name -> [objects list, link entries list, start, end, times of jobs]
+    targets_dict: Dict[str, List[Any]] = {}
+    rest_list = []
+    for entry in entries:
+        found = OBJECT_DIR_REGEX.search(entry[2])
+        if found:
+            add_target_entry(targets_dict, found.group(1), entry, False)
+        else:
+            rest_list.append(entry)
+    target_names = set(targets_dict.keys())
+    for entry in rest_list:
+        target_name = get_link_target(entry[2], target_names)
+        if target_name is not None:
+            add_target_entry(targets_dict, target_name, entry, True)
+        else:
+            add_target_entry(targets_dict, OTHER_TARGET, entry, False)
+
+    store = build_log.store
+    ## targets in order of finish
+    for target_name, target_data in sorted(targets_dict.items(), key=lambda item: item[1][3]):
+        objects_list, link_list, start_time, end_time, _ = target_data
+        for start, end, output in sorted(objects_list, key=lambda item: item[1]):
+            store.add_object(output, (end - start) * time_unit)
+        link_time = sum(end - start for start, end, _ in link_list)
+        store.add_target(
+            target_name,
+            (end_time - start_time) * time_unit,
+            link_time * time_unit,
+        )
+
+    build_log.add_timestamp(min(item[0] for item in entries) * time_unit)
+    build_log.add_timestamp(max(item[1] for item in entries) * time_unit)
+    return build_log
+
+
+def add_target_entry(targets_dict, target_name, entry, is_link):
+    target_data = targets_dict.get(target_name)
+    if target_data is None:
+        target_data = [[], [], entry[0], entry[1], set()]
+        targets_dict[target_name] = target_data
+    job_times = (entry[0], entry[1], is_link)
+    if job_times in target_data[4]:
+        ## other output of the same job
+        return
+    target_data[4].add(job_times)
+    if is_link:
+        target_data[1].append(entry)
+    else:
+        target_data[0].append(entry)
+    target_data[2] = min(target_data[2], entry[0])
+    target_data[3] = max(target_data[3], entry[1])
+
+
+## returns True if file is log of ninja
+def is_ninja_log(log_path: str) -> bool:
+    if os.path.basename(log_path) == ".ninja_log":
+        return True
+    lines_iter = read_log_lines(log_path)
+    first_line = next(lines_iter, b"")
+    lines_iter.close()
+    return NINJA_HEADER_REGEX.match(first_line) is not None
+
+
+def read_ninja_build_log(log_path: str, build_log: BuildLog = None) -> BuildLog:
+    parser = NinjaLogParser()
+    parser.add_lines(read_log_lines(log_path))
+    return fill_build_log(parser.entries, build_log)
+
+
+## parse last build from '.ninja_log'
+## checkpoint_path: file storing state of parsing, next call parses only entries appended to log
+def read_ninja_log(log_path: str, sort_data=True, checkpoint_path: str = None, build_log: BuildLog = None):
+    if not os.path.isfile(log_path):
+        _LOGGER.warning("unable to read content from file '%s'", log_path)
+        return None
+    if checkpoint_path and detect_compression(log_path) is None:
+        entries = read_ninja_entries_resumed(log_path, checkpoint_path)
+        build_log = fill_build_log(entries, build_log)
+    else:
+        build_log = read_ninja_build_log(log_path, build_log)
+    return get_compile_list(build_log, sort_data)
+
+
+## returns entries of last build, parses only lines appended since last call
+def read_ninja_entries_resumed(log_path: str, checkpoint_path: str):
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint is not None:
+        if checkpoint.decoder_state.get("format") != "ninja" or not is_checkpoint_valid(checkpoint, log_path):
+            _LOGGER.info("log file %s changed, parsing from beginning", log_path)
+            checkpoint = None
+    if checkpoint is None:
+        checkpoint = Checkpoint(os.path.abspath(log_path))
+
+    parser = NinjaLogParser()
+    parser.set_state(checkpoint.decoder_state)
+    end_pos = find_lines_end(log_path)
+    if end_pos == checkpoint.offset and checkpoint.tail_hash is not None:
+        ## nothing new
+        return parser.entries
+    _LOGGER.debug("parsing file %s from %s to %s", log_path, checkpoint.offset, end_pos)
+    parser.add_lines(read_lines_mmap(log_path, checkpoint.offset, end_pos))
+
+    checkpoint.offset = end_pos
+    checkpoint.tail_hash = calculate_tail_hash(log_path, checkpoint.offset)
+    checkpoint.decoder_state = parser.get_state()
+    save_checkpoint(checkpoint_path, checkpoint)
+    return parser.entries
@@ -0,0 +1,331 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+import re
+import logging
+from typing import Any, List, Dict, Iterable
+
+from maketime.io import read_log_lines
+from maketime.parser import (
+    LineClassifier,
+    BytesLineClassifier,
+    ENTRY_OBJECT,
+    ENTRY_LINKING,
+    ENTRY_TARGET,
+    calculate_time_diff,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+## kinds of explicit markers, e.g. printed by compiler launcher:
+## [maketime] begin <object>
+## [maketime] end <object>
+ENTRY_BEGIN = 10
+ENTRY_END = 11
+
+TARGET_DIR_REGEX = re.compile(r"CMakeFiles/(.+?)\.dir/")
+LIBRARY_SUFFIX_REGEX = re.compile(r"(\.(a|so|dylib|dll|lib|exe))(\.\d+)*$")
+
+## name of not finished target of objects not matched to any target
+UNMATCHED_TARGET = "<unmatched>"
+
+
+class ParallelLineClassifier(LineClassifier):
+    """Classifier recognizing explicit begin/end markers of objects."""
+
+    def __init__(self):
+        super().__init__()
+        self._begin_marker = self._marker("[maketime] begin ")
+        self._end_marker = self._marker("[maketime] end ")
+
+    def classify_content(self, line):
+        for kind, marker in ((ENTRY_BEGIN, self._begin_marker), (ENTRY_END, self._end_marker)):
+            index = line.find(marker)
+            if index >= 0:
+                object_name = line[index + len(marker) :]
+                if object_name:
+                    return kind, self._to_text(object_name)
+        return super().classify_content(line)
+
+
+class BytesParallelLineClassifier(ParallelLineClassifier, BytesLineClassifier):
+    """Bytes variant of ParallelLineClassifier."""
+
+
+class TargetData:
+    def __init__(self, name, start_time):
+        self.name = name
+        self.start_time = start_time
+        self.last_time = start_time
+        self.link_start = None
+        self.link_time = 0.0
+        ## inferred object in-flight: object is finished by next event of the same target
+        self.curr_object = None
+        self.objects: List[Any] = []
+
+
+class ParallelBuildLog:
+    """Attribute time to objects built in parallel (make -jN).
+
+    Objects are grouped by target (using 'CMakeFiles/<target>.dir/' part of object path). Without
+    explicit markers object is assumed to last until next event of the same target. Objects having
+    explicit begin/end markers use exact times of the markers.
+    """
+
+    def __init__(self):
+        self.targets: Dict[str, TargetData] = {}
+        self.finished_targets: List[TargetData] = []
+        ## explicit objects in-flight: name -> start time
+        self._explicit_running: Dict[str, Any] = {}
+        self._explicit_names = set()
+        ## intervals of all jobs (objects and links) - needed for concurrency
+        self.jobs: List[Any] = []
+        self.first_time: int = None
+        self.last_time: int = None
+
+    def add_entry(self, entry_time, kind, payload):
+        if entry_time is None:
+            return
+        if self.first_time is None:
+            self.first_time = entry_time
+        self.last_time = entry_time
+
+        if kind == ENTRY_OBJECT:
+            self.add_object_start(payload, entry_time)
+        elif kind == ENTRY_LINKING:
+            self.add_linking_start(payload, entry_time)
+        elif kind == ENTRY_TARGET:
+            self.add_target_finish(payload, entry_time)
+        elif kind == ENTRY_BEGIN:
+            self.add_explicit_begin(payload, entry_time)
+        elif kind == ENTRY_END:
+            self.add_explicit_end(payload, entry_time)
+
+    def add_object_start(self, name, start_time):
+        if name in self._explicit_names:
+            ## times given by markers
+            return
+        target = self._get_target(get_object_target(name), start_time)
+        self._finish_object(target, start_time)
+        target.curr_object = (name, start_time)
+
+    def add_linking_start(self, linking_name, start_time):
+        target_name = get_linking_target(linking_name)
+        target = self.targets.get(target_name)
+        if target is None:
+            target = self._get_recent_target()
+        if target is None:
+            return
+        self._finish_object(target, start_time)
+        target.link_start = start_time
+        target.last_time = start_time
+
+    def add_target_finish(self, target_name, end_time):
+        target = self.targets.pop(target_name, None)
+        if target is None:
+            ## objects not matched to any target are assigned to first finished target
+            target = self.targets.pop(None, None)
+        if target is None:
+            ## target without objects
+            target = TargetData(target_name, end_time)
+        target.name = target_name
+        self._finish_object(target, end_time)
+        if target.link_start is not None:
+            target.link_time = calculate_time_diff(target.link_start, end_time)
+            self.jobs.append((target.link_start, end_time))
+        target.last_time = end_time
+        self.finished_targets.append(target)
+
+    def add_explicit_begin(self, name, start_time):
+        self._explicit_names.add(name)
+        target = self._get_target(get_object_target(name), start_time)
+        curr_object = target.curr_object
+        if curr_object is not None and curr_object[0] == name:
+            ## 'Building' line came before marker
+            target.curr_object = None
+        self._explicit_running[name] = start_time
+
+    def add_explicit_end(self, name, end_time):
+        start_time = self._explicit_running.pop(name, None)
+        if start_time is None:
+            return
+        target = self._get_target(get_object_target(name), start_time)
+        target.objects.append((name, calculate_time_diff(start_time, end_time)))
+        target.last_time = max(target.last_time, end_time)
+        self.jobs.append((start_time, end_time))
+
+    def _get_target(self, target_name, entry_time) -> TargetData:
+        target = self.targets.get(target_name)
+        if target is None:
+            target = TargetData(target_name, entry_time)
+            self.targets[target_name] = target
+        return target
+
+    ## target with most recent activity
+    def _get_recent_target(self) -> TargetData:
+        recent = None
+        for target in self.targets.values():
+            if recent is None or target.last_time >= recent.last_time:
+                recent = target
+        return recent
+
+    def _finish_object(self, target: TargetData, end_time):
+        target.last_time = end_time
+        curr_object = target.curr_object
+        if curr_object is None:
+            return
+        name, start_time = curr_object
+        target.objects.append((name, calculate_time_diff(start_time, end_time)))
+        self.jobs.append((start_time, end_time))
+        target.curr_object = None
+
+    ## returns targets not finished yet, objects and links in-flight are finished at the end of log
+    ## jobs: list of intervals, in-flight jobs are appended to it
+    def _get_unfinished_targets(self, jobs: List[Any]) -> List[Any]:
+        end_time = self.last_time
+        ## target name -> [start time, link time, objects]
+        targets_dict = {}
+        for target_name, target in self.targets.items():
+            link_time = 0.0
+            if target.link_start is not None:
+                link_time = calculate_time_diff(target.link_start, end_time)
+                jobs.append((target.link_start, end_time))
+            targets_dict[target_name] = [target.start_time, link_time, list(target.objects)]
+
+        running_list = [target.curr_object for target in self.targets.values() if target.curr_object is not None]
+        running_list.extend(self._explicit_running.items())
+        for name, start_time in running_list:
+            target_name = get_object_target(name)
+            if target_name not in targets_dict:
+                ## explicit object of already finished target
+                target_name = None
+                targets_dict.setdefault(target_name, [start_time, 0.0, []])
+            target_item = targets_dict[target_name]
+            target_item[0] = min(target_item[0], start_time)
+            target_item[2].append((name, calculate_time_diff(start_time, end_time)))
+            jobs.append((start_time, end_time))
+
+        ret_list = []
+        for target_name, (start_time, link_time, objects_list) in targets_dict.items():
+            target_data = {
+                "target": UNMATCHED_TARGET if target_name is None else target_name,
+                "build_time": calculate_time_diff(start_time, end_time),
+                "link_time": link_time,
+                "objects": objects_list,
+            }
+            ret_list.append(target_data)
+        return ret_list
+
+    ## state of log is not changed, so list can be requested repeatedly (e.g. in follow mode)
+    def get_compile_list(self, sort_data=True) -> List[Any]:
+        compile_list = []
+        for target in self.finished_targets:
+            target_data = {
+                "target": target.name,
+                "build_time": calculate_time_diff(target.start_time, target.last_time),
+                "link_time": target.link_time,
+                "objects": list(target.objects),
+            }
+            compile_list.append(target_data)
+        jobs = list(self.jobs)
+        compile_list.extend(self._get_unfinished_targets(jobs))
+        if sort_data:
+            compile_list.sort(key=lambda item: item["build_time"], reverse=True)
+            for target_data in compile_list:
+                target_data["objects"].sort(key=lambda item: item[1], reverse=True)
+
+        concurrency = get_concurrency(jobs, self.first_time)
+        cpu_secs = 0.0
+        for start_time, end_time in jobs:
+            cpu_secs += calculate_time_diff(start_time, end_time)
+        max_concurrency = 0
+        for item in concurrency:
+            max_concurrency = max(max_concurrency, item[1])
+        summary = {
+            "total_time": calculate_time_diff(self.first_time, self.last_time),
+            "cpu_time": cpu_secs,
+            "max_concurrency": max_concurrency,
+            "concurrency": concurrency,
+        }
+        compile_list.insert(0, summary)
+        return compile_list
+
+
+## returns list of (seconds since build start, number of running jobs)
+def get_concurrency(jobs: List[Any], first_time) -> List[Any]:
+    changes: Dict[int, int] = {}
+    for start_time, end_time in jobs:
+        changes[start_time] = changes.get(start_time, 0) + 1
+        changes[end_time] = changes.get(end_time, 0) - 1
+    ret_list = []
+    running = 0
+    for entry_time in sorted(changes):
+        running += changes[entry_time]
+        ret_list.append((calculate_time_diff(first_time, entry_time), running))
+    return ret_list
+
+
+def get_object_target(object_name):
+    found = TARGET_DIR_REGEX.search(object_name)
+    if not found:
+        return None
+    return found.group(1)
+
+
+## linking_name: e.g. "CXX static library libhello_library.a"
+def get_linking_target(linking_name):
+    output_name = linking_name.split(" ")[-1]
+    output_name = os.path.basename(output_name)
+    output_name = LIBRARY_SUFFIX_REGEX.sub("", output_name)
+    if output_name.startswith("lib"):
+        return output_name[3:]
+    return output_name
+
+
+## ===================================================================
+
+
+def read_parallel_log(log_path: str, sort_data=True):
+    if log_path == "-":
+        return parse_parallel_lines(sys.stdin.buffer, sort_data, BytesParallelLineClassifier())
+    if not os.path.isfile(log_path):
+        _LOGGER.warning("unable to read content from file '%s'", log_path)
+        return None
+    return parse_parallel_lines(read_log_lines(log_path), sort_data, BytesParallelLineClassifier())
+
+
+## content: str - multiline string
+def parse_parallel_log(content: str, sort_data=True) -> List[Any]:
+    return parse_parallel_lines(content.splitlines(), sort_data)
+
+
+def parse_parallel_lines(lines: Iterable[str], sort_data=True, classifier: LineClassifier = None) -> List[Any]:
+    if classifier is None:
+        classifier = ParallelLineClassifier()
+    build_log = ParallelBuildLog()
+    classify = classifier.classify
+    add_entry = build_log.add_entry
+    for line in lines:
+        add_entry(*classify(line))
+    return build_log.get_compile_list(sort_data)
+
+
+def print_parallel_summary(compile_list):
+    summary = compile_list[0]
+    total_time = summary["total_time"]
+    cpu_time = summary["cpu_time"]
+    print("cpu time:", cpu_time, "sec")
+    if total_time > 0.0:
+        print("average concurrency:", round(cpu_time / total_time, 2))
+    print("max concurrency:", summary["max_concurrency"])
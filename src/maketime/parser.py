@@ -6,12 +6,14 @@
 #
 
 import os
+import sys
 import logging
-from typing import Any, List
+from typing import Any, List, Iterable
 import re
 from datetime import datetime
 
-from maketime.io import read_file
+from maketime.io import read_log_lines
+from maketime.store import CompileStore, TargetsView, MICROSECONDS_PER_SECOND
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,15 +24,279 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ## ===================================================================
 
 
-class BuildLog:
+MICROSECONDS_PER_DAY = 86400 * MICROSECONDS_PER_SECOND
+
+
+class TimestampDecoder:
+    """Decode timestamps produced by `ts` to integer microseconds.
+
+    Format of timestamps is detected once, on first decoded value. Time-only
+    timestamps going back by more than half of day are treated as crossing midnight.
+    """
 
     def __init__(self):
-        self.object_queue = []
-        self.target_queue = []
+        ## decode(time_text) -> int, replaced by decoder of detected format
+        self.decode = self._detect_format
+        ## state of time-only timestamps, needed to detect midnight
+        self.first_day_time = None
+        self.last_day_time = None
+        self.day_offset = 0
+        self._date_text = None
+        self._date_base = 0
+
+    ## state of time-only timestamps, allows to continue decoding in other instance
+    def get_state(self):
+        return {
+            "first_day_time": self.first_day_time,
+            "last_day_time": self.last_day_time,
+            "day_offset": self.day_offset,
+        }
+
+    def set_state(self, state):
+        self.first_day_time = state.get("first_day_time")
+        self.last_day_time = state.get("last_day_time")
+        self.day_offset = state.get("day_offset", 0)
+
+    def _detect_format(self, time_text):
+        if len(time_text) == 15:
+            self.decode = self._decode_time
+        elif len(time_text) == 26:
+            self.decode = self._decode_datetime
+        else:
+            self.decode = self._decode_generic
+        return self.decode(time_text)
+
+    ## format: %H:%M:%S.%f
+    def _decode_time(self, time_text):
+        day_time = decode_day_time(time_text)
+        if day_time is None:
+            return self._decode_generic(time_text)
+        return self._add_day_time(day_time)
+
+    ## format: %Y-%m-%d %H:%M:%S.%f
+    def _decode_datetime(self, time_text):
+        day_time = decode_day_time(time_text[11:])
+        if day_time is None or time_text[10:11] not in (" ", b" "):
+            return self._decode_generic(time_text)
+        date_text = time_text[:10]
+        if date_text != self._date_text:
+            try:
+                date_value = datetime.strptime(to_text(date_text), "%Y-%m-%d")
+            except ValueError:
+                return self._decode_generic(time_text)
+            self._date_text = date_text
+            self._date_base = date_value.toordinal() * MICROSECONDS_PER_DAY
+        return self._date_base + day_time
+
+    ## handles timestamps not matching fixed-width formats (e.g. shorter fraction)
+    def _decode_generic(self, time_text):
+        time_text = to_text(time_text)
+        try:
+            value = datetime.strptime(time_text, "%H:%M:%S.%f")
+            day_time = ((value.hour * 60 + value.minute) * 60 + value.second) * MICROSECONDS_PER_SECOND
+            return self._add_day_time(day_time + value.microsecond)
+        except ValueError:
+            # content does not match format
+            pass
+        try:
+            value = datetime.strptime(time_text, "%Y-%m-%d %H:%M:%S.%f")
+            day_time = ((value.hour * 60 + value.minute) * 60 + value.second) * MICROSECONDS_PER_SECOND
+            return value.toordinal() * MICROSECONDS_PER_DAY + day_time + value.microsecond
+        except ValueError:
+            # content does not match format
+            pass
+        raise RuntimeError(f"unable to get time form content: {time_text}")
+
+    def _add_day_time(self, day_time):
+        if self.last_day_time is None:
+            self.first_day_time = day_time
+        elif is_midnight_passed(self.last_day_time, day_time):
+            self.day_offset += MICROSECONDS_PER_DAY
+        self.last_day_time = day_time
+        return self.day_offset + day_time
+
+
+def is_midnight_passed(prev_day_time, day_time):
+    return prev_day_time - day_time > MICROSECONDS_PER_DAY // 2
+
+
+## decode fixed-width time of day (%H:%M:%S.%f) to microseconds, returns None if text does not match
+## time_text: str or bytes
+def decode_day_time(time_text):
+    ## separators at positions 2, 5 and 8
+    if len(time_text) != 15 or time_text[2:9:3] not in ("::.", b"::."):
+        return None
+    try:
+        hours = int(time_text[0:2])
+        minutes = int(time_text[3:5])
+        seconds = int(time_text[6:8])
+        microseconds = int(time_text[9:15])
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60 and microseconds >= 0):
+        return None
+    return ((hours * 60 + minutes) * 60 + seconds) * MICROSECONDS_PER_SECOND + microseconds
+
+
+def to_text(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+## kinds of log entries returned by LineClassifier
+ENTRY_UNKNOWN = 0
+ENTRY_OBJECT = 1
+ENTRY_LINKING = 2
+ENTRY_TARGET = 3
+
+## progress of timestamped line of make given as bytes, e.g. "[10:00:00.000000] [ 42%]"
+PROGRESS_REGEX = re.compile(rb"\] \[\s*(\d+)%\]")
+
+
+class LineClassifier:
+    """Classify log lines in single pass using patterns compiled once.
+
+    Lines without timestamp bracket are skipped without further processing.
+    """
+
+    def __init__(self):
+        self.decoder = TimestampDecoder()
+        ## membership test of bytes is slow, so markers are searched by patterns and 'find()'
+        ## pattern of timestamp brackets (str or bytes as classified lines), e.g. "[12:51:27.539655] ["
+        self.timestamp_regex = re.compile(self._marker(r"\[(.*?)\] \["))
+        self._object_regex = re.compile(self._marker(r"Building \S+ object (.*)$"))
+        self._linking_marker = self._marker("Linking ")
+        self._target_marker = self._marker("Built target ")
+
+    ## convert marker to type of classified lines
+    def _marker(self, text: str):
+        return text
+
+    ## convert extracted field to str
+    def _to_text(self, value) -> str:
+        return value
+
+    ## returns tuple: (timestamp, kind, payload)
+    def classify(self, line: str):
+        time_list = self.timestamp_regex.findall(line)
+        if not time_list:
+            ## line without timestamp bracket
+            return None, ENTRY_UNKNOWN, None
+        line = line.strip()
+        line_time = None
+        if len(time_list) == 1:
+            line_time = self.decoder.decode(time_list[0])
+        kind, payload = self.classify_content(line)
+        return line_time, kind, payload
+
+    ## returns tuple: (kind, payload)
+    def classify_content(self, line: str):
+        found = self._object_regex.search(line)
+        if found:
+            object_name = found.group(1)
+            if object_name:
+                return ENTRY_OBJECT, self._to_text(object_name)
+
+        marker = self._linking_marker
+        index = line.find(marker)
+        if index >= 0:
+            linking_name = line[index + len(marker) :]
+            if linking_name:
+                return ENTRY_LINKING, self._to_text(linking_name)
+
+        marker = self._target_marker
+        index = line.find(marker)
+        if index >= 0:
+            target_name = line[index + len(marker) :]
+            if target_name:
+                return ENTRY_TARGET, self._to_text(target_name)
+
+        return ENTRY_UNKNOWN, None
+
+
+class BytesLineClassifier(LineClassifier):
+    """Classify lines given as bytes.
+
+    Only extracted fields are decoded, invalid UTF-8 sequences are replaced.
+    """
+
+    def _marker(self, text: str):
+        return text.encode()
+
+    def _to_text(self, value) -> str:
+        return value.decode("utf-8", errors="replace")
+
+
+class BuildLog:
+    """Calculate compilation times from classified log entries.
+
+    Results are kept in compact CompileStore, 'target_queue' is lazy view of finished targets.
+    """
+
+    ## store: object storing results (e.g. CompileStore, TopCompileStore)
+    def __init__(self, store=None):
+        self.store = store
+        if self.store is None:
+            self.store = CompileStore()
+        ## all times are integer microseconds
         self._curr_object_name: str = None
-        self._curr_object_time: datetime = None
-        self._linking_start: datetime = None
-        self._target_start: datetime = None  ## name of target appears when target finishes
+        self._curr_object_time: int = None
+        self._linking_start: int = None
+        self._target_start: int = None  ## name of target appears when target finishes
+        self.first_time: int = None
+        self.last_time: int = None
+
+    @property
+    def target_queue(self) -> TargetsView:
+        return TargetsView(self.store)
+
+    ## objects of not finished target
+    @property
+    def object_queue(self) -> List[Any]:
+        store = self.store
+        return [store.get_object(index) for index in store.get_pending_range()]
+
+    def add_timestamp(self, entry_time):
+        if entry_time is None:
+            return
+        if self.first_time is None:
+            self.first_time = entry_time
+        self.last_time = entry_time
+
+    ## in-flight state of log, allows to continue parsing in other instance
+    ## objects of not finished target are kept in store
+    def get_state(self):
+        return {
+            "curr_object_name": self._curr_object_name,
+            "curr_object_time": self._curr_object_time,
+            "linking_start": self._linking_start,
+            "target_start": self._target_start,
+            "first_time": self.first_time,
+            "last_time": self.last_time,
+        }
+
+    def set_state(self, state):
+        self._curr_object_name = state.get("curr_object_name")
+        self._curr_object_time = state.get("curr_object_time")
+        self._linking_start = state.get("linking_start")
+        self._target_start = state.get("target_start")
+        self.first_time = state.get("first_time")
+        self.last_time = state.get("last_time")
+
+    def get_compile_list(self, sort_data=True) -> List[Any]:
+        return get_compile_list(self, sort_data)
+
+    def add_entry(self, entry_time, kind, payload):
+        self.add_timestamp(entry_time)
+        if kind == ENTRY_OBJECT:
+            self.add_object_start(payload, entry_time)
+        elif kind == ENTRY_LINKING:
+            self.add_linking_start(entry_time)
+        elif kind == ENTRY_TARGET:
+            self.add_target_finish(payload, entry_time)
+        else:
+            self.add_unknown_entry(entry_time)
 
     def add_unknown_entry(self, entry_time):
         if self._target_start is None:
@@ -48,8 +314,7 @@ class BuildLog:
         if self._curr_object_name is None:
             # no object
             return
-        diff_secs = calculate_time_diff(self._curr_object_time, end_time)
-        self.object_queue.append((self._curr_object_name, diff_secs))
+        self.store.add_object(self._curr_object_name, end_time - self._curr_object_time)
         self._curr_object_name = None
         self._curr_object_time = None
 
@@ -64,154 +329,132 @@ class BuildLog:
     def add_target_finish(self, target_name, end_time):
         self.add_object_end(end_time)
 
-        linking_secs = 0.0
+        linking_time = 0
         if self._linking_start is not None:
-            linking_secs = calculate_time_diff(self._linking_start, end_time)
+            linking_time = end_time - self._linking_start
         ## else can happen e.g. when target has no cpp files
 
-        target_secs = 0.0
+        target_time = 0
         if self._target_start is not None:
-            target_secs = calculate_time_diff(self._target_start, end_time)
+            target_time = end_time - self._target_start
 
-        target_data = {
-            "target": target_name,
-            "build_time": target_secs,
-            "link_time": linking_secs,
-            "objects": self.object_queue.copy(),
-        }
-        self.target_queue.append(target_data)
+        self.store.add_target(target_name, target_time, linking_time)
 
         self._linking_start = None
         self._target_start = end_time  ## handles cases where there are targets without cpp files
-        self.object_queue.clear()
 
 
+## start_time, end_time: int - microseconds
 def calculate_time_diff(start_time, end_time):
-    diff = end_time - start_time
-    diff_secs = diff.total_seconds()
-    return diff_secs
+    return (end_time - start_time) / MICROSECONDS_PER_SECOND
 
 
 # output of make -j1 | ts '[%H:%M:%.S]'
-def read_compile_log(log_path: str, sort_data=True):
-    content = read_file(log_path)
-    if content is None:
+## build_log: BuildLog filled with log entries (e.g. with custom store)
+def read_compile_log(log_path: str, sort_data=True, build_log: BuildLog = None):
+    if log_path == "-":
+        return parse_compile_lines(sys.stdin.buffer, sort_data, BytesLineClassifier(), build_log)
+    if not os.path.isfile(log_path):
         _LOGGER.warning("unable to read content from file '%s'", log_path)
         return None
-    return parse_compile_log(content, sort_data)
+    return parse_compile_lines(read_log_lines(log_path), sort_data, BytesLineClassifier(), build_log)
 
 
 ## content: str - multiline string
 def parse_compile_log(content: str, sort_data=True) -> List[Any]:
-    build_log = BuildLog()
-
-    first_time = None
-    last_time = None
-
-    for line in content.splitlines():
-        line = line.strip()
-
-        line_time = get_build_timestamp(line)
-        if line_time:
-            if not first_time:
-                first_time = line_time
-            last_time = line_time
-
-        object_name = get_after(line, r"Building \S+ object ")
-        if object_name:
-            build_log.add_object_start(object_name, line_time)
-            continue
-
-        linking_name = get_after(line, "Linking ")
-        if linking_name:
-            build_log.add_linking_start(line_time)
-            continue
-
-        target_name = get_after(line, "Built target ")
-        if target_name:
-            build_log.add_target_finish(target_name, line_time)
-            continue
-
-        ## unknown entry
-        build_log.add_unknown_entry(line_time)
-        # _LOGGER.warning("unknown entry: %s", line)
-
-    compile_list = build_log.target_queue
-    if sort_data:
-        compile_list.sort(key=lambda item: item["build_time"], reverse=True)
-        for target_data in compile_list:
-            objects_list = target_data["objects"]
-            objects_list.sort(key=lambda item: item[1], reverse=True)
-
-    total_secs = calculate_time_diff(first_time, last_time)
-    compile_list.insert(0, {"total_time": total_secs})
+    return parse_compile_lines(content.splitlines(), sort_data)
+
+
+## lines: iterable of lines (e.g. opened file, stdin, generator)
+## lines are consumed one by one, so memory usage does not depend on log size
+## classifier: BytesLineClassifier has to be passed if lines are bytes
+def parse_compile_lines(
+    lines: Iterable[str], sort_data=True, classifier: LineClassifier = None, build_log: BuildLog = None
+) -> List[Any]:
+    build_log = parse_build_log(lines, classifier, build_log)
+    return get_compile_list(build_log, sort_data)
+
+
+def parse_build_log(lines: Iterable[str], classifier: LineClassifier = None, build_log: BuildLog = None) -> BuildLog:
+    if classifier is None:
+        classifier = LineClassifier()
+    if build_log is None:
+        build_log = BuildLog()
+    classify = classifier.classify
+    add_entry = build_log.add_entry
+    for line in lines:
+        add_entry(*classify(line))
+    return build_log
+
+
+def get_compile_list(build_log: BuildLog, sort_data=True) -> List[Any]:
+    ## sorting is done on columns of store, dicts are created only for output
+    compile_list = build_log.store.to_list(sort_data)
+
+    total_secs = 0.0
+    if build_log.first_time is not None:
+        total_secs = calculate_time_diff(build_log.first_time, build_log.last_time)
+    summary = {"total_time": total_secs}
+    summary.update(build_log.store.get_summary())
+    compile_list.insert(0, summary)
 
     return compile_list
 
 
-def get_after(content, substring):
-    found = re.search(rf"({substring})(.*)$", content)
-    if not found:
-        # not found
-        return None
-    found_groups = found.groups()
-    if not found_groups:
-        # not found
-        return None
-    last_group = found_groups[-1]
-    return last_group
-
-
-def get_build_timestamp(content):
-    time_list = re.findall(r"\[(.*?)\] \[", content)
-    if len(time_list) != 1:
-        return None
-
-    time_text = time_list[0]
-    try:
-        return datetime.strptime(time_text, "%H:%M:%S.%f")
-    except ValueError:
-        # content does not match format
-        pass
-    try:
-        return datetime.strptime(time_text, "%Y-%m-%d %H:%M:%S.%f")
-    except ValueError:
-        # content does not match format
-        pass
-
-    raise RuntimeError(f"unable to get time form content: {time_text}")
-
-
-def print_log(compile_list):
+## lines are written in batches, so output of big results does not call 'print()' for each line
+def print_log(compile_list, out_stream=None, batch_size=4096):
+    if out_stream is None:
+        out_stream = sys.stdout
     max_length = 0
+    top_length = 0
     for target_data in compile_list:
         objects_list = target_data.get("objects")
-        if objects_list is None:
-            continue
-        for item in objects_list:
-            max_length = max(max_length, len(item[0]))
+        if objects_list:
+            max_length = max(max_length, max(len(item[0]) for item in objects_list))
+        top_objects = target_data.get("top_objects")
+        if top_objects:
+            top_length = max(top_length, max(len(item[1]) for item in top_objects))
     max_length += 2
+    top_length += 2
 
+    lines_list: List[str] = []
+    append = lines_list.append
     for target_data in compile_list:
         total_time = target_data.get("total_time")
         if total_time is not None:
-            print("total_time:", total_time, "sec")
+            append(f"total_time: {total_time} sec")
+        top_objects = target_data.get("top_objects")
+        if top_objects is not None:
+            append("slowest objects:")
+            for target_name, label, time in top_objects:
+                append(f"   {label: <{top_length}} {time:12.6f} sec  {target_name}")
 
         target_name = target_data.get("target")
         if target_name is not None:
-            print("target:", target_name)
+            append(f"target: {target_name}")
         build_time = target_data.get("build_time")
         if build_time is not None:
-            print("build time:", build_time, "sec")
+            append(f"build time: {build_time} sec")
         link_time = target_data.get("link_time")
         if link_time is not None:
-            print("link time: ", link_time, "sec")
+            append(f"link time:  {link_time} sec")
+        objects_num = target_data.get("objects_num")
+        if objects_num is not None:
+            append(f"objects number: {objects_num}")
+        objects_time = target_data.get("objects_time")
+        if objects_time is not None:
+            append(f"objects time: {objects_time} sec")
         objects_list = target_data.get("objects")
-        if objects_list is None:
-            continue
-        print("objects:")
-        objects_list = target_data["objects"]
-        for object_data in objects_list:
-            label = object_data[0]
-            time = object_data[1]
-            print(f"   {label: <{max_length}} {time:12.6f} sec")
+        if objects_list is not None:
+            append("objects:")
+            for label, time in objects_list:
+                append(f"   {label: <{max_length}} {time:12.6f} sec")
+
+        if len(lines_list) >= batch_size:
+            lines_list.append("")
+            out_stream.write("\n".join(lines_list))
+            lines_list.clear()
+
+    if lines_list:
+        lines_list.append("")
+        out_stream.write("\n".join(lines_list))
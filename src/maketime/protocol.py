@@ -0,0 +1,37 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Protocol of 'maketime serve' daemon: request and response are single lines of JSON.
+# Module is imported by client, so it imports only built-in modules.
+#
+
+import os
+import json
+
+## ===================================================================
+
+
+## path of unix socket of daemon
+SOCKET_ENV = "MAKETIME_SOCKET"
+
+
+def get_socket_path() -> str:
+    socket_path = os.environ.get(SOCKET_ENV)
+    if socket_path:
+        return socket_path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "maketime.sock")
+    temp_dir = os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(temp_dir, f"maketime-{os.getuid()}.sock")
+
+
+## encode message as single line of JSON
+def encode_message(message) -> bytes:
+    return json.dumps(message).encode("utf-8") + b"\n"
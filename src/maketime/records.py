@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import logging
+from typing import Any, List, Tuple
+
+from maketime.launcher import RECORDS_PREFIX, RECORDS_SUFFIX
+from maketime.parser import BuildLog, get_compile_list
+from maketime.ninja import fill_build_log
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+NANOSECONDS_PER_MICROSECOND = 1000
+
+
+## returns paths of record files written by launcher
+def find_record_files(records_dir: str) -> List[str]:
+    ret_list = []
+    for dir_entry in sorted(os.scandir(records_dir), key=lambda item: item.name):
+        if dir_entry.name.startswith(RECORDS_PREFIX) and dir_entry.name.endswith(RECORDS_SUFFIX):
+            ret_list.append(dir_entry.path)
+    return ret_list
+
+
+def is_records_dir(log_path: str) -> bool:
+    return os.path.isdir(log_path) and len(find_record_files(log_path)) > 0
+
+
+## returns list of tuples (start ns, end ns, exit code, output, working directory)
+def read_records(records_dir: str) -> List[Tuple[int, int, int, str, str]]:
+    records_list = []
+    for records_path in find_record_files(records_dir):
+        with open(records_path, "rb") as records_file:
+            for line in records_file:
+                fields = line.rstrip(b"\n").split(b"\t")
+                if len(fields) < 5:
+                    ## e.g. interrupted write
+                    continue
+                try:
+                    start_time = int(fields[0])
+                    end_time = int(fields[1])
+                    exit_code = int(fields[2])
+                except ValueError:
+                    continue
+                output = fields[3].decode("utf-8", errors="replace")
+                work_dir = fields[4].decode("utf-8", errors="replace")
+                records_list.append((start_time, end_time, exit_code, output, work_dir))
+    return records_list
+
+
+## convert records to entries (start us, end us, output) sorted by end time
+## outputs are relative to common working directory of invocations (e.g. build directory)
+def get_records_entries(records_list: List[Any]) -> List[Tuple[int, int, str]]:
+    entries = []
+    failed_num = 0
+    paths_list = []
+    for start_time, end_time, exit_code, output, work_dir in records_list:
+        if exit_code != 0 or not output:
+            failed_num += 1
+            continue
+        paths_list.append((start_time, end_time, os.path.normpath(os.path.join(work_dir, output)), work_dir))
+    if failed_num:
+        _LOGGER.info("skipped %s failed or unknown invocations", failed_num)
+    if not paths_list:
+        return entries
+    root_dir = os.path.commonpath([item[3] for item in paths_list])
+    for start_time, end_time, output_path, _ in paths_list:
+        entries.append(
+            (
+                start_time // NANOSECONDS_PER_MICROSECOND,
+                end_time // NANOSECONDS_PER_MICROSECOND,
+                os.path.relpath(output_path, root_dir),
+            )
+        )
+    entries.sort(key=lambda item: item[1])
+    return entries
+
+
+## merge records of launcher into build log, model of targets is the same as of '.ninja_log'
+def read_records_build_log(records_dir: str, build_log: BuildLog = None) -> BuildLog:
+    entries = get_records_entries(read_records(records_dir))
+    return fill_build_log(entries, build_log, time_unit=1)
+
+
+def read_records_compile_list(records_dir: str, sort_data=True, build_log: BuildLog = None):
+    if not os.path.isdir(records_dir):
+        _LOGGER.warning("unable to read records from directory '%s'", records_dir)
+        return None
+    build_log = read_records_build_log(records_dir, build_log)
+    return get_compile_list(build_log, sort_data)
@@ -0,0 +1,108 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import sys
+import time
+import logging
+import asyncio
+from datetime import datetime
+from typing import List
+
+from maketime.parser import BuildLog, BytesLineClassifier, MICROSECONDS_PER_SECOND
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+class BuildRunner:
+    """Run build command, timestamp its output and feed parser while build is running.
+
+    Lines are timestamped using monotonic clock (anchored to wall clock at start) and stored
+    in log file in format accepted by 'read_compile_log', so no separate parsing is needed.
+    """
+
+    ## maximum length of output line
+    LINE_LIMIT = 16 * 1024 * 1024
+
+    def __init__(self, log_path: str = None, build_log=None, classifier=None, echo=True):
+        self.log_path = log_path
+        self.build_log = build_log
+        if self.build_log is None:
+            self.build_log = BuildLog()
+        self.classifier = classifier
+        if self.classifier is None:
+            self.classifier = BytesLineClassifier()
+        self.echo = echo
+        self._log_file = None
+        ## True if command was executed
+        self.started = False
+        self._base_wall_time = 0
+        self._base_mono_time = 0
+
+    ## returns exit code of command (126 or 127 if command can not be executed)
+    def run(self, command: List[str]) -> int:
+        self._base_wall_time = time.time_ns() // 1000
+        self._base_mono_time = time.monotonic_ns() // 1000
+        try:
+            return asyncio.run(self._execute(command))
+        finally:
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+
+    async def _execute(self, command: List[str]) -> int:
+        _LOGGER.debug("executing: %s", command)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, limit=self.LINE_LIMIT
+            )
+        except OSError as exc:
+            ## exit codes of shell: 126 - command not executable, 127 - command not found
+            _LOGGER.error("unable to execute %s: %s", command[0], exc)
+            return 126 if isinstance(exc, PermissionError) else 127
+        self.started = True
+        ## log file is created only if command started
+        if self.log_path:
+            ## pylint: disable=R1732
+            self._log_file = open(self.log_path, "wb", buffering=1024 * 1024)
+        await asyncio.gather(
+            self._read_stream(process.stdout, sys.stdout.buffer),
+            self._read_stream(process.stderr, sys.stderr.buffer),
+        )
+        return await process.wait()
+
+    async def _read_stream(self, stream, echo_stream):
+        while True:
+            line = await stream.readline()
+            if not line:
+                break
+            self.add_line(line)
+            if self.echo:
+                echo_stream.write(line)
+                echo_stream.flush()
+
+    def add_line(self, line: bytes):
+        mono_time = time.monotonic_ns() // 1000
+        line_time = self._base_wall_time + mono_time - self._base_mono_time
+        stamped_line = format_timestamp(line_time).encode() + b" " + line
+        if not stamped_line.endswith(b"\n"):
+            stamped_line += b"\n"
+        if self._log_file is not None:
+            self._log_file.write(stamped_line)
+        ## classify stamped line, so results are the same as from parsing of stored log
+        self.build_log.add_entry(*self.classifier.classify(stamped_line))
+
+
+## line_time: int - microseconds since epoch
+def format_timestamp(line_time: int) -> str:
+    seconds, microseconds = divmod(line_time, MICROSECONDS_PER_SECOND)
+    time_value = datetime.fromtimestamp(seconds).replace(microsecond=microseconds)
+    return time_value.strftime("[%Y-%m-%d %H:%M:%S.%f]")
@@ -0,0 +1,129 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import io
+import json
+import socket
+import logging
+import traceback
+import socketserver
+import contextlib
+from typing import Callable, List
+
+from maketime.protocol import encode_message
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+class LocalRequest(Exception):
+    """Raised by executed function if request has to be executed in process of client."""
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Execute arguments of request and send back exit code and captured output."""
+
+    def handle(self):
+        request_data = self.rfile.readline()
+        if not request_data:
+            return
+        try:
+            request = json.loads(request_data)
+            args_list = [str(item) for item in request["args"]]
+            work_dir = request.get("cwd") or self.server.work_dir
+        except (ValueError, KeyError, TypeError) as exc:
+            self.wfile.write(encode_message({"exit_code": 2, "stdout": "", "stderr": f"invalid request: {exc}\n"}))
+            return
+        response = self.server.execute_request(args_list, work_dir)
+        self.wfile.write(encode_message(response))
+
+
+class ToolServer(socketserver.UnixStreamServer):
+    """Daemon executing requests of clients received over unix socket.
+
+    Requests are executed one by one in process of daemon, so imported modules, parser of
+    arguments and cached results are reused. Working directory and standard output are
+    replaced for time of request.
+    """
+
+    def __init__(self, socket_path: str, execute: Callable[[List[str]], int]):
+        self.execute = execute
+        self.work_dir = os.getcwd()
+        ## socket file is created by bind already with permissions of owner only
+        prev_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, RequestHandler)
+        finally:
+            os.umask(prev_umask)
+
+    def execute_request(self, args_list: List[str], work_dir: str):
+        out_stream = io.StringIO()
+        err_stream = io.StringIO()
+        exit_code = 0
+        local = False
+        try:
+            os.chdir(work_dir)
+            with contextlib.redirect_stdout(out_stream), contextlib.redirect_stderr(err_stream):
+                try:
+                    exit_code = self.execute(args_list)
+                except LocalRequest:
+                    local = True
+                except SystemExit as exc:
+                    ## e.g. invalid arguments
+                    exit_code = exc.code
+                except Exception:  # pylint: disable=W0718
+                    traceback.print_exc()
+                    exit_code = 1
+        except OSError as exc:
+            err_stream.write(f"unable to change directory to {work_dir}: {exc}\n")
+            exit_code = 1
+        finally:
+            os.chdir(self.work_dir)
+        if local:
+            ## e.g. request reads standard input of client
+            _LOGGER.debug("request %s passed back to client", args_list)
+            return {"local": True}
+        if exit_code is None:
+            exit_code = 0
+        elif not isinstance(exit_code, int):
+            err_stream.write(f"{exit_code}\n")
+            exit_code = 1
+        _LOGGER.debug("executed request %s with exit code %s", args_list, exit_code)
+        return {"exit_code": exit_code, "stdout": out_stream.getvalue(), "stderr": err_stream.getvalue()}
+
+
+## returns True if daemon is listening on socket
+def is_server_running(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+## serve requests until interrupted
+## execute: function executing arguments of request, returns exit code
+def serve(socket_path: str, execute: Callable[[List[str]], int]):
+    if os.path.exists(socket_path):
+        if is_server_running(socket_path):
+            raise RuntimeError(f"daemon already listening on {socket_path}")
+        ## left by killed daemon
+        os.remove(socket_path)
+    with ToolServer(socket_path, execute) as server:
+        _LOGGER.info("listening on %s", socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            _LOGGER.info("stopped")
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(socket_path)
@@ -0,0 +1,287 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import re
+import heapq
+import logging
+from array import array
+from typing import Any, Dict, Iterable, List, Set
+
+from maketime.store import MICROSECONDS_PER_SECOND, to_microseconds
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+## kinds of nodes
+NODE_PREPARE = 0
+NODE_OBJECT = 1
+NODE_LINK = 2
+
+NODE_KIND_NAMES = ["prepare", "object", "link"]
+
+
+class BuildGraph:
+    """Graph of build jobs of serial build: preparation step, objects and link of each target.
+
+    Preparation step covers time of target not spent on objects and linking (e.g. code generation).
+    Objects of target wait for preparation step, which waits for links of dependencies of target.
+    Link of target waits for all objects of target. Times of nodes are integer microseconds.
+    """
+
+    def __init__(self):
+        self.node_kind = array("B")
+        self.node_name: List[str] = []
+        self.node_target = array("I")
+        self.node_time = array("q")
+        self.successors: List[List[int]] = []
+        self.target_names: List[str] = []
+
+    def nodes_num(self) -> int:
+        return len(self.node_time)
+
+    def add_node(self, kind: int, name: str, target_index: int, duration: int) -> int:
+        node_id = len(self.node_time)
+        self.node_kind.append(kind)
+        self.node_name.append(name)
+        self.node_target.append(target_index)
+        self.node_time.append(duration)
+        self.successors.append([])
+        return node_id
+
+    def add_edge(self, from_node: int, to_node: int):
+        self.successors[from_node].append(to_node)
+
+    def get_serial_time(self) -> int:
+        return sum(self.node_time)
+
+    ## returns node ids in topological order
+    def get_topological_order(self) -> List[int]:
+        successors = self.successors
+        indegree = self.get_indegree()
+        order = [node for node, degree in enumerate(indegree) if degree == 0]
+        for node in order:
+            ## list grows while iterating
+            for next_node in successors[node]:
+                indegree[next_node] -= 1
+                if indegree[next_node] == 0:
+                    order.append(next_node)
+        if len(order) != len(successors):
+            raise ValueError("dependency cycle detected in build graph")
+        return order
+
+    def get_indegree(self) -> List[int]:
+        indegree = [0] * len(self.successors)
+        for succ_list in self.successors:
+            for next_node in succ_list:
+                indegree[next_node] += 1
+        return indegree
+
+    ## bottom level of node: length of longest path from start of node to end of build
+    def get_bottom_levels(self, order: List[int] = None) -> List[int]:
+        if order is None:
+            order = self.get_topological_order()
+        successors = self.successors
+        node_time = self.node_time
+        levels = [0] * len(successors)
+        for node in reversed(order):
+            succ_level = 0
+            for next_node in successors[node]:
+                succ_level = max(succ_level, levels[next_node])
+            levels[node] = node_time[node] + succ_level
+        return levels
+
+    ## returns node ids of longest path of graph
+    def get_critical_path(self, levels: List[int]) -> List[int]:
+        if not levels:
+            return []
+        node = max(range(len(levels)), key=levels.__getitem__)
+        path = [node]
+        while self.successors[node]:
+            node = max(self.successors[node], key=levels.__getitem__)
+            path.append(node)
+        return path
+
+
+## targets: iterable of target dicts in order of build (e.g. 'BuildLog.target_queue' or not sorted compile list)
+## dependencies: dict target name -> names of targets it depends on, if not given then
+##               each target depends on previous target (order of serial build)
+def build_graph(targets: Iterable[Dict[str, Any]], dependencies: Dict[str, Set[str]] = None) -> BuildGraph:
+    graph = BuildGraph()
+    ## target index -> (prepare node, link node)
+    target_nodes = []
+    for target_data in targets:
+        target_name = target_data.get("target")
+        if target_name is None:
+            ## summary
+            continue
+        target_index = len(graph.target_names)
+        graph.target_names.append(target_name)
+        objects_list = target_data.get("objects") or []
+        objects_times = [to_microseconds(item[1]) for item in objects_list]
+        link_time = to_microseconds(target_data.get("link_time", 0.0))
+        prepare_time = to_microseconds(target_data.get("build_time", 0.0)) - link_time - sum(objects_times)
+        prepare_node = graph.add_node(NODE_PREPARE, target_name, target_index, max(prepare_time, 0))
+        link_node = graph.add_node(NODE_LINK, target_name, target_index, link_time)
+        for (object_name, _), object_time in zip(objects_list, objects_times):
+            object_node = graph.add_node(NODE_OBJECT, object_name, target_index, object_time)
+            graph.add_edge(prepare_node, object_node)
+            graph.add_edge(object_node, link_node)
+        if not objects_list:
+            graph.add_edge(prepare_node, link_node)
+        target_nodes.append((prepare_node, link_node))
+
+    if dependencies is None:
+        ## chain of targets
+        for target_index in range(1, len(target_nodes)):
+            graph.add_edge(target_nodes[target_index - 1][1], target_nodes[target_index][0])
+        return graph
+
+    ## in case of duplicated names last target is used
+    names_dict = {name: index for index, name in enumerate(graph.target_names)}
+    for target_index, target_name in enumerate(graph.target_names):
+        for dep_name in dependencies.get(target_name, []):
+            dep_index = names_dict.get(dep_name)
+            if dep_index is None or dep_index == target_index:
+                ## e.g. external library
+                continue
+            graph.add_edge(target_nodes[dep_index][1], target_nodes[target_index][0])
+    return graph
+
+
+## list scheduling of graph on given number of workers, ready nodes are started in order of
+## highest bottom level first (HLFET), nodes of zero time do not occupy workers
+## returns wall time in microseconds
+def schedule_graph(graph: BuildGraph, workers: int, levels: List[int]) -> int:
+    if workers < 1:
+        raise ValueError(f"invalid number of workers: {workers}")
+    successors = graph.successors
+    node_time = graph.node_time
+    indegree = graph.get_indegree()
+    ## heap of (-bottom level, node)
+    ready_heap: List[Any] = []
+    ## heap of (finish time, node)
+    running_heap: List[Any] = []
+
+    def release(node_list):
+        stack = list(node_list)
+        while stack:
+            node = stack.pop()
+            for next_node in successors[node]:
+                indegree[next_node] -= 1
+                if indegree[next_node] > 0:
+                    continue
+                if node_time[next_node] == 0:
+                    stack.append(next_node)
+                else:
+                    heapq.heappush(ready_heap, (-levels[next_node], next_node))
+
+    entry_list = [node for node, degree in enumerate(indegree) if degree == 0]
+    for node in entry_list:
+        if node_time[node] > 0:
+            heapq.heappush(ready_heap, (-levels[node], node))
+    release(node for node in entry_list if node_time[node] == 0)
+
+    curr_time = 0
+    while ready_heap or running_heap:
+        while ready_heap and len(running_heap) < workers:
+            node = heapq.heappop(ready_heap)[1]
+            heapq.heappush(running_heap, (curr_time + node_time[node], node))
+        curr_time, node = heapq.heappop(running_heap)
+        finished_list = [node]
+        ## release all nodes finished at the same time before starting next nodes
+        while running_heap and running_heap[0][0] == curr_time:
+            finished_list.append(heapq.heappop(running_heap)[1])
+        release(finished_list)
+    return curr_time
+
+
+## returns dict with serial time, critical path and predicted wall time for each number of jobs
+def simulate_build(graph: BuildGraph, jobs_list: List[int]) -> Dict[str, Any]:
+    levels = graph.get_bottom_levels()
+    serial_time = graph.get_serial_time() / MICROSECONDS_PER_SECOND
+    critical_path = graph.get_critical_path(levels)
+    critical_time = 0.0
+    if critical_path:
+        critical_time = levels[critical_path[0]] / MICROSECONDS_PER_SECOND
+
+    path_list = []
+    for node in critical_path:
+        node_time = graph.node_time[node]
+        if node_time == 0:
+            continue
+        path_list.append(
+            {
+                "kind": NODE_KIND_NAMES[graph.node_kind[node]],
+                "name": graph.node_name[node],
+                "target": graph.target_names[graph.node_target[node]],
+                "time": node_time / MICROSECONDS_PER_SECOND,
+            }
+        )
+
+    jobs_results = []
+    for jobs in jobs_list:
+        wall_time = schedule_graph(graph, jobs, levels) / MICROSECONDS_PER_SECOND
+        speedup = serial_time / wall_time if wall_time > 0.0 else 1.0
+        jobs_results.append({"jobs": jobs, "wall_time": wall_time, "speedup": speedup})
+
+    return {
+        "serial_time": serial_time,
+        "critical_time": critical_time,
+        "critical_path": path_list,
+        "jobs": jobs_results,
+    }
+
+
+## matches nodes, e.g.: "node0" [ label = "app", shape = egg ];
+GRAPHVIZ_NODE_REGEX = re.compile(r'"([^"]+)"\s*\[\s*label\s*=\s*"([^"]*)"')
+## matches edges, e.g.: "node0" -> "node1" // app -> lib
+GRAPHVIZ_EDGE_REGEX = re.compile(r'"([^"]+)"\s*->\s*"([^"]+)"')
+
+
+## read dependencies of targets from output of 'cmake --graphviz=<file>'
+## returns dict: target name -> set of names of targets it depends on
+def read_graphviz_dependencies(graph_path: str) -> Dict[str, Set[str]]:
+    with open(graph_path, encoding="utf-8") as graph_file:
+        return parse_graphviz_dependencies(graph_file)
+
+
+def parse_graphviz_dependencies(lines: Iterable[str]) -> Dict[str, Set[str]]:
+    labels_dict = {}
+    edges_list = []
+    for line in lines:
+        found = GRAPHVIZ_EDGE_REGEX.search(line)
+        if found:
+            edges_list.append((found.group(1), found.group(2)))
+            continue
+        found = GRAPHVIZ_NODE_REGEX.search(line)
+        if found:
+            labels_dict[found.group(1)] = found.group(2)
+    deps_dict: Dict[str, Set[str]] = {}
+    for from_id, to_id in edges_list:
+        from_name = labels_dict.get(from_id, from_id)
+        to_name = labels_dict.get(to_id, to_id)
+        deps_dict.setdefault(from_name, set()).add(to_name)
+    return deps_dict
+
+
+def print_simulation(result: Dict[str, Any], limit: int = None):
+    print(f"serial time:   {result['serial_time']:.3f} sec")
+    print(f"critical path: {result['critical_time']:.3f} sec")
+    for item in result["jobs"]:
+        print(f"jobs: {item['jobs']:4}  wall time: {item['wall_time']:12.3f} sec  speedup: {item['speedup']:6.2f}")
+    path_list = result["critical_path"][:limit]
+    if not path_list:
+        return
+    max_length = max(len(item["name"]) for item in path_list) + 2
+    print("critical path:")
+    for item in path_list:
+        print(f"   {item['kind']: <8} {item['name']: <{max_length}} {item['time']:12.6f} sec  {item['target']}")
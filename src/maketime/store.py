@@ -0,0 +1,316 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import heapq
+import logging
+from array import array
+from typing import Any, Dict, List
+from collections.abc import Sequence
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+MICROSECONDS_PER_SECOND = 1000000
+
+
+def to_microseconds(seconds: float) -> int:
+    return round(seconds * MICROSECONDS_PER_SECOND)
+
+
+class CompileStore:
+    """Compact columnar storage of parsed build results.
+
+    Times are kept as integer microseconds in 'array' columns. Object names are split
+    to directory prefix (e.g. 'CMakeFiles/<target>.dir/src/') stored once and name suffix.
+    Objects of target occupy contiguous range of object columns, range of target 'i' ends
+    at 'target_obj_end[i]'. Objects after last range belong to target not finished yet.
+    """
+
+    def __init__(self):
+        ## object columns
+        self.obj_prefix = array("I")
+        self.obj_suffix: List[str] = []
+        self.obj_time = array("q")
+        ## target columns
+        self.target_names: List[str] = []
+        self.target_build = array("q")
+        self.target_link = array("q")
+        self.target_obj_end = array("I")
+        ## interned prefixes of object names
+        self.prefixes: List[str] = []
+        self._prefix_ids: Dict[str, int] = {}
+
+    def objects_num(self) -> int:
+        return len(self.obj_time)
+
+    def targets_num(self) -> int:
+        return len(self.target_names)
+
+    ## duration: int - microseconds
+    def add_object(self, name: str, duration: int):
+        split_pos = name.rfind("/") + 1
+        prefix = name[:split_pos]
+        prefix_id = self._prefix_ids.get(prefix)
+        if prefix_id is None:
+            prefix_id = len(self.prefixes)
+            self._prefix_ids[prefix] = prefix_id
+            self.prefixes.append(prefix)
+        self.obj_prefix.append(prefix_id)
+        self.obj_suffix.append(name[split_pos:])
+        self.obj_time.append(duration)
+
+    ## finish target, all objects not assigned to any target become objects of the target
+    ## build_time, link_time: int - microseconds
+    def add_target(self, name: str, build_time: int, link_time: int):
+        self.target_names.append(name)
+        self.target_build.append(build_time)
+        self.target_link.append(link_time)
+        self.target_obj_end.append(len(self.obj_time))
+
+    ## append content of other store (e.g. parsed from next part of log)
+    def extend(self, other: "CompileStore"):
+        obj_offset = len(self.obj_time)
+        prefix_map = []
+        for prefix in other.prefixes:
+            prefix_id = self._prefix_ids.get(prefix)
+            if prefix_id is None:
+                prefix_id = len(self.prefixes)
+                self._prefix_ids[prefix] = prefix_id
+                self.prefixes.append(prefix)
+            prefix_map.append(prefix_id)
+        self.obj_prefix.extend(prefix_map[prefix_id] for prefix_id in other.obj_prefix)
+        self.obj_suffix.extend(other.obj_suffix)
+        self.obj_time.extend(other.obj_time)
+        self.target_names.extend(other.target_names)
+        self.target_build.extend(other.target_build)
+        self.target_link.extend(other.target_link)
+        self.target_obj_end.extend(obj_end + obj_offset for obj_end in other.target_obj_end)
+
+    def get_object_name(self, index: int) -> str:
+        return self.prefixes[self.obj_prefix[index]] + self.obj_suffix[index]
+
+    ## returns tuple (name, seconds)
+    def get_object(self, index: int):
+        return self.get_object_name(index), self.obj_time[index] / MICROSECONDS_PER_SECOND
+
+    ## returns range of object indexes belonging to target
+    def get_objects_range(self, target_index: int) -> range:
+        if target_index < 0:
+            target_index += len(self.target_names)
+        start_pos = 0
+        if target_index > 0:
+            start_pos = self.target_obj_end[target_index - 1]
+        return range(start_pos, self.target_obj_end[target_index])
+
+    ## returns objects of not finished target
+    def get_pending_range(self) -> range:
+        start_pos = 0
+        if self.target_obj_end:
+            start_pos = self.target_obj_end[-1]
+        return range(start_pos, len(self.obj_time))
+
+    ## returns target data in form of dict
+    def get_target(self, target_index: int, sort_objects=False) -> Dict[str, Any]:
+        objects_range = self.get_objects_range(target_index)
+        if sort_objects:
+            objects_range = sorted(objects_range, key=self.obj_time.__getitem__, reverse=True)
+        prefixes = self.prefixes
+        obj_prefix = self.obj_prefix
+        obj_suffix = self.obj_suffix
+        obj_time = self.obj_time
+        objects_list = [
+            (prefixes[obj_prefix[index]] + obj_suffix[index], obj_time[index] / MICROSECONDS_PER_SECOND)
+            for index in objects_range
+        ]
+        return {
+            "target": self.target_names[target_index],
+            "build_time": self.target_build[target_index] / MICROSECONDS_PER_SECOND,
+            "link_time": self.target_link[target_index] / MICROSECONDS_PER_SECOND,
+            "objects": objects_list,
+        }
+
+    ## returns indexes of targets ordered by build time descending
+    def get_sorted_targets(self) -> List[int]:
+        return sorted(range(len(self.target_names)), key=self.target_build.__getitem__, reverse=True)
+
+    ## returns additional data of whole build
+    def get_summary(self) -> Dict[str, Any]:
+        return {}
+
+    ## export to list of dicts (format of 'get_compile_list')
+    def to_list(self, sort_data=True) -> List[Dict[str, Any]]:
+        if sort_data:
+            return [self.get_target(index, True) for index in self.get_sorted_targets()]
+        return list(TargetsView(self))
+
+
+class TargetsView(Sequence):
+    """Read-only lazy view of targets of CompileStore, items are created on access."""
+
+    def __init__(self, store: CompileStore):
+        self.store = store
+
+    def __len__(self):
+        return self.store.targets_num()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.store.get_target(item) for item in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("target index out of range")
+        return self.store.get_target(index)
+
+
+class TopCompileStore:
+    """Store keeping only slowest objects: 'limit' objects of each target and 'limit' objects of whole build.
+
+    Objects are kept in bounded heaps while parsing, so memory and sorting cost depend on
+    limit, not on number of objects.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.target_names: List[str] = []
+        self.target_build = array("q")
+        self.target_link = array("q")
+        ## number and time sum of all objects of targets
+        self.target_objects_num = array("I")
+        self.target_objects_time = array("q")
+        ## sorted lists of (duration, name) of slowest objects of targets
+        self.target_objects: List[List[Any]] = []
+        ## heaps of (duration, -sequence number, name)
+        self._pending_heap: List[Any] = []
+        self._pending_num = 0
+        self._pending_time = 0
+        ## heap of (duration, -sequence number, name, target index), slowest objects of whole build
+        ## are among slowest objects of targets, so it is filled when target finishes
+        self._global_heap: List[Any] = []
+        self._objects_num = 0
+
+    def objects_num(self) -> int:
+        return self._objects_num
+
+    def targets_num(self) -> int:
+        return len(self.target_names)
+
+    def add_object(self, name: str, duration: int):
+        ## among equal durations earlier object wins (as in stable sort)
+        item = (duration, -self._objects_num, name)
+        self._objects_num += 1
+        self._pending_num += 1
+        self._pending_time += duration
+        push_bounded(self._pending_heap, item, self.limit)
+
+    def add_target(self, name: str, build_time: int, link_time: int):
+        target_index = len(self.target_names)
+        self.target_names.append(name)
+        self.target_build.append(build_time)
+        self.target_link.append(link_time)
+        self.target_objects_num.append(self._pending_num)
+        self.target_objects_time.append(self._pending_time)
+        self.target_objects.append([(item[0], item[2]) for item in sorted(self._pending_heap, reverse=True)])
+        for item in self._pending_heap:
+            push_bounded(self._global_heap, item + (target_index,), self.limit)
+        self._pending_heap = []
+        self._pending_num = 0
+        self._pending_time = 0
+
+    ## returns list of tuples (target name, object name, seconds) of slowest objects of finished targets
+    def get_top_objects(self, limit: int = None) -> List[Any]:
+        ret_list = []
+        for item in sorted(self._global_heap, reverse=True)[:limit]:
+            ret_list.append((self.target_names[item[3]], item[2], item[0] / MICROSECONDS_PER_SECOND))
+        return ret_list
+
+    def get_target(self, target_index: int) -> Dict[str, Any]:
+        objects_list = self.target_objects[target_index]
+        return {
+            "target": self.target_names[target_index],
+            "build_time": self.target_build[target_index] / MICROSECONDS_PER_SECOND,
+            "link_time": self.target_link[target_index] / MICROSECONDS_PER_SECOND,
+            "objects_num": self.target_objects_num[target_index],
+            "objects_time": self.target_objects_time[target_index] / MICROSECONDS_PER_SECOND,
+            "objects": [(name, duration / MICROSECONDS_PER_SECOND) for duration, name in objects_list],
+        }
+
+    def get_summary(self) -> Dict[str, Any]:
+        return {"objects_num": self._objects_num, "top_objects": self.get_top_objects()}
+
+    ## objects of targets are always sorted
+    def to_list(self, sort_data=True) -> List[Dict[str, Any]]:
+        targets_range = range(len(self.target_names))
+        if sort_data:
+            targets_range = sorted(targets_range, key=self.target_build.__getitem__, reverse=True)
+        return [self.get_target(index) for index in targets_range]
+
+
+class SummaryCompileStore:
+    """Store keeping only running totals of objects of targets (number of objects and sum of their times)."""
+
+    def __init__(self):
+        self.target_names: List[str] = []
+        self.target_build = array("q")
+        self.target_link = array("q")
+        self.target_objects_num = array("I")
+        self.target_objects_time = array("q")
+        self._pending_num = 0
+        self._pending_time = 0
+        self._objects_num = 0
+
+    def objects_num(self) -> int:
+        return self._objects_num
+
+    def targets_num(self) -> int:
+        return len(self.target_names)
+
+    def add_object(self, _name: str, duration: int):
+        self._objects_num += 1
+        self._pending_num += 1
+        self._pending_time += duration
+
+    def add_target(self, name: str, build_time: int, link_time: int):
+        self.target_names.append(name)
+        self.target_build.append(build_time)
+        self.target_link.append(link_time)
+        self.target_objects_num.append(self._pending_num)
+        self.target_objects_time.append(self._pending_time)
+        self._pending_num = 0
+        self._pending_time = 0
+
+    def get_target(self, target_index: int) -> Dict[str, Any]:
+        return {
+            "target": self.target_names[target_index],
+            "build_time": self.target_build[target_index] / MICROSECONDS_PER_SECOND,
+            "link_time": self.target_link[target_index] / MICROSECONDS_PER_SECOND,
+            "objects_num": self.target_objects_num[target_index],
+            "objects_time": self.target_objects_time[target_index] / MICROSECONDS_PER_SECOND,
+        }
+
+    def get_summary(self) -> Dict[str, Any]:
+        return {"objects_num": self._objects_num}
+
+    def to_list(self, sort_data=True) -> List[Dict[str, Any]]:
+        targets_range = range(len(self.target_names))
+        if sort_data:
+            targets_range = sorted(targets_range, key=self.target_build.__getitem__, reverse=True)
+        return [self.get_target(index) for index in targets_range]
+
+
+## push item to min-heap keeping at most 'limit' largest items
+def push_bounded(heap, item, limit):
+    if limit < 1:
+        raise ValueError(f"invalid limit of items: {limit}")
+    if len(heap) < limit:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
@@ -0,0 +1,210 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+
+from maketime.store import MICROSECONDS_PER_SECOND, to_microseconds
+
+try:
+    ## optional dependency
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+## names of events of clang time trace
+SOURCE_EVENT = "Source"
+COMPILER_EVENT = "ExecuteCompiler"
+TEMPLATE_EVENTS = {"InstantiateClass", "InstantiateFunction"}
+PHASE_EVENTS = {"Frontend", "Backend", "PerformPendingInstantiations", "Optimizer", "CodeGenPasses", "OptModule"}
+
+CATEGORIES = ["phases", "headers", "templates"]
+
+TRACE_SUFFIX = ".json"
+OBJECT_SUFFIXES = [".o", ".obj"]
+
+
+class TimeTraceCollector:
+    """Sum of times of phases, headers and templates across time traces of translation units.
+
+    Times of each trace are weighted, e.g. to match compilation time of object measured in build log.
+    Times of events are inclusive (time of header contains time of headers included by it).
+    """
+
+    def __init__(self):
+        ## category -> name -> [weighted time in microseconds, number of translation units]
+        self.items: Dict[str, Dict[str, List[float]]] = {category: {} for category in CATEGORIES}
+        self.traces_num = 0
+        self.total_time = 0.0
+
+    ## items: category -> name -> time in microseconds, total_time: duration of compiler in microseconds
+    def add_trace(self, items: Dict[str, Dict[str, int]], total_time: int, weight: float = 1.0):
+        self.traces_num += 1
+        self.total_time += total_time * weight
+        for category, times_dict in items.items():
+            category_dict = self.items[category]
+            for name, duration in times_dict.items():
+                item = category_dict.get(name)
+                if item is None:
+                    category_dict[name] = [duration * weight, 1]
+                else:
+                    item[0] += duration * weight
+                    item[1] += 1
+
+    def merge(self, other: "TimeTraceCollector"):
+        self.traces_num += other.traces_num
+        self.total_time += other.total_time
+        for category, other_dict in other.items.items():
+            category_dict = self.items[category]
+            for name, other_item in other_dict.items():
+                item = category_dict.get(name)
+                if item is None:
+                    category_dict[name] = list(other_item)
+                else:
+                    item[0] += other_item[0]
+                    item[1] += other_item[1]
+
+    ## returns dict: category -> list of dicts (name, time in seconds, count) sorted by time descending
+    def get_summary(self, limit: int = None) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "traces_num": self.traces_num,
+            "total_time": self.total_time / MICROSECONDS_PER_SECOND,
+        }
+        for category, category_dict in self.items.items():
+            items_list = sorted(category_dict.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+            summary[category] = [
+                {"name": name, "time": item[0] / MICROSECONDS_PER_SECOND, "count": item[1]} for name, item in items_list
+            ]
+        return summary
+
+
+def load_json_file(file_path: str):
+    with open(file_path, "rb") as json_file:
+        content = json_file.read()
+    if orjson is not None:
+        return orjson.loads(content)  # pylint: disable=E1101
+    return json.loads(content)
+
+
+## returns tuple (items, total time) of time trace, items: category -> name -> time in microseconds
+def parse_trace_file(trace_path: str) -> Tuple[Dict[str, Dict[str, int]], int]:
+    trace_data = load_json_file(trace_path)
+    events_list = trace_data.get("traceEvents") if isinstance(trace_data, dict) else None
+    if not events_list:
+        return None
+    headers_dict: Dict[str, int] = {}
+    templates_dict: Dict[str, int] = {}
+    phases_dict: Dict[str, int] = {}
+    total_time = 0
+    for event in events_list:
+        ## events other than complete ("X") events (e.g. metadata) have different names
+        name = event.get("name")
+        if name == SOURCE_EVENT:
+            detail = event["args"]["detail"]
+            headers_dict[detail] = headers_dict.get(detail, 0) + event["dur"]
+        elif name in TEMPLATE_EVENTS:
+            detail = event["args"]["detail"]
+            templates_dict[detail] = templates_dict.get(detail, 0) + event["dur"]
+        elif name in PHASE_EVENTS:
+            phases_dict[name] = phases_dict.get(name, 0) + event["dur"]
+        elif name == COMPILER_EVENT:
+            total_time += event["dur"]
+    return {"phases": phases_dict, "headers": headers_dict, "templates": templates_dict}, total_time
+
+
+## collect traces of chunk of files (executed in worker process)
+## traces_list: list of tuples (trace path, compilation time of object in microseconds or None)
+def collect_traces_chunk(traces_list: List[Tuple[str, int]]) -> TimeTraceCollector:
+    collector = TimeTraceCollector()
+    for trace_path, object_time in traces_list:
+        try:
+            trace_result = parse_trace_file(trace_path)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            _LOGGER.warning("unable to parse time trace %s: %s", trace_path, exc)
+            continue
+        if trace_result is None:
+            continue
+        items, total_time = trace_result
+        weight = 1.0
+        if object_time and total_time > 0:
+            ## attribute time of object measured in build log
+            weight = object_time / total_time
+        collector.add_trace(items, total_time, weight)
+    return collector
+
+
+## parse time traces in multiple processes, each process returns merged results of chunk of files
+def collect_traces(traces_list: List[Tuple[str, int]], jobs: int = None) -> TimeTraceCollector:
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs < 2 or len(traces_list) < 2:
+        return collect_traces_chunk(traces_list)
+    chunks_num = min(len(traces_list), jobs * 4)
+    chunks_list = [traces_list[index::chunks_num] for index in range(chunks_num)]
+    collector = TimeTraceCollector()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for chunk_collector in executor.map(collect_traces_chunk, chunks_list):
+            collector.merge(chunk_collector)
+    return collector
+
+
+## returns path of time trace written by clang next to object file (e.g. 'file.cpp.o' -> 'file.cpp.json')
+def get_trace_path(object_path: str) -> str:
+    return os.path.splitext(object_path)[0] + TRACE_SUFFIX
+
+
+## returns list of tuples (trace path, object time in microseconds) of objects of compile list
+def find_object_traces(build_dir: str, compile_list: List[Any]) -> List[Tuple[str, int]]:
+    traces_list = []
+    missing_num = 0
+    for target_data in compile_list:
+        for object_name, object_time in target_data.get("objects", []):
+            trace_path = get_trace_path(os.path.join(build_dir, object_name))
+            if not os.path.isfile(trace_path):
+                missing_num += 1
+                continue
+            traces_list.append((trace_path, to_microseconds(object_time)))
+    if missing_num:
+        _LOGGER.info("time traces of %s objects not found", missing_num)
+    return traces_list
+
+
+## returns list of tuples (trace path, None) of all time traces placed next to object files in build directory
+def find_dir_traces(build_dir: str) -> List[Tuple[str, int]]:
+    traces_list = []
+    for dir_path, _, files_list in os.walk(build_dir):
+        files_set = set(files_list)
+        for file_name in files_list:
+            if not file_name.endswith(TRACE_SUFFIX):
+                continue
+            base_name = file_name[: -len(TRACE_SUFFIX)]
+            if any(base_name + suffix in files_set for suffix in OBJECT_SUFFIXES):
+                traces_list.append((os.path.join(dir_path, file_name), None))
+    traces_list.sort()
+    return traces_list
+
+
+def print_timetrace(summary: Dict[str, Any], limit: int = None):
+    lines_list = [f"time traces: {summary['traces_num']}", f"total time: {summary['total_time']:.6f} sec"]
+    for category in CATEGORIES:
+        items_list = summary[category][:limit]
+        lines_list.append(f"{category}:")
+        max_length = max((len(item["name"]) for item in items_list), default=0) + 2
+        for item in items_list:
+            lines_list.append(f"   {item['name']: <{max_length}} {item['time']:12.6f} sec {item['count']:8}")
+    print("\n".join(lines_list))
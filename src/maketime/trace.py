@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+import json
+import logging
+from typing import Iterable
+
+from maketime.io import read_log_lines
+from maketime.parser import BuildLog, BytesLineClassifier, ENTRY_UNKNOWN, PROGRESS_REGEX
+from maketime.store import SummaryCompileStore
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+## threads of trace
+TARGETS_TID = 1
+JOBS_TID = 2
+
+
+class TraceWriter:
+    """Write Chrome Trace Event JSON (viewable in Perfetto UI or chrome://tracing) event by event.
+
+    Times of events are relative to first written event.
+    """
+
+    def __init__(self, out_file):
+        self.out_file = out_file
+        self.base_time: int = None
+        self._encoder = json.JSONEncoder(separators=(",", ":"))
+        self._separator = ""
+        self.out_file.write('{"displayTimeUnit":"ms","traceEvents":[\n')
+        self._write_event({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "build"}})
+        self._write_event({"name": "thread_name", "ph": "M", "pid": 1, "tid": TARGETS_TID, "args": {"name": "targets"}})
+        self._write_event({"name": "thread_name", "ph": "M", "pid": 1, "tid": JOBS_TID, "args": {"name": "jobs"}})
+
+    def _write_event(self, event):
+        self.out_file.write(self._separator)
+        self.out_file.write(self._encoder.encode(event))
+        self._separator = ",\n"
+
+    def _get_ts(self, entry_time: int) -> int:
+        if self.base_time is None:
+            self.base_time = entry_time
+        return entry_time - self.base_time
+
+    ## start_time, end_time: int - microseconds
+    def add_slice(self, name: str, category: str, start_time: int, end_time: int, tid: int = JOBS_TID):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._get_ts(start_time),
+            "dur": end_time - start_time,
+            "pid": 1,
+            "tid": tid,
+        }
+        self._write_event(event)
+
+    def add_counter(self, name: str, entry_time: int, value):
+        self._write_event({"name": name, "ph": "C", "ts": self._get_ts(entry_time), "pid": 1, "args": {name: value}})
+
+    def close(self):
+        self.out_file.write("\n]}\n")
+
+
+class TraceBuildLog(BuildLog):
+    """BuildLog writing slices of objects, link steps and targets to trace while parsing.
+
+    Only running totals of targets are kept in memory.
+    """
+
+    def __init__(self, writer: TraceWriter):
+        super().__init__(SummaryCompileStore())
+        self.writer = writer
+
+    def add_object_end(self, end_time):
+        if self._curr_object_name is not None:
+            self.writer.add_slice(self._curr_object_name, "object", self._curr_object_time, end_time)
+        super().add_object_end(end_time)
+
+    def add_target_finish(self, target_name, end_time):
+        ## finish current object before link and target slices
+        self.add_object_end(end_time)
+        if self._linking_start is not None:
+            self.writer.add_slice(f"link {target_name}", "link", self._linking_start, end_time)
+        if self._target_start is not None:
+            self.writer.add_slice(target_name, "target", self._target_start, end_time, TARGETS_TID)
+        super().add_target_finish(target_name, end_time)
+
+
+class TraceExporter:
+    """Convert compile log lines to trace.
+
+    Besides slices of objects, link steps and targets, other lines of make progress (e.g. generating code)
+    are written as 'step' slices lasting until next entry, progress percentage is written as counter.
+    """
+
+    def __init__(self, out_file):
+        self.writer = TraceWriter(out_file)
+        self.build_log = TraceBuildLog(self.writer)
+        self.classifier = BytesLineClassifier()
+        self.progress = None
+        ## (name, start time) of other step of build
+        self._step = None
+
+    def feed_lines(self, lines: Iterable[bytes]):
+        classify = self.classifier.classify
+        add_entry = self.build_log.add_entry
+        for line in lines:
+            entry = classify(line)
+            add_entry(*entry)
+            entry_time = entry[0]
+            if entry_time is None:
+                continue
+            if self.writer.base_time is None:
+                self.writer.base_time = entry_time
+            found = PROGRESS_REGEX.search(line)
+            if not found:
+                continue
+            self._finish_step(entry_time)
+            progress = int(found.group(1))
+            if progress != self.progress:
+                self.progress = progress
+                self.writer.add_counter("progress", entry_time, progress)
+            if entry[1] == ENTRY_UNKNOWN:
+                step_name = line[found.end() :].strip().decode("utf-8", errors="replace")
+                self._step = (step_name, entry_time)
+
+    def _finish_step(self, end_time):
+        if self._step is None:
+            return
+        step_name, start_time = self._step
+        self.writer.add_slice(step_name, "step", start_time, end_time)
+        self._step = None
+
+    def close(self):
+        last_time = self.build_log.last_time
+        if last_time is not None:
+            self._finish_step(last_time)
+            self.build_log.add_object_end(last_time)
+        self.writer.close()
+
+
+## write trace of compile log to file
+def export_trace(log_path: str, out_path: str):
+    if log_path == "-":
+        lines = sys.stdin.buffer
+    elif os.path.isfile(log_path):
+        lines = read_log_lines(log_path)
+    else:
+        _LOGGER.warning("unable to read content from file '%s'", log_path)
+        return False
+    with open(out_path, "w", encoding="utf-8", buffering=1024 * 1024) as out_file:
+        exporter = TraceExporter(out_file)
+        exporter.feed_lines(lines)
+        exporter.close()
+    return True
@@ -0,0 +1,99 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import csv
+import json
+import logging
+from typing import Any, Dict, Iterable
+
+
+_LOGGER = logging.getLogger(__name__)
+
+
+## ===================================================================
+
+
+OUTPUT_FORMATS = ["json", "compactjson", "jsonl", "csv"]
+
+CSV_COLUMNS = ["target", "build_time", "link_time", "object", "object_time"]
+
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+## write results in given format, records are encoded and written one by one
+## records: iterable of dicts (e.g. result of 'get_compile_list')
+def write_compile_list(records: Iterable[Dict[str, Any]], out_path: str, out_format: str = "json"):
+    writer_function = WRITERS_DICT.get(out_format)
+    if writer_function is None:
+        raise ValueError(f"unsupported output format: {out_format}")
+    with open(out_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE, newline="") as out_file:
+        writer_function(records, out_file)
+
+
+## output is the same as of 'json.dumps(records, indent=4)'
+def write_json(records: Iterable[Dict[str, Any]], out_file):
+    encoder = json.JSONEncoder(indent=4)
+    separator = "[\n    "
+    for record in records:
+        out_file.write(separator)
+        ## encoded strings do not contain new line characters, so record can be indented by simple replace
+        out_file.write(encoder.encode(record).replace("\n", "\n    "))
+        separator = ",\n    "
+    if separator.startswith("["):
+        ## no records
+        out_file.write("[]")
+    else:
+        out_file.write("\n]")
+
+
+## JSON without whitespaces
+def write_compact_json(records: Iterable[Dict[str, Any]], out_file):
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    separator = "["
+    for record in records:
+        out_file.write(separator)
+        out_file.write(encoder.encode(record))
+        separator = ","
+    if separator == "[":
+        ## no records
+        out_file.write("[")
+    out_file.write("]")
+
+
+## JSON Lines: one record per line
+def write_json_lines(records: Iterable[Dict[str, Any]], out_file):
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    for record in records:
+        out_file.write(encoder.encode(record))
+        out_file.write("\n")
+
+
+## one row per object, targets without objects are written as row without object
+def write_csv(records: Iterable[Dict[str, Any]], out_file):
+    writer = csv.writer(out_file)
+    writer.writerow(CSV_COLUMNS)
+    for record in records:
+        target_name = record.get("target")
+        if target_name is None:
+            ## summary
+            continue
+        build_time = record.get("build_time")
+        link_time = record.get("link_time")
+        objects_list = record.get("objects")
+        if not objects_list:
+            writer.writerow((target_name, build_time, link_time, "", ""))
+            continue
+        writer.writerows((target_name, build_time, link_time, name, time) for name, time in objects_list)
+
+
+WRITERS_DICT = {
+    "json": write_json,
+    "compactjson": write_compact_json,
+    "jsonl": write_json_lines,
+    "csv": write_csv,
+}
@@ -30,14 +30,26 @@ packages_data: Dict[str, Any] = {"maketime": []}
 ## additional scripts to install
 additional_scripts: List[str] = ["maketime.sh"]
 
+## console entry points
+entry_points_dict: Dict[str, List[str]] = {
+    "console_scripts": [
+        "maketime=maketime.main:main",
+        "maketime-launcher=maketime.launcher:main",
+        "maketime-client=maketime.client:main",
+    ]
+}
+
 requirements_path = os.path.join(SCRIPT_DIR, "requirements.txt")
 install_reqs = read_list(requirements_path)
 
+## optional dependencies
+extras_dict: Dict[str, List[str]] = {"numpy": ["numpy"], "zstd": ["zstandard"], "orjson": ["orjson"]}
+
 ## every time setup info changes then version number should be increased
 
 setup(
     name="maketime",
-    version="1.1.1",
+    version="1.3.0",
     description="calculate C++ object files compilation time based on `make` output",
     url="https://github.com/anetczuk/make-time",
     author="Arkadiusz Netczuk",
@@ -45,5 +57,7 @@ setup(
     packages=packages_list,
     package_data=packages_data,
     scripts=additional_scripts,
+    entry_points=entry_points_dict,
     install_requires=install_reqs,
+    extras_require=extras_dict,
 )
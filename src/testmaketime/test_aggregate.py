@@ -0,0 +1,86 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from maketime import aggregate
+from maketime.aggregate import TimesCollector, find_logs, collect_times
+from maketime.store import CompileStore
+
+from testmaketime.test_multiparser import generate_log
+
+
+def create_store(objects_list):
+    store = CompileStore()
+    for name, duration in objects_list:
+        store.add_object(name, duration)
+    store.add_target("target", 0, 0)
+    return store
+
+
+class TimesCollectorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = TimesCollector()
+        self.collector.add_store(create_store([("a.o", 1000000), ("b.o", 4000000)]))
+        self.collector.add_store(create_store([("a.o", 2000000), ("b.o", 1000000)]))
+        self.collector.add_store(create_store([("a.o", 6000000), ("c.o", 500000)]))
+
+    def test_get_stats(self):
+        rows_list = self.collector.get_stats(use_numpy=False)
+        expected_list = [
+            ["a.o", 3, 9.0, 3.0, 2.0, 5.6, 6.0, 14.0 / 3],
+            ["b.o", 2, 5.0, 2.5, 2.5, 3.85, 4.0, 2.25],
+            ["c.o", 1, 0.5, 0.5, 0.5, 0.5, 0.5, 0.0],
+        ]
+        self.assertEqual(len(expected_list), len(rows_list))
+        for expected_row, row in zip(expected_list, rows_list):
+            self.assertEqual(expected_row[:3], row[:3])
+            for expected_value, value in zip(expected_row[3:], row[3:]):
+                self.assertAlmostEqual(expected_value, value)
+
+    @unittest.skipIf(aggregate.numpy is None, "numpy not installed")
+    def test_get_stats_numpy(self):
+        rows_list = self.collector.get_stats(use_numpy=False)
+        numpy_list = self.collector.get_stats(use_numpy=True)
+        self.assertEqual(len(rows_list), len(numpy_list))
+        for row, numpy_row in zip(rows_list, numpy_list):
+            self.assertEqual(row[:3], numpy_row[:3])
+            for value, numpy_value in zip(row[3:], numpy_row[3:]):
+                self.assertAlmostEqual(value, numpy_value)
+
+
+class CollectTimesTest(unittest.TestCase):
+
+    def setUp(self):
+        ## pylint: disable=R1732
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for index in range(3):
+            log_path = os.path.join(self.temp_dir.name, f"log{index}.txt")
+            with open(log_path, "w", encoding="utf-8") as log_file:
+                log_file.write(generate_log(2, 3 + index, index * 100))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_collect_times(self):
+        logs_list = find_logs([self.temp_dir.name])
+        self.assertEqual(3, len(logs_list))
+        self.assertEqual(logs_list[:2], find_logs([os.path.join(self.temp_dir.name, "log[01].txt")]))
+
+        collector = collect_times(logs_list, jobs=1)
+        rows_list = collector.get_stats()
+        self.assertEqual(10, len(rows_list))
+        ## o0 is built in all logs
+        counts_dict = {row[0]: row[1] for row in rows_list}
+        self.assertEqual(3, counts_dict["CMakeFiles/t0.dir/o0.cpp.o"])
+        self.assertEqual(1, counts_dict["CMakeFiles/t1.dir/o4.cpp.o"])
+
+        self.assertEqual(rows_list, collect_times(logs_list, jobs=2).get_stats())
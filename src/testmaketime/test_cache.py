@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from maketime.cache import ResultCache
+
+
+class ResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        ## pylint: disable=R1732
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.log_path = os.path.join(self.temp_dir.name, "log.txt")
+        with open(self.log_path, "w", encoding="utf-8") as log_file:
+            log_file.write("content\n")
+        self.calls = 0
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def parse(self):
+        self.calls += 1
+        return [{"total_time": float(self.calls)}]
+
+    def test_get(self):
+        cache = ResultCache(self.cache_dir)
+        self.assertEqual([{"total_time": 1.0}], cache.get(self.log_path, self.parse))
+        self.assertEqual([{"total_time": 1.0}], cache.get(self.log_path, self.parse))
+        self.assertEqual(1, self.calls)
+
+        ## other options
+        self.assertEqual([{"total_time": 2.0}], cache.get(self.log_path, self.parse, options="parallel"))
+
+        ## modified file
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write("next line\n")
+        self.assertEqual([{"total_time": 3.0}], cache.get(self.log_path, self.parse))
+        self.assertEqual([{"total_time": 3.0}], cache.get(self.log_path, self.parse))
+
+    def test_get_hash(self):
+        cache = ResultCache(self.cache_dir, use_hash=True)
+        cache.get(self.log_path, self.parse)
+        ## same size and modification time, different content
+        file_stat = os.stat(self.log_path)
+        with open(self.log_path, "w", encoding="utf-8") as log_file:
+            log_file.write("changed\n")
+        os.utime(self.log_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+        self.assertEqual([{"total_time": 2.0}], cache.get(self.log_path, self.parse))
+
+    def test_get_memory(self):
+        cache = ResultCache(self.cache_dir, memory_size=1)
+        result = cache.get(self.log_path, self.parse)
+        ## same object is returned from memory
+        self.assertIs(result, cache.get(self.log_path, self.parse))
+        cache.get(self.log_path, self.parse, options="parallel")
+        ## evicted from memory, loaded from disk
+        self.assertIsNot(result, cache.get(self.log_path, self.parse))
+        self.assertEqual(result, cache.get(self.log_path, self.parse))
+        self.assertEqual(2, self.calls)
+
+    def test_invalid_entry(self):
+        cache = ResultCache(self.cache_dir)
+        cache.get(self.log_path, self.parse)
+        entry_path = cache.get_entry_path(cache.get_key(self.log_path))
+        with open(entry_path, "wb") as entry_file:
+            entry_file.write(b"invalid")
+        self.assertEqual([{"total_time": 2.0}], cache.get(self.log_path, self.parse))
+
+    def test_evict(self):
+        cache = ResultCache(self.cache_dir)
+        cache.get(self.log_path, self.parse, options=1)
+        cache.get(self.log_path, self.parse, options=2)
+        entries_list = cache.get_entries()
+        self.assertEqual(2, len(entries_list))
+        entry_size = entries_list[0][2]
+
+        ## use first entry, so second is least recently used
+        first_path = cache.get_entry_path(cache.get_key(self.log_path, 1))
+        os.utime(first_path, ns=(1, 1))
+        second_path = cache.get_entry_path(cache.get_key(self.log_path, 2))
+        os.utime(second_path, ns=(0, 0))
+        cache.get(self.log_path, self.parse, options=1)
+
+        cache.size_limit = entry_size * 2
+        cache.get(self.log_path, self.parse, options=3)
+        self.assertTrue(os.path.isfile(first_path))
+        self.assertFalse(os.path.isfile(second_path))
+        self.assertEqual(2, len(cache.get_entries()))
@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import unittest
+import tempfile
+
+from maketime.parser import parse_compile_log
+from maketime.checkpoint import read_compile_log_resumed, load_checkpoint
+
+
+CONTENT = """[23:59:55.038095] [  0%] Generating Header.h.stamp
+[23:59:55.076559] [ 10%] Built target target-a
+[23:59:57.329023] [ 20%] Building CXX object Log.cpp.o
+[23:59:57.820038] [ 25%] Building CXX object LogUtils.cpp.o
+[00:00:01.396720] [ 40%] Linking CXX static library liblogger.a
+[00:00:01.470617] [ 50%] Built target logger
+[00:00:02.470617] [ 60%] Building CXX object Main.cpp.o
+[00:00:03.470617] [ 70%] Linking CXX executable app
+[00:00:04.470617] [100%] Built target app
+"""
+
+
+class CheckpointTest(unittest.TestCase):
+
+    def setUp(self):
+        ## pylint: disable=R1732
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "log.txt")
+        self.checkpoint_path = os.path.join(self.temp_dir.name, "checkpoint.pickle")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_log(self, content, mode="w"):
+        with open(self.log_path, mode, encoding="utf-8") as log_file:
+            log_file.write(content)
+
+    def test_resume(self):
+        ## split in the middle of line
+        split_pos = CONTENT.index("Linking CXX static")
+        self.write_log(CONTENT[:split_pos])
+        compile_list = read_compile_log_resumed(self.log_path, self.checkpoint_path)
+        ## incomplete line is not parsed
+        lines_end = CONTENT.index("[00:00:01.396720]")
+        self.assertEqual(parse_compile_log(CONTENT[:lines_end]), compile_list)
+        checkpoint = load_checkpoint(self.checkpoint_path)
+        self.assertEqual(lines_end, checkpoint.offset)
+
+        self.write_log(CONTENT[split_pos:], mode="a")
+        compile_list = read_compile_log_resumed(self.log_path, self.checkpoint_path)
+        self.assertEqual(parse_compile_log(CONTENT), compile_list)
+        self.assertEqual(9.432522, compile_list[0]["total_time"])
+
+        ## nothing appended
+        compile_list = read_compile_log_resumed(self.log_path, self.checkpoint_path)
+        self.assertEqual(parse_compile_log(CONTENT), compile_list)
+
+    def test_rewritten_log(self):
+        self.write_log(CONTENT)
+        read_compile_log_resumed(self.log_path, self.checkpoint_path)
+
+        content = CONTENT.replace("logger", "other")
+        self.write_log(content)
+        compile_list = read_compile_log_resumed(self.log_path, self.checkpoint_path)
+        self.assertEqual(parse_compile_log(content), compile_list)
@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from maketime.diff import diff_compile_lists
+
+OLD_LIST = [
+    {"total_time": 10.0},
+    {"target": "lib", "build_time": 6.0, "link_time": 1.0, "objects": [("a.o", 2.0), ("b.o", 3.0), ("c.o", 1.0)]},
+    {"target": "old", "build_time": 4.0, "link_time": 0.5, "objects": [("d.o", 3.5)]},
+]
+
+NEW_LIST = [
+    {"total_time": 12.0},
+    {"target": "lib", "build_time": 8.0, "link_time": 1.0, "objects": [("a.o", 4.0), ("b.o", 3.001), ("c.o", 0.5)]},
+    {"target": "new", "build_time": 4.0, "link_time": 0.5, "objects": [("e.o", 3.5)]},
+]
+
+
+class DiffTest(unittest.TestCase):
+
+    def test_diff_compile_lists(self):
+        diff_data = diff_compile_lists(OLD_LIST, NEW_LIST, threshold=0.01)
+        self.assertEqual({"old_time": 10.0, "new_time": 12.0, "delta": 2.0}, diff_data["total_time"])
+        self.assertEqual(
+            [
+                {"object": "a.o", "old_time": 2.0, "new_time": 4.0, "delta": 2.0, "relative": 1.0},
+                {"object": "c.o", "old_time": 1.0, "new_time": 0.5, "delta": -0.5, "relative": -0.5},
+            ],
+            diff_data["objects"],
+        )
+        self.assertEqual([("e.o", 3.5)], diff_data["new_objects"])
+        self.assertEqual([("d.o", 3.5)], diff_data["removed_objects"])
+
+        targets_list = diff_data["targets"]
+        self.assertEqual(["new", "old", "lib"], [item["target"] for item in targets_list])
+        self.assertEqual(None, targets_list[0]["old_build_time"])
+        self.assertEqual(-4.0, targets_list[1]["build_delta"])
+        self.assertEqual(2.0, targets_list[2]["build_delta"])
+        self.assertEqual(0.0, targets_list[2]["link_delta"])
+
+    def test_diff_compile_lists_relative(self):
+        diff_data = diff_compile_lists(OLD_LIST, NEW_LIST, rel_threshold=0.6)
+        self.assertEqual(["a.o"], [item["object"] for item in diff_data["objects"]])
+        self.assertEqual(["new", "old"], [item["target"] for item in diff_data["targets"]])
+
+    def test_diff_targets_threshold(self):
+        diff_data = diff_compile_lists(OLD_LIST, NEW_LIST, threshold=3.0)
+        self.assertEqual([], diff_data["objects"])
+        ## added and removed targets are always reported
+        self.assertEqual(["new", "old"], [item["target"] for item in diff_data["targets"]])
@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from maketime.follow import LogFollower
+from maketime.parser import parse_compile_log
+
+
+CONTENT = """
+[15:20:55.038095] [  0%] Generating Header.h.stamp
+[15:20:55.076559] [ 10%] Built target target-a
+[15:20:57.329023] [ 20%] Building CXX object Log.cpp.o
+[15:20:57.820038] [ 25%] Building CXX object LogUtils.cpp.o
+[15:20:58.396720] [ 40%] Linking CXX static library liblogger.a
+[15:20:58.470617] [ 50%] Built target logger
+[15:20:59.470617] [ 60%] Building CXX object Main.cpp.o
+"""
+
+
+class LogFollowerTest(unittest.TestCase):
+
+    def test_feed_chunks(self):
+        follower = LogFollower(slowest_num=1)
+        data = CONTENT.encode()
+        ## feed in chunks splitting lines
+        for index in range(0, len(data), 7):
+            follower.feed(data[index : index + 7])
+        follower.flush()
+
+        self.assertEqual(60, follower.progress)
+        build_log = follower.build_log
+        self.assertEqual(2, build_log.objects_num)
+        self.assertEqual([(0.576682, "LogUtils.cpp.o")], build_log.slowest_objects)
+        self.assertEqual(("Main.cpp.o", build_log.last_time), build_log.get_current_object())
+        self.assertAlmostEqual(4.432522 * 40 / 60, follower.get_remaining_time())
+        self.assertEqual(parse_compile_log(CONTENT), build_log.get_compile_list())
+
+        report = follower.get_report()
+        self.assertIn("progress: 60%", report)
+        self.assertIn("current object: Main.cpp.o", report)
+        self.assertIn("0.576682 sec  LogUtils.cpp.o", report)
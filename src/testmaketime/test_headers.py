@@ -0,0 +1,132 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import tempfile
+import unittest
+
+from maketime.headers import HeaderIndex, DepfilesReader, parse_depfile, read_header_index
+
+
+DEPFILE_CONTENT = """CMakeFiles/app.dir/src/main.cpp.o: ../src/main.cpp \\
+ /usr/include/stdc-predef.h ../src/my\\ header.h \\
+ C:/include/win.h
+"""
+
+COMPILER_DEPEND_CONTENT = """# CMAKE generated file: DO NOT EDIT!
+# Generated by "Unix Makefiles" Generator, CMake Version 3.25
+
+CMakeFiles/core.dir/src/a.cpp.o: ../src/a.cpp \\
+  ../src/heavy.h \\
+  /usr/include/map
+
+CMakeFiles/core.dir/src/b.cpp.o: ../src/b.cpp \\
+  /usr/include/map
+
+../src/heavy.h:
+
+/usr/include/map:
+"""
+
+
+def write_file(file_path, content):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as out_file:
+        out_file.write(content)
+
+
+class ParseDepfileTest(unittest.TestCase):
+
+    def test_parse(self):
+        rules_dict = parse_depfile(DEPFILE_CONTENT)
+        self.assertEqual(
+            {
+                "CMakeFiles/app.dir/src/main.cpp.o": [
+                    "../src/main.cpp",
+                    "/usr/include/stdc-predef.h",
+                    "../src/my header.h",
+                    "C:/include/win.h",
+                ]
+            },
+            rules_dict,
+        )
+
+    def test_parse_phony(self):
+        rules_dict = parse_depfile(COMPILER_DEPEND_CONTENT)
+        self.assertEqual(
+            ["../src/a.cpp", "../src/heavy.h", "/usr/include/map"], rules_dict["CMakeFiles/core.dir/src/a.cpp.o"]
+        )
+        self.assertEqual([], rules_dict["/usr/include/map"])
+
+
+class HeaderIndexTest(unittest.TestCase):
+
+    def create_index(self):
+        index = HeaderIndex()
+        index.add_object("a.o", 5000000, ["common.h", "heavy.h"])
+        index.add_object("b.o", 4000000, ["common.h", "heavy.h", "heavy.h"])
+        index.add_object("c.o", 1000000, ["common.h"])
+        return index
+
+    def test_index(self):
+        index = self.create_index()
+        self.assertEqual(2, index.headers_num())
+        self.assertEqual(5, index.edges_num())
+        self.assertEqual(["a.o", "b.o"], index.get_header_objects("heavy.h"))
+        self.assertEqual(["a.o", "b.o", "c.o"], index.get_header_objects("common.h"))
+        self.assertEqual([], index.get_header_objects("unknown.h"))
+
+    def test_costs(self):
+        index = self.create_index()
+        for use_numpy in [True, False]:
+            rows_list = index.get_costs(use_numpy)
+            self.assertEqual([row[0] for row in rows_list], ["common.h", "heavy.h"])
+            self.assertEqual(["common.h", 3, 10.0, 10.0 / 3, 0.0, 0.0], rows_list[0])
+            heavy_row = rows_list[1]
+            self.assertEqual(["heavy.h", 2, 9.0, 4.5], heavy_row[:4])
+            ## mean with header minus mean without header
+            self.assertAlmostEqual(3.5, heavy_row[4])
+            self.assertAlmostEqual(7.0, heavy_row[5])
+
+
+class DepfilesReaderTest(unittest.TestCase):
+
+    def test_read(self):
+        with tempfile.TemporaryDirectory() as build_dir:
+            write_file(os.path.join(build_dir, "CMakeFiles/app.dir/src/main.cpp.o.d"), DEPFILE_CONTENT)
+            write_file(os.path.join(build_dir, "lib/CMakeFiles/core.dir/compiler_depend.make"), COMPILER_DEPEND_CONTENT)
+            reader = DepfilesReader(build_dir)
+
+            headers_list = reader.get_headers("CMakeFiles/app.dir/src/main.cpp.o")
+            self.assertEqual(
+                [
+                    "/usr/include/stdc-predef.h",
+                    os.path.normpath(os.path.join(build_dir, "../src/my header.h")),
+                    "C:/include/win.h",
+                ],
+                headers_list,
+            )
+            headers_list = reader.get_headers("lib/CMakeFiles/core.dir/src/a.cpp.o")
+            self.assertEqual([os.path.join(build_dir, "src/heavy.h"), "/usr/include/map"], headers_list)
+            self.assertEqual(None, reader.get_headers("lib/CMakeFiles/core.dir/src/c.cpp.o"))
+
+            compile_list = [
+                {"total_time": 3.0},
+                {"target": "app", "objects": [("CMakeFiles/app.dir/src/main.cpp.o", 1.0)]},
+                {
+                    "target": "core",
+                    "objects": [
+                        ("lib/CMakeFiles/core.dir/src/a.cpp.o", 1.5),
+                        ("lib/CMakeFiles/core.dir/src/b.cpp.o", 0.5),
+                    ],
+                },
+            ]
+            index = read_header_index(build_dir, compile_list)
+            self.assertEqual(3, index.objects_num())
+            self.assertEqual(5, index.headers_num())
+            self.assertEqual([1000000, 1500000, 500000], list(index.object_time))
@@ -0,0 +1,84 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import time
+import tempfile
+import unittest
+
+from maketime.history import HistoryStore
+from maketime.aggregate import percentile_sorted
+
+
+def create_compile_list(scale):
+    return [
+        {"total_time": 10.0 * scale},
+        {
+            "target": "app",
+            "build_time": 4.0 * scale,
+            "link_time": 1.0,
+            "objects": [("a.o", 1.0 * scale), ("b.o", 2.0 * scale)],
+        },
+        {"target": "lib", "build_time": 3.0 * scale, "link_time": 0.5, "objects": [("c.o", 2.5 * scale)]},
+    ]
+
+
+class HistoryStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        ## pylint: disable=R1732
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(os.path.join(self.temp_dir.name, "history", "history.sqlite"))
+        now = int(time.time())
+        ## builds of last days, the oldest one is outside of 90 days
+        for days, scale in [(100, 4.0), (3, 1.0), (2, 2.0), (1, 3.0)]:
+            self.store.add_build(create_compile_list(scale), build_time=now - days * 24 * 60 * 60, label=f"b{days}")
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_top(self):
+        self.assertEqual(4, self.store.builds_num())
+        rows_list = self.store.get_top(days=90)
+        self.assertEqual([["c.o", 3, 5.0, 7.5, 15.0], ["b.o", 3, 4.0, 6.0, 12.0], ["a.o", 3, 2.0, 3.0, 6.0]], rows_list)
+        rows_list = self.store.get_top(limit=1)
+        self.assertEqual([["c.o", 4, 6.25, 10.0, 25.0]], rows_list)
+
+    def test_trend(self):
+        rows_list = self.store.get_trend("app", window=2)
+        self.assertEqual(["b100", "b3", "b2", "b1"], [row[1] for row in rows_list])
+        self.assertEqual([16.0, 4.0, 8.0, 12.0], [row[2] for row in rows_list])
+        self.assertEqual([2, 2, 2, 2], [row[4] for row in rows_list])
+        self.assertEqual([12.0, 3.0, 6.0, 9.0], [row[5] for row in rows_list])
+        self.assertEqual([None, -12.0, 4.0, 4.0], [row[6] for row in rows_list])
+        self.assertEqual([16.0, 10.0, 6.0, 10.0], [row[7] for row in rows_list])
+        self.assertEqual([], self.store.get_trend("unknown"))
+        self.assertRaises(ValueError, self.store.get_trend, "app", window=0)
+
+    def test_percentile(self):
+        rows_list = self.store.get_percentile(0.95)
+        values_list = sorted([1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(["c.o", "b.o", "a.o"], [row[0] for row in rows_list])
+        self.assertEqual([4, 4, 4], [row[1] for row in rows_list])
+        self.assertAlmostEqual(percentile_sorted([2.5 * item for item in values_list], 0.95), rows_list[0][2])
+        self.assertAlmostEqual(percentile_sorted([1.0 * item for item in values_list], 0.95), rows_list[2][2])
+
+        rows_list = self.store.get_percentile(0.5, days=90, limit=1)
+        self.assertEqual([["c.o", 3, 5.0]], rows_list)
+
+    def test_has_log(self):
+        log_path = os.path.join(self.temp_dir.name, "log.txt")
+        with open(log_path, "w", encoding="utf-8") as log_file:
+            log_file.write("content\n")
+        self.assertFalse(self.store.has_log(log_path))
+        self.store.add_build(create_compile_list(1.0), log_path)
+        self.assertTrue(self.store.has_log(log_path))
+        with open(log_path, "a", encoding="utf-8") as log_file:
+            log_file.write("next line\n")
+        self.assertFalse(self.store.has_log(log_path))
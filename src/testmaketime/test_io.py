@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import os
+import gzip
+import bz2
+import lzma
+import tempfile
+
+from maketime.io import read_lines_mmap, read_log_lines, read_lines_compressed, detect_compression
+
+
+class IOTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as data_file:
+            data_file.write(b"aaa\nbb\xff\n\nccc")
+        self.data_path = data_file.name
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        os.remove(self.data_path)
+
+    def test_read_lines_mmap(self):
+        lines = list(read_lines_mmap(self.data_path))
+        self.assertEqual([b"aaa\n", b"bb\xff\n", b"\n", b"ccc"], lines)
+
+    def test_read_lines_mmap_range(self):
+        lines = list(read_lines_mmap(self.data_path, 4, 8))
+        self.assertEqual([b"bb\xff\n"], lines)
+
+    def test_read_lines_mmap_empty(self):
+        with open(self.data_path, "wb"):
+            pass
+        self.assertEqual([], list(read_lines_mmap(self.data_path)))
+
+    def test_read_log_lines_compressed(self):
+        content = b"aaa\nbb\xff\r\n\nccc"
+        for compression, compress_function in (("gzip", gzip.compress), ("xz", lzma.compress), ("bz2", bz2.compress)):
+            with open(self.data_path, "wb") as data_file:
+                data_file.write(compress_function(content))
+            self.assertEqual(compression, detect_compression(self.data_path))
+            lines = list(read_log_lines(self.data_path))
+            self.assertEqual([b"aaa\n", b"bb\xff\r\n", b"\n", b"ccc"], lines)
+            ## blocks smaller than lines
+            lines = list(read_lines_compressed(self.data_path, block_size=2, queue_size=1))
+            self.assertEqual([b"aaa\n", b"bb\xff\r\n", b"\n", b"ccc"], lines)
+
+    def test_read_log_lines_plain(self):
+        self.assertEqual(None, detect_compression(self.data_path))
+        self.assertEqual([b"aaa\n", b"bb\xff\n", b"\n", b"ccc"], list(read_log_lines(self.data_path)))
+
+    def test_read_lines_compressed_stop(self):
+        with open(self.data_path, "wb") as data_file:
+            data_file.write(gzip.compress(b"line\n" * 100000))
+        lines_iter = read_lines_compressed(self.data_path, block_size=64, queue_size=1)
+        self.assertEqual(b"line\n", next(lines_iter))
+        ## closing generator stops decompression thread
+        lines_iter.close()
+
+    def test_read_lines_compressed_invalid(self):
+        with open(self.data_path, "wb") as data_file:
+            data_file.write(gzip.compress(b"line\n" * 1000)[:-20])
+        with self.assertRaises(RuntimeError):
+            list(read_log_lines(self.data_path))
@@ -0,0 +1,83 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import os
+import sys
+import tempfile
+
+from maketime.launcher import main, find_output, RECORDS_DIR_ENV
+from maketime.records import read_records, read_records_compile_list
+from maketime.backend import get_backend
+
+
+class LauncherTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.records_dir = os.path.join(self.temp_dir.name, "records")
+        self.prev_env = os.environ.get(RECORDS_DIR_ENV)
+        os.environ[RECORDS_DIR_ENV] = self.records_dir
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        if self.prev_env is None:
+            del os.environ[RECORDS_DIR_ENV]
+        else:
+            os.environ[RECORDS_DIR_ENV] = self.prev_env
+        self.temp_dir.cleanup()
+
+    def test_find_output(self):
+        self.assertEqual("a.o", find_output(["-c", "a.cpp", "-o", "a.o"]))
+        self.assertEqual("b.o", find_output(["-ob.o", "-c", "b.cpp"]))
+        self.assertEqual("c.obj", find_output(["/c", "c.cpp", "/Foc.obj"]))
+        self.assertEqual("app.exe", find_output(["/OUT:app.exe"]))
+        self.assertEqual("", find_output(["-c", "d.cpp"]))
+
+    def test_main(self):
+        exit_code = main([sys.executable, "-c", "import sys; sys.exit(3)", "-o", "out.o"])
+        self.assertEqual(3, exit_code)
+        records_list = read_records(self.records_dir)
+        self.assertEqual(1, len(records_list))
+        start_time, end_time, exit_code, output, work_dir = records_list[0]
+        self.assertLess(start_time, end_time)
+        self.assertEqual(3, exit_code)
+        self.assertEqual("out.o", output)
+        self.assertEqual(os.getcwd(), work_dir)
+
+    def test_read_records_compile_list(self):
+        os.makedirs(self.records_dir)
+        with open(os.path.join(self.records_dir, "records-10.tsv"), "w", encoding="utf-8") as records_file:
+            records_file.write("1000000\t3000000\t0\tCMakeFiles/core.dir/a.cpp.o\t/build/src/core\n")
+            records_file.write("3000000\t3500000\t0\tlibcore.a\t/build/src/core\n")
+            records_file.write("3500000\t9000000\t0\tapp\t/build\n")
+        with open(os.path.join(self.records_dir, "records-11.tsv"), "w", encoding="utf-8") as records_file:
+            records_file.write("1500000\t2500000\t0\tCMakeFiles/core.dir/b.cpp.o\t/build/src/core\n")
+            records_file.write("2500000\t2600000\t1\tCMakeFiles/core.dir/c.cpp.o\t/build/src/core\n")
+            records_file.write("2500000\t26")
+
+        self.assertEqual("launcher", get_backend(self.records_dir).name)
+        compile_list = read_records_compile_list(self.records_dir)
+        self.assertEqual(
+            [
+                {"total_time": 0.008},
+                {"target": "app", "build_time": 0.0055, "link_time": 0.0055, "objects": []},
+                {
+                    "target": "core",
+                    "build_time": 0.0025,
+                    "link_time": 0.0005,
+                    "objects": [
+                        ("src/core/CMakeFiles/core.dir/a.cpp.o", 0.002),
+                        ("src/core/CMakeFiles/core.dir/b.cpp.o", 0.001),
+                    ],
+                },
+            ],
+            compile_list,
+        )
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import os
+import tempfile
+
+from maketime.parser import read_compile_log, get_compile_list
+from maketime.multiparser import split_file, parse_chunk, merge_chunks
+from maketime.multiparser import read_compile_log as read_compile_log_jobs
+
+
+def generate_log(targets_num, objects_num, start_secs=0):
+    lines = []
+    usecs = start_secs * 1000000
+    for target_index in range(targets_num):
+        usecs += 1234
+        lines.append(f"[{format_time(usecs)}] [  0%] Generating header_{target_index}.h")
+        for object_index in range(objects_num):
+            usecs += 7919 * (object_index + 1)
+            object_name = f"CMakeFiles/t{target_index}.dir/o{object_index}.cpp.o"
+            lines.append(f"[{format_time(usecs)}] [ 50%] Building CXX object {object_name}")
+            lines.append("warning: unused variable")
+        usecs += 4321
+        if object_index % 2 == 0:
+            lines.append(f"[{format_time(usecs)}] [ 50%] Linking CXX static library libt{target_index}.a")
+        usecs += 1111
+        lines.append(f"[{format_time(usecs)}] [ 50%] Built target t{target_index}")
+    return "\n".join(lines) + "\n"
+
+
+def format_time(usecs):
+    secs = usecs // 1000000 % 86400
+    return f"{secs // 3600:02}:{secs // 60 % 60:02}:{secs % 60:02}.{usecs % 1000000:06}"
+
+
+class MultiParserTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.log_file = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False)  # pylint: disable=R1732
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        os.remove(self.log_file.name)
+
+    def write_log(self, content):
+        self.log_file.write(content)
+        self.log_file.close()
+        return self.log_file.name
+
+    def test_split_file(self):
+        log_path = self.write_log("aaa\nbbb\nccc\nddd\n")
+        self.assertEqual([(0, 8), (8, 16)], split_file(log_path, 2))
+        self.assertEqual([(0, 4), (4, 8), (8, 12), (12, 16)], split_file(log_path, 8))
+
+    def test_merge_equals_serial(self):
+        ## crosses midnight
+        log_path = self.write_log(generate_log(20, 7, start_secs=86400 - 1))
+        expected = read_compile_log(log_path)
+        for parts in (2, 3, 7, 50, 300):
+            ranges_list = split_file(log_path, parts)
+            chunks_list = [parse_chunk(log_path, start_pos, end_pos) for start_pos, end_pos in ranges_list]
+            build_log = merge_chunks(chunks_list)
+            self.assertEqual(expected, get_compile_list(build_log), parts)
+
+    def test_read_compile_log_jobs(self):
+        log_path = self.write_log(generate_log(10, 5))
+        self.assertEqual(read_compile_log(log_path), read_compile_log_jobs(log_path, jobs=3))
@@ -0,0 +1,111 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import os
+import tempfile
+
+from maketime.ninja import NinjaLogParser, fill_build_log, read_ninja_log
+from maketime.backend import ParserBackend, get_backend
+
+FIRST_BUILD = """# ninja log v5
+0	1200	0	src/CMakeFiles/core.dir/a.cpp.o	1a2b
+0	2500	0	src/CMakeFiles/core.dir/b.cpp.o	1a2c
+2500	2900	0	src/libcore.so.1.2	1a2d
+2500	2900	0	src/libcore.so	1a2d
+5	3000	0	CMakeFiles/app.dir/main.cpp.o	1a2e
+0	3000	0	generated/config.h	1a2f
+3000	4000	0	bin/app	1a30
+"""
+
+SECOND_BUILD = """0	100	0	src/CMakeFiles/core.dir/a.cpp.o	2a2b
+100	300	0	src/libcore.so	2a2d
+300	800	0	bin/app	2a30
+"""
+
+
+class NinjaLogParserTest(unittest.TestCase):
+
+    def test_last_build(self):
+        parser = NinjaLogParser()
+        parser.add_lines(FIRST_BUILD.encode().splitlines(keepends=True))
+        self.assertEqual(5, parser.version)
+        self.assertEqual(7, len(parser.entries))
+        parser.add_lines(SECOND_BUILD.encode().splitlines(keepends=True))
+        self.assertEqual(
+            [(0, 100, "src/CMakeFiles/core.dir/a.cpp.o"), (100, 300, "src/libcore.so")], parser.entries[:2]
+        )
+        self.assertEqual(3, len(parser.entries))
+
+    def test_fill_build_log(self):
+        parser = NinjaLogParser()
+        parser.add_lines(FIRST_BUILD.encode().splitlines())
+        compile_list = fill_build_log(parser.entries).get_compile_list(False)
+        self.assertEqual(
+            [
+                {"total_time": 4.0},
+                {
+                    "target": "core",
+                    "build_time": 2.9,
+                    "link_time": 0.4,
+                    "objects": [("src/CMakeFiles/core.dir/a.cpp.o", 1.2), ("src/CMakeFiles/core.dir/b.cpp.o", 2.5)],
+                },
+                {"target": "(other)", "build_time": 3.0, "link_time": 0.0, "objects": [("generated/config.h", 3.0)]},
+                {
+                    "target": "app",
+                    "build_time": 3.995,
+                    "link_time": 1.0,
+                    "objects": [("CMakeFiles/app.dir/main.cpp.o", 2.995)],
+                },
+            ],
+            compile_list,
+        )
+
+
+class NinjaBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        ## Called before testfunction is executed
+        self.temp_dir = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.log_path = os.path.join(self.temp_dir.name, "build-log.txt")
+        self.checkpoint_path = os.path.join(self.temp_dir.name, "checkpoint.pickle")
+
+    def tearDown(self):
+        ## Called after testfunction was executed
+        self.temp_dir.cleanup()
+
+    def append_log(self, content):
+        with open(self.log_path, "a", encoding="utf-8") as log_file:
+            log_file.write(content)
+
+    def test_get_backend(self):
+        self.append_log(FIRST_BUILD)
+        self.assertEqual("ninja", get_backend(self.log_path).name)
+        self.assertEqual("make", get_backend(self.log_path, "make").name)
+        with open(self.log_path, "w", encoding="utf-8") as log_file:
+            log_file.write("[15:20:58.470617] [ 50%] Built target logger\n")
+        self.assertEqual("make", get_backend(self.log_path).name)
+
+    def test_incomplete_backend(self):
+        ## pylint: disable=W0223
+        class DetectOnlyBackend(ParserBackend):
+            def detect(self, log_path: str) -> bool:
+                return True
+
+        self.assertRaises(TypeError, DetectOnlyBackend)
+
+    def test_read_ninja_log_resumed(self):
+        self.append_log(FIRST_BUILD)
+        compile_list = read_ninja_log(self.log_path, checkpoint_path=self.checkpoint_path)
+        self.assertEqual(4.0, compile_list[0]["total_time"])
+        self.append_log(SECOND_BUILD)
+        compile_list = read_ninja_log(self.log_path, checkpoint_path=self.checkpoint_path)
+        self.assertEqual(compile_list, read_ninja_log(self.log_path))
+        self.assertEqual(0.8, compile_list[0]["total_time"])
+        self.assertEqual(["app", "core"], [item["target"] for item in compile_list[1:]])
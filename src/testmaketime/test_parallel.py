@@ -0,0 +1,115 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from maketime.parallel import ParallelBuildLog, ParallelLineClassifier, parse_parallel_log, get_linking_target
+
+
+class ParallelBuildLogTest(unittest.TestCase):
+
+    def test_get_linking_target(self):
+        self.assertEqual("hello_library", get_linking_target("CXX static library libhello_library.a"))
+        self.assertEqual("hello", get_linking_target("CXX shared library lib/libhello.so.1.2"))
+        self.assertEqual("hello_binary", get_linking_target("CXX executable hello_binary"))
+
+    def test_parse_interleaved(self):
+        content = """
+[10:00:00.000000] [ 10%] Building CXX object CMakeFiles/a.dir/a1.cpp.o
+[10:00:00.100000] [ 20%] Building CXX object CMakeFiles/b.dir/b1.cpp.o
+[10:00:01.000000] [ 30%] Building CXX object CMakeFiles/a.dir/a2.cpp.o
+[10:00:01.500000] [ 40%] Linking CXX static library libb.a
+[10:00:01.600000] [ 50%] Built target b
+[10:00:02.000000] [ 60%] Linking CXX executable a
+[10:00:02.500000] [100%] Built target a
+"""
+        output = parse_parallel_log(content)
+        self.assertEqual(3, len(output))
+        summary = output[0]
+        self.assertEqual(2.5, summary["total_time"])
+        self.assertAlmostEqual(4.0, summary["cpu_time"])
+        self.assertEqual(2, summary["max_concurrency"])
+        self.assertEqual(
+            [(0.0, 1), (0.1, 2), (1.0, 2), (1.5, 2), (1.6, 1), (2.0, 1), (2.5, 0)], summary["concurrency"]
+        )
+        self.assertDictEqual(
+            {
+                "target": "a",
+                "build_time": 2.5,
+                "link_time": 0.5,
+                "objects": [("CMakeFiles/a.dir/a1.cpp.o", 1.0), ("CMakeFiles/a.dir/a2.cpp.o", 1.0)],
+            },
+            output[1],
+        )
+        self.assertDictEqual(
+            {"target": "b", "build_time": 1.5, "link_time": 0.1, "objects": [("CMakeFiles/b.dir/b1.cpp.o", 1.4)]},
+            output[2],
+        )
+
+    def test_parse_explicit_markers(self):
+        content = """
+[10:00:00.000000] [maketime] begin CMakeFiles/a.dir/x.cpp.o
+[10:00:00.000000] [ 10%] Building CXX object CMakeFiles/a.dir/x.cpp.o
+[10:00:00.200000] [ 10%] Building CXX object CMakeFiles/a.dir/y.cpp.o
+[10:00:00.200000] [maketime] begin CMakeFiles/a.dir/y.cpp.o
+[10:00:00.700000] [maketime] end CMakeFiles/a.dir/y.cpp.o
+[10:00:00.900000] [maketime] end CMakeFiles/a.dir/x.cpp.o
+[10:00:01.000000] [ 50%] Linking CXX static library liba.a
+[10:00:01.200000] [ 50%] Built target a
+"""
+        output = parse_parallel_log(content)
+        self.assertEqual(2, len(output))
+        self.assertEqual(2, output[0]["max_concurrency"])
+        self.assertEqual([("CMakeFiles/a.dir/x.cpp.o", 0.9), ("CMakeFiles/a.dir/y.cpp.o", 0.5)], output[1]["objects"])
+        self.assertEqual(0.2, output[1]["link_time"])
+
+    def test_parse_serial_objects_without_target(self):
+        content = """
+[15:20:57.329023] [  0%] Building CXX object Log.cpp.o
+[15:20:57.820038] [  0%] Building CXX object LogUtils.cpp.o
+[15:20:58.396720] [  0%] Linking CXX static library liblogger.a
+[15:20:58.470617] [  0%] Built target logger
+"""
+        output = parse_parallel_log(content)
+        self.assertEqual(2, len(output))
+        self.assertEqual("logger", output[1]["target"])
+        self.assertEqual([("LogUtils.cpp.o", 0.576682), ("Log.cpp.o", 0.491015)], output[1]["objects"])
+        self.assertEqual(0.073897, output[1]["link_time"])
+
+    def test_unfinished_targets(self):
+        content = """
+[10:00:00.000000] [ 10%] Building CXX object CMakeFiles/a.dir/a1.cpp.o
+[10:00:00.500000] [ 20%] Building CXX object CMakeFiles/b.dir/b1.cpp.o
+[10:00:01.000000] [ 30%] Building CXX object CMakeFiles/a.dir/a2.cpp.o
+[10:00:01.200000] [maketime] begin CMakeFiles/c.dir/c1.cpp.o
+[10:00:02.000000] [ 40%] Linking CXX static library libb.a
+[10:00:03.000000] [ 50%] Building CXX object CMakeFiles/a.dir/a3.cpp.o
+"""
+        build_log = ParallelBuildLog()
+        classifier = ParallelLineClassifier()
+        for line in content.splitlines():
+            build_log.add_entry(*classifier.classify(line))
+        output = build_log.get_compile_list()
+        self.assertEqual(output, build_log.get_compile_list())
+
+        self.assertEqual(["a", "b", "c"], [item["target"] for item in output[1:]])
+        self.assertEqual(
+            [
+                ("CMakeFiles/a.dir/a1.cpp.o", 1.0),
+                ("CMakeFiles/a.dir/a2.cpp.o", 2.0),
+                ("CMakeFiles/a.dir/a3.cpp.o", 0.0),
+            ],
+            sorted(output[1]["objects"]),
+        )
+        self.assertEqual(1.0, output[2]["link_time"])
+        self.assertEqual([("CMakeFiles/c.dir/c1.cpp.o", 1.8)], output[3]["objects"])
+        ## time of all objects and links is counted
+        times_sum = sum(item[1] for target_data in output[1:] for item in target_data["objects"])
+        times_sum += sum(target_data["link_time"] for target_data in output[1:])
+        self.assertAlmostEqual(times_sum, output[0]["cpu_time"])
+        self.assertEqual(0, output[0]["concurrency"][-1][1])
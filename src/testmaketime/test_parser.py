@@ -7,8 +7,14 @@
 #
 
 import unittest
+import io
+import os
+import tempfile
 
-from maketime.parser import parse_compile_log
+from maketime.parser import read_compile_log, parse_compile_log, parse_compile_lines
+from maketime.parser import TimestampDecoder, MICROSECONDS_PER_DAY
+from maketime.parser import LineClassifier, BytesLineClassifier
+from maketime.parser import ENTRY_UNKNOWN, ENTRY_OBJECT, ENTRY_LINKING, ENTRY_TARGET
 
 
 class BuildLogTest(unittest.TestCase):
@@ -66,3 +72,107 @@ class BuildLogTest(unittest.TestCase):
             output[1],
         )
         self.assertDictEqual({"build_time": 0.038464, "link_time": 0.0, "objects": [], "target": "target-a"}, output[2])
+
+    def test_parse_compile_lines_stream(self):
+        content = """
+[12:51:27.539655] [ 25%] Building CXX object CMakeFiles/hello_library.dir/src/Hello.cpp.o
+[12:51:27.897072] [ 50%] Linking CXX static library libhello_library.a
+[12:51:28.071788] [ 50%] Built target hello_library
+"""
+        ## generator ensures lines are consumed one by one
+        lines = (line for line in io.StringIO(content))
+        output = parse_compile_lines(lines)
+        self.assertEqual(parse_compile_log(content), output)
+        self.assertEqual(2, len(output))
+        self.assertDictEqual({"total_time": 0.532133}, output[0])
+
+    def test_read_compile_log_invalid_utf8(self):
+        content = b"""
+[12:51:27.539655] [ 25%] Building CXX object CMakeFiles/hello_library.dir/src/Hel\xfflo.cpp.o
+[12:51:27.700000] warning: invalid \xc3\x28 sequence
+[12:51:27.897072] [ 50%] Linking CXX static library libhello_library.a
+[12:51:28.071788] [ 50%] Built target hello_library
+"""
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as log_file:
+            log_file.write(content)
+        try:
+            output = read_compile_log(log_file.name)
+        finally:
+            os.remove(log_file.name)
+        self.assertEqual(2, len(output))
+        self.assertEqual([("CMakeFiles/hello_library.dir/src/Hel\ufffdlo.cpp.o", 0.357417)], output[1]["objects"])
+
+    def test_parse_compile_log_midnight(self):
+        content = """
+[23:59:59.500000] [ 50%] Building CXX object a.cpp.o
+[00:00:00.250000] [ 50%] Linking CXX static library liba.a
+[00:00:00.500000] [ 50%] Built target a
+"""
+        output = parse_compile_log(content)
+        self.assertEqual(2, len(output))
+        self.assertDictEqual({"total_time": 1.0}, output[0])
+        self.assertDictEqual(
+            {"build_time": 1.0, "link_time": 0.25, "objects": [("a.cpp.o", 0.75)], "target": "a"},
+            output[1],
+        )
+
+
+class TimestampDecoderTest(unittest.TestCase):
+
+    def test_decode_time(self):
+        decoder = TimestampDecoder()
+        self.assertEqual(46287539655, decoder.decode("12:51:27.539655"))
+        ## shorter fraction handled by fallback
+        self.assertEqual(46287500000, decoder.decode("12:51:27.5"))
+        self.assertEqual(MICROSECONDS_PER_DAY + 1, decoder.decode("00:00:00.000001"))
+
+    def test_decode_datetime(self):
+        decoder = TimestampDecoder()
+        value = decoder.decode("2024-03-01 12:51:27.539655")
+        self.assertEqual(738946 * MICROSECONDS_PER_DAY + 46287539655, value)
+        next_value = decoder.decode("2024-03-02 00:00:00.000001")
+        self.assertEqual(MICROSECONDS_PER_DAY - 46287539655 + 1, next_value - value)
+
+    def test_decode_invalid(self):
+        decoder = TimestampDecoder()
+        self.assertRaises(RuntimeError, decoder.decode, "12:51")
+        self.assertRaises(RuntimeError, decoder.decode, "25:51:27.539655")
+
+
+class LineClassifierTest(unittest.TestCase):
+
+    def test_classify_kinds(self):
+        classifier = LineClassifier()
+        _, kind, payload = classifier.classify("[12:51:27.539655] [ 25%] Building CXX object src/Hello.cpp.o\n")
+        self.assertEqual((ENTRY_OBJECT, "src/Hello.cpp.o"), (kind, payload))
+        _, kind, payload = classifier.classify("[12:51:27.897072] [ 50%] Linking CXX static library libhello.a")
+        self.assertEqual((ENTRY_LINKING, "CXX static library libhello.a"), (kind, payload))
+        _, kind, payload = classifier.classify("[12:51:28.071788] [ 50%] Built target hello")
+        self.assertEqual((ENTRY_TARGET, "hello"), (kind, payload))
+        _, kind, payload = classifier.classify("[12:51:28.071788] [ 50%] Generating Header.h.stamp")
+        self.assertEqual((ENTRY_UNKNOWN, None), (kind, payload))
+
+    def test_classify_bytes(self):
+        classifier = BytesLineClassifier()
+        line_time, kind, payload = classifier.classify(b"[12:51:27.539655] [ 25%] Building CXX object a\xff.o\n")
+        self.assertEqual((46287539655, ENTRY_OBJECT, "a\ufffd.o"), (line_time, kind, payload))
+        self.assertEqual((None, ENTRY_UNKNOWN, None), classifier.classify(b"Building CXX object \xff.o"))
+
+    def test_classify_edge_cases(self):
+        ## (line, has timestamp, kind, payload)
+        cases = [
+            ("", False, ENTRY_UNKNOWN, None),
+            ("no timestamp at all", False, ENTRY_UNKNOWN, None),
+            ("[12:51:27.539655] [ 25%] Building CXX object a.o", True, ENTRY_OBJECT, "a.o"),
+            ("[12:51:27.539655] [ 25%] Building object a.o", True, ENTRY_UNKNOWN, None),
+            ("[12:51:27.539655] [ 25%] Building C object Linking b.o", True, ENTRY_OBJECT, "Linking b.o"),
+            ("prefix [12:51:27.539655] [ 25%] Linking CXX executable x", True, ENTRY_LINKING, "CXX executable x"),
+            ("[12:51:27.539655] [a] [b] Built target x", True, ENTRY_TARGET, "x"),
+            ("[12:51:27.539655] [ 25%] Built target", True, ENTRY_UNKNOWN, None),
+            ("[2024-01-02 12:51:27.539655] [ 25%] Scanning dependencies of target x", True, ENTRY_UNKNOWN, None),
+        ]
+        classifier = LineClassifier()
+        for line, has_time, expected_kind, expected_payload in cases:
+            line_time, kind, payload = classifier.classify(line)
+            self.assertEqual(has_time, line_time is not None, line)
+            self.assertEqual((expected_kind, expected_payload), (kind, payload), line)
@@ -0,0 +1,69 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+import sys
+import os
+import tempfile
+
+from maketime.runner import BuildRunner
+from maketime.parser import read_compile_log
+
+
+BUILD_SCRIPT = """
+import sys
+import time
+print("[ 25%] Building CXX object CMakeFiles/hello.dir/src/Hello.cpp.o", flush=True)
+time.sleep(0.05)
+print("warning: something", file=sys.stderr, flush=True)
+print("[ 50%] Linking CXX static library libhello.a", flush=True)
+time.sleep(0.02)
+print("[ 50%] Built target hello", flush=True)
+sys.exit(3)
+"""
+
+
+class BuildRunnerTest(unittest.TestCase):
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "compile-log.txt")
+            runner = BuildRunner(log_path, echo=False)
+            exit_code = runner.run([sys.executable, "-c", BUILD_SCRIPT])
+            self.assertEqual(3, exit_code)
+            self.assertTrue(runner.started)
+
+            compile_list = runner.build_log.get_compile_list()
+            self.assertEqual(2, len(compile_list))
+            self.assertEqual("hello", compile_list[1]["target"])
+            object_name, object_time = compile_list[1]["objects"][0]
+            self.assertEqual("CMakeFiles/hello.dir/src/Hello.cpp.o", object_name)
+            self.assertGreaterEqual(object_time, 0.05)
+            self.assertGreaterEqual(compile_list[1]["link_time"], 0.02)
+
+            ## stored log gives the same results
+            self.assertEqual(compile_list, read_compile_log(log_path))
+
+    def test_run_invalid_command(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "compile-log.txt")
+            runner = BuildRunner(log_path, echo=False)
+            with self.assertLogs("maketime.runner", level="ERROR"):
+                exit_code = runner.run([os.path.join(tmp_dir, "no-such-cmd")])
+            self.assertEqual(127, exit_code)
+            self.assertFalse(runner.started)
+            self.assertFalse(os.path.exists(log_path))
+
+            script_path = os.path.join(tmp_dir, "script.sh")
+            with open(script_path, "w", encoding="utf-8") as script_file:
+                script_file.write("#!/bin/sh\n")
+            with self.assertLogs("maketime.runner", level="ERROR"):
+                exit_code = runner.run([script_path])
+            self.assertEqual(126, exit_code)
+            self.assertFalse(os.path.exists(log_path))
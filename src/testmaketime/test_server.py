@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import sys
+import stat
+import tempfile
+import threading
+import unittest
+
+from maketime.client import send_request
+from maketime.server import LocalRequest, ToolServer, is_server_running
+from maketime.main import create_parser, is_local_request
+
+
+def execute_args(args_list):
+    if not args_list:
+        raise SystemExit(2)
+    if args_list[0] == "fail":
+        raise ValueError("invalid value")
+    if args_list[0] == "local":
+        raise LocalRequest()
+    print(" ".join(args_list))
+    sys.stderr.write(os.getcwd() + "\n")
+    return 3
+
+
+class ToolServerTest(unittest.TestCase):
+
+    def setUp(self):
+        ## pylint: disable=R1732
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temp_dir.name, "maketime.sock")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_no_server(self):
+        self.assertFalse(is_server_running(self.socket_path))
+        self.assertEqual(None, send_request(["--listtools"], self.socket_path))
+
+    def test_request(self):
+        work_dir = os.getcwd()
+        with ToolServer(self.socket_path, execute_args) as server:
+            server_thread = threading.Thread(target=server.serve_forever)
+            server_thread.start()
+            try:
+                self.assertTrue(is_server_running(self.socket_path))
+                self.assertEqual(0o600, stat.S_IMODE(os.stat(self.socket_path).st_mode))
+                response = send_request(["-clf", "log.txt"], self.socket_path)
+                self.assertEqual(3, response["exit_code"])
+                self.assertEqual("-clf log.txt\n", response["stdout"])
+                self.assertEqual(work_dir + "\n", response["stderr"])
+
+                response = send_request([], self.socket_path)
+                self.assertEqual(2, response["exit_code"])
+
+                response = send_request(["fail"], self.socket_path)
+                self.assertEqual(1, response["exit_code"])
+                self.assertIn("ValueError: invalid value", response["stderr"])
+
+                response = send_request(["local"], self.socket_path)
+                self.assertEqual({"local": True}, response)
+            finally:
+                server.shutdown()
+                server_thread.join()
+        self.assertEqual(work_dir, os.getcwd())
+
+
+class LocalRequestTest(unittest.TestCase):
+
+    def test_is_local(self):
+        parser = create_parser()[0]
+        for args_list in [
+            ["run", "--", "make"],
+            ["serve"],
+            ["--follow", "-clf", "log.txt"],
+            ["--fol", "-clf", "log.txt"],
+            ["-clf", "-"],
+            ["diff", "old.txt", "-"],
+            ["aggregate", "logs", "-"],
+        ]:
+            self.assertTrue(is_local_request(parser.parse_args(args_list)), args_list)
+        for args_list in [
+            ["-clf", "run"],
+            ["-clf", "serve", "--outfile", "run"],
+            ["diff", "run", "serve"],
+            ["trace", "--outfile", "serve", "run"],
+        ]:
+            self.assertFalse(is_local_request(parser.parse_args(args_list)), args_list)
@@ -0,0 +1,65 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from maketime.simulate import build_graph, simulate_build, parse_graphviz_dependencies
+
+
+TARGETS_LIST = [
+    {"total_time": 9.0},
+    {"target": "liba", "build_time": 5.0, "link_time": 1.0, "objects": [("a1.o", 2.0), ("a2.o", 2.0)]},
+    {"target": "app", "build_time": 4.0, "link_time": 1.0, "objects": [("b1.o", 3.0)]},
+]
+
+GRAPHVIZ_CONTENT = """digraph "project" {
+node [ fontsize = "12" ];
+    "node0" [ label = "app", shape = egg ];
+    "node1" [ label = "liba", shape = octagon ];
+    "node0" -> "node1" [ style = dotted ] // app -> liba
+    "node2" [ label = "pthread", shape = septagon ];
+    "node1" -> "node2" [ style = dotted ] // liba -> pthread
+}
+"""
+
+
+class SimulateTest(unittest.TestCase):
+
+    def test_chain(self):
+        graph = build_graph(TARGETS_LIST)
+        self.assertEqual(7, graph.nodes_num())
+        result = simulate_build(graph, [1, 2])
+        self.assertEqual(9.0, result["serial_time"])
+        self.assertEqual(7.0, result["critical_time"])
+        self.assertEqual(
+            [("object", "a1.o"), ("link", "liba"), ("object", "b1.o"), ("link", "app")],
+            [(item["kind"], item["name"]) for item in result["critical_path"]],
+        )
+        self.assertEqual([9.0, 7.0], [item["wall_time"] for item in result["jobs"]])
+
+    def test_independent(self):
+        graph = build_graph(TARGETS_LIST, {})
+        result = simulate_build(graph, [2, 8])
+        self.assertEqual(4.0, result["critical_time"])
+        self.assertEqual([5.0, 4.0], [item["wall_time"] for item in result["jobs"]])
+
+    def test_graphviz(self):
+        deps_dict = parse_graphviz_dependencies(GRAPHVIZ_CONTENT.splitlines())
+        self.assertEqual({"app": {"liba"}, "liba": {"pthread"}}, deps_dict)
+        graph = build_graph(TARGETS_LIST, deps_dict)
+        result = simulate_build(graph, [2])
+        self.assertEqual(7.0, result["critical_time"])
+        self.assertEqual(7.0, result["jobs"][0]["wall_time"])
+
+    def test_invalid_workers(self):
+        graph = build_graph(TARGETS_LIST)
+        self.assertRaises(ValueError, simulate_build, graph, [2, 0])
+
+    def test_cycle(self):
+        graph = build_graph(TARGETS_LIST, {"app": {"liba"}, "liba": {"app"}})
+        self.assertRaises(ValueError, simulate_build, graph, [2])
@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import unittest
+
+from maketime.store import CompileStore, TopCompileStore, SummaryCompileStore, push_bounded
+from maketime.parser import BuildLog, parse_compile_lines
+
+from testmaketime.test_multiparser import generate_log
+
+
+class CompileStoreTest(unittest.TestCase):
+
+    def test_to_list(self):
+        store = CompileStore()
+        store.add_object("CMakeFiles/lib.dir/src/a.cpp.o", 1500000)
+        store.add_object("CMakeFiles/lib.dir/src/b.cpp.o", 2500000)
+        store.add_target("lib", 5000000, 1000000)
+        store.add_target("empty", 500000, 0)
+        store.add_object("CMakeFiles/app.dir/main.cpp.o", 7000000)
+        store.add_target("app", 8000000, 1000000)
+        store.add_object("CMakeFiles/app.dir/next.cpp.o", 1000000)
+
+        self.assertEqual(2, len(store.prefixes))
+        self.assertEqual(range(3, 4), store.get_pending_range())
+
+        compile_list = store.to_list(sort_data=False)
+        self.assertEqual(
+            [
+                {
+                    "target": "lib",
+                    "build_time": 5.0,
+                    "link_time": 1.0,
+                    "objects": [("CMakeFiles/lib.dir/src/a.cpp.o", 1.5), ("CMakeFiles/lib.dir/src/b.cpp.o", 2.5)],
+                },
+                {"target": "empty", "build_time": 0.5, "link_time": 0.0, "objects": []},
+                {
+                    "target": "app",
+                    "build_time": 8.0,
+                    "link_time": 1.0,
+                    "objects": [("CMakeFiles/app.dir/main.cpp.o", 7.0)],
+                },
+            ],
+            compile_list,
+        )
+
+        compile_list = store.to_list(sort_data=True)
+        self.assertEqual(["app", "lib", "empty"], [item["target"] for item in compile_list])
+        self.assertEqual(("CMakeFiles/lib.dir/src/b.cpp.o", 2.5), compile_list[1]["objects"][0])
+
+    def test_extend(self):
+        store = CompileStore()
+        store.add_object("CMakeFiles/lib.dir/a.cpp.o", 1000000)
+        store.add_target("lib", 2000000, 0)
+        other = CompileStore()
+        other.add_object("CMakeFiles/app.dir/main.cpp.o", 3000000)
+        other.add_object("CMakeFiles/lib.dir/b.cpp.o", 4000000)
+        other.add_target("app", 8000000, 0)
+
+        store.extend(other)
+        self.assertEqual(2, store.targets_num())
+        self.assertEqual(range(1, 3), store.get_objects_range(1))
+        self.assertEqual(("CMakeFiles/lib.dir/b.cpp.o", 4.0), store.get_object(2))
+        self.assertEqual(2, len(store.prefixes))
+
+
+class TopCompileStoreTest(unittest.TestCase):
+
+    def test_to_list(self):
+        store = TopCompileStore(2)
+        store.add_object("a.o", 1000000)
+        store.add_object("b.o", 3000000)
+        store.add_object("c.o", 2000000)
+        store.add_target("lib", 7000000, 1000000)
+        store.add_object("d.o", 2000000)
+        store.add_target("app", 3000000, 1000000)
+        store.add_object("e.o", 9000000)
+
+        self.assertEqual(5, store.objects_num())
+        self.assertEqual([("lib", "b.o", 3.0), ("lib", "c.o", 2.0)], store.get_top_objects())
+        self.assertEqual(
+            [
+                {
+                    "target": "lib",
+                    "build_time": 7.0,
+                    "link_time": 1.0,
+                    "objects_num": 3,
+                    "objects_time": 6.0,
+                    "objects": [("b.o", 3.0), ("c.o", 2.0)],
+                },
+                {
+                    "target": "app",
+                    "build_time": 3.0,
+                    "link_time": 1.0,
+                    "objects_num": 1,
+                    "objects_time": 2.0,
+                    "objects": [("d.o", 2.0)],
+                },
+            ],
+            store.to_list(),
+        )
+
+    def test_invalid_limit(self):
+        store = TopCompileStore(0)
+        self.assertRaises(ValueError, store.add_object, "a.o", 1000000)
+        self.assertRaises(ValueError, push_bounded, [], (1000000, "a.o"), -1)
+
+    def test_parse(self):
+        lines = generate_log(4, 6).splitlines()
+        compile_list = parse_compile_lines(lines)
+        top_list = parse_compile_lines(lines, build_log=BuildLog(TopCompileStore(3)))
+        self.assertEqual(len(compile_list), len(top_list))
+        for target_data, top_data in zip(compile_list[1:], top_list[1:]):
+            self.assertEqual(target_data["target"], top_data["target"])
+            self.assertEqual(target_data["objects"][:3], top_data["objects"])
+            self.assertEqual(len(target_data["objects"]), top_data["objects_num"])
+
+        summary_list = parse_compile_lines(lines, build_log=BuildLog(SummaryCompileStore()))
+        self.assertEqual(24, summary_list[0]["objects_num"])
+        self.assertAlmostEqual(sum(item[1] for item in compile_list[1]["objects"]), summary_list[1]["objects_time"])
+        self.assertNotIn("objects", summary_list[1])
@@ -0,0 +1,93 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import os
+import json
+import tempfile
+import unittest
+
+from maketime.timetrace import parse_trace_file, find_object_traces, find_dir_traces, collect_traces
+
+
+def create_trace(compiler_time, header_time, template_time):
+    return {
+        "traceEvents": [
+            {"ph": "X", "name": "Source", "ts": 10, "dur": header_time, "args": {"detail": "/usr/include/vector"}},
+            {"ph": "X", "name": "InstantiateClass", "ts": 20, "dur": template_time, "args": {"detail": "Foo<int>"}},
+            {"ph": "X", "name": "Frontend", "ts": 0, "dur": compiler_time // 2},
+            {"ph": "X", "name": "Total Frontend", "ts": 0, "dur": compiler_time // 2},
+            {"ph": "X", "name": "ExecuteCompiler", "ts": 0, "dur": compiler_time},
+            {"ph": "M", "name": "process_name", "args": {"name": "clang"}},
+        ]
+    }
+
+
+def write_trace(file_path, trace_data):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as trace_file:
+        json.dump(trace_data, trace_file)
+
+
+class TimeTraceTest(unittest.TestCase):
+
+    def test_parse_trace_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            trace_path = os.path.join(temp_dir, "a.cpp.json")
+            write_trace(trace_path, create_trace(1000, 300, 200))
+            items, total_time = parse_trace_file(trace_path)
+            self.assertEqual(1000, total_time)
+            self.assertEqual({"Frontend": 500}, items["phases"])
+            self.assertEqual({"/usr/include/vector": 300}, items["headers"])
+            self.assertEqual({"Foo<int>": 200}, items["templates"])
+
+    def test_collect_weighted(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            obj_dir = os.path.join(temp_dir, "CMakeFiles", "app.dir")
+            write_trace(os.path.join(obj_dir, "a.cpp.json"), create_trace(1000, 300, 200))
+            write_trace(os.path.join(obj_dir, "b.cpp.json"), create_trace(2000, 1000, 0))
+            compile_list = [
+                {"total_time": 5.0},
+                {
+                    "target": "app",
+                    "objects": [
+                        ("CMakeFiles/app.dir/a.cpp.o", 2.0),
+                        ("CMakeFiles/app.dir/b.cpp.o", 2.0),
+                        ("CMakeFiles/app.dir/c.cpp.o", 1.0),
+                    ],
+                },
+            ]
+            traces_list = find_object_traces(temp_dir, compile_list)
+            self.assertEqual(2, len(traces_list))
+            self.assertEqual(2000000, traces_list[0][1])
+
+            collector = collect_traces(traces_list, jobs=1)
+            summary = collector.get_summary()
+            self.assertEqual(2, summary["traces_num"])
+            self.assertAlmostEqual(4.0, summary["total_time"])
+            ## a: 300us * 2000, b: 1000us * 1000
+            self.assertEqual("/usr/include/vector", summary["headers"][0]["name"])
+            self.assertAlmostEqual(1.6, summary["headers"][0]["time"])
+            self.assertEqual(2, summary["headers"][0]["count"])
+            self.assertAlmostEqual(0.4, summary["templates"][0]["time"])
+            self.assertAlmostEqual(2.0, summary["phases"][0]["time"])
+
+    def test_collect_dir(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            obj_dir = os.path.join(temp_dir, "CMakeFiles", "app.dir")
+            write_trace(os.path.join(obj_dir, "a.cpp.json"), create_trace(1000, 300, 200))
+            write_trace(os.path.join(temp_dir, "compile_commands.json"), [])
+            with open(os.path.join(obj_dir, "a.cpp.o"), "wb"):
+                pass
+            traces_list = find_dir_traces(temp_dir)
+            self.assertEqual([(os.path.join(obj_dir, "a.cpp.json"), None)], traces_list)
+
+            summary = collect_traces(traces_list * 3, jobs=2).get_summary(limit=1)
+            self.assertEqual(3, summary["traces_num"])
+            self.assertAlmostEqual(0.003, summary["total_time"])
+            self.assertAlmostEqual(0.0009, summary["headers"][0]["time"])
+            self.assertEqual(3, summary["headers"][0]["count"])
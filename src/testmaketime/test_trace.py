@@ -0,0 +1,50 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import json
+import unittest
+
+from maketime.trace import TraceExporter
+
+CONTENT = """warning: line without timestamp
+[15:20:55.038095] [  0%] Generating Header.h
+[15:20:57.329023] [ 20%] Building CXX object Log.cpp.o
+[15:20:57.820038] [ 20%] Building CXX object LogUtils.cpp.o
+[15:20:58.396720] [ 40%] Linking CXX static library liblogger.a
+[15:20:58.470617] [ 50%] Built target logger
+[15:20:59.470617] [ 60%] Building CXX object Main.cpp.o
+"""
+
+
+class TraceExporterTest(unittest.TestCase):
+
+    def test_feed_lines(self):
+        out_file = io.StringIO()
+        exporter = TraceExporter(out_file)
+        exporter.feed_lines(CONTENT.encode().splitlines())
+        exporter.close()
+
+        trace_data = json.loads(out_file.getvalue())
+        events_list = [item for item in trace_data["traceEvents"] if item["ph"] != "M"]
+        slices_list = [
+            (item["cat"], item["name"], item["ts"], item["dur"]) for item in events_list if item["ph"] == "X"
+        ]
+        self.assertEqual(
+            [
+                ("step", "Generating Header.h", 0, 2290928),
+                ("object", "Log.cpp.o", 2290928, 491015),
+                ("object", "LogUtils.cpp.o", 2781943, 576682),
+                ("link", "link logger", 3358625, 73897),
+                ("target", "logger", 0, 3432522),
+                ("object", "Main.cpp.o", 4432522, 0),
+            ],
+            slices_list,
+        )
+        counters_list = [(item["ts"], item["args"]["progress"]) for item in events_list if item["ph"] == "C"]
+        self.assertEqual([(0, 0), (2290928, 20), (3358625, 40), (3432522, 50), (4432522, 60)], counters_list)
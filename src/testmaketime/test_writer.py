@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+import io
+import json
+import unittest
+
+from maketime.writer import write_json, write_compact_json, write_json_lines, write_csv
+from maketime.parser import print_log
+
+
+COMPILE_LIST = [
+    {"total_time": 10.5},
+    {"target": "lib", "build_time": 6.0, "link_time": 1.0, "objects": [("b.o", 3.0), ('a, "x".o', 2.0)]},
+    {"target": "empty", "build_time": 0.5, "link_time": 0.0, "objects": []},
+]
+
+
+class WriterTest(unittest.TestCase):
+
+    def test_write_json(self):
+        for records in ([], COMPILE_LIST[:1], COMPILE_LIST):
+            out_file = io.StringIO()
+            write_json(records, out_file)
+            self.assertEqual(json.dumps(records, indent=4), out_file.getvalue())
+
+    def test_write_compact_json(self):
+        for records in ([], COMPILE_LIST):
+            out_file = io.StringIO()
+            write_compact_json(records, out_file)
+            self.assertEqual(json.dumps(records, separators=(",", ":")), out_file.getvalue())
+
+    def test_write_json_lines(self):
+        out_file = io.StringIO()
+        write_json_lines(COMPILE_LIST, out_file)
+        lines = out_file.getvalue().splitlines()
+        self.assertEqual(json.loads(json.dumps(COMPILE_LIST)), [json.loads(line) for line in lines])
+
+    def test_write_csv(self):
+        out_file = io.StringIO()
+        write_csv(COMPILE_LIST, out_file)
+        self.assertEqual(
+            "target,build_time,link_time,object,object_time\r\n"
+            "lib,6.0,1.0,b.o,3.0\r\n"
+            'lib,6.0,1.0,"a, ""x"".o",2.0\r\n'
+            "empty,0.5,0.0,,\r\n",
+            out_file.getvalue(),
+        )
+
+    def test_print_log(self):
+        out_stream = io.StringIO()
+        print_log(COMPILE_LIST, out_stream, batch_size=2)
+        self.assertEqual(
+            "total_time: 10.5 sec\n"
+            "target: lib\n"
+            "build time: 6.0 sec\n"
+            "link time:  1.0 sec\n"
+            "objects:\n"
+            "   b.o            3.000000 sec\n"
+            '   a, "x".o       2.000000 sec\n'
+            "target: empty\n"
+            "build time: 0.5 sec\n"
+            "link time:  0.0 sec\n"
+            "objects:\n",
+            out_stream.getvalue(),
+        )
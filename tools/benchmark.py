@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Script measures throughput of parser on compile log (given or generated by 'genlog.py').
+# Phases are measured by consecutive passes over the log, each pass adds one phase to previous
+# one, so log of any size is processed without keeping its lines in memory. Results can be stored
+# as baseline JSON and compared between revisions.
+#
+
+import sys
+import os
+import io
+import json
+import time
+import platform
+import tempfile
+import subprocess
+
+import argparse
+
+try:
+    import resource
+except ImportError:
+    ## not available on Windows
+    resource = None
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.append(os.path.abspath(os.path.join(SCRIPT_DIR, "..", "src")))
+
+
+# pylint: disable=C0413
+from genlog import LogGenerator, parse_size, write_log
+from maketime.io import read_lines_mmap
+from maketime.parser import BytesLineClassifier, parse_build_log, get_compile_list, print_log
+from maketime.writer import write_compile_list
+
+
+PHASES = ["read", "classify", "timestamp", "aggregate", "output"]
+
+
+def pass_read(log_path):
+    lines_num = 0
+    for _ in read_lines_mmap(log_path):
+        lines_num += 1
+    return lines_num
+
+
+## find timestamp brackets and classify content, but do not decode timestamps
+def pass_classify(log_path):
+    classifier = BytesLineClassifier()
+    findall = classifier.timestamp_regex.findall
+    classify_content = classifier.classify_content
+    for line in read_lines_mmap(log_path):
+        if findall(line):
+            classify_content(line.strip())
+
+
+def pass_timestamp(log_path):
+    classify = BytesLineClassifier().classify
+    for line in read_lines_mmap(log_path):
+        classify(line)
+
+
+def pass_aggregate(log_path):
+    return parse_build_log(read_lines_mmap(log_path), BytesLineClassifier())
+
+
+def pass_output(log_path):
+    build_log = parse_build_log(read_lines_mmap(log_path), BytesLineClassifier())
+    compile_list = get_compile_list(build_log, True)
+    write_compile_list(compile_list, os.devnull, "json")
+    print_log(compile_list, io.StringIO())
+
+
+PASSES = [pass_read, pass_classify, pass_timestamp, pass_aggregate, pass_output]
+
+
+## returns best duration of each pass
+def measure_passes(log_path, repeat):
+    durations = [None] * len(PASSES)
+    for _ in range(repeat):
+        for index, pass_function in enumerate(PASSES):
+            start_time = time.perf_counter()
+            pass_function(log_path)
+            duration = time.perf_counter() - start_time
+            if durations[index] is None or duration < durations[index]:
+                durations[index] = duration
+    return durations
+
+
+## returns peak resident set size in KB
+def get_peak_rss():
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        ## bytes on macOS
+        peak_rss //= 1024
+    return peak_rss
+
+
+def get_revision():
+    try:
+        result = subprocess.run(
+            ["git", "describe", "--always", "--dirty"], cwd=SCRIPT_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_benchmark(log_path, repeat):
+    lines_num = pass_read(log_path)
+    durations = measure_passes(log_path, repeat)
+    phases_dict = {}
+    prev_duration = 0.0
+    for phase, duration in zip(PHASES, durations):
+        phases_dict[phase] = max(duration - prev_duration, 0.0)
+        prev_duration = duration
+    ## parse time covers all phases except output
+    parse_time = durations[PHASES.index("aggregate")]
+    return {
+        "revision": get_revision(),
+        "python": platform.python_version(),
+        "log_size": os.path.getsize(log_path),
+        "lines": lines_num,
+        "parse_time": parse_time,
+        "total_time": durations[-1],
+        "lines_per_sec": lines_num / parse_time if parse_time > 0.0 else None,
+        "peak_rss_kb": get_peak_rss(),
+        "phases": phases_dict,
+    }
+
+
+def print_results(results, baseline=None):
+    print(f"revision:     {results['revision']}")
+    print(f"log size:     {results['log_size']} bytes")
+    print(f"lines:        {results['lines']}")
+    print(f"peak RSS:     {results['peak_rss_kb']} KB")
+    rows_list = [(f"{phase} time", results["phases"][phase], "phases", phase) for phase in PHASES]
+    rows_list.append(("parse time", results["parse_time"], None, "parse_time"))
+    rows_list.append(("total time", results["total_time"], None, "total_time"))
+    rows_list.append(("lines/sec", results["lines_per_sec"], None, "lines_per_sec"))
+    for label, value, group, key in rows_list:
+        line = f"{label + ':': <16} {value:14.3f}"
+        if baseline is not None:
+            base_value = baseline.get(group, {}).get(key) if group else baseline.get(key)
+            if base_value:
+                line += f"   baseline: {base_value:14.3f}   change: {(value - base_value) / base_value * 100.0:+7.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="benchmark of parser throughput", formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "--log", action="store", default=None, help="Compile log to measure (if not given then generated)"
+    )
+    parser.add_argument("--size", action="store", default="20MB", help="Size of generated log (e.g. 500KB, 1GB)")
+    parser.add_argument("--seed", action="store", type=int, default=0, help="Seed of log generator")
+    parser.add_argument("--repeat", action="store", type=int, default=3, help="Number of measurements (best is taken)")
+    parser.add_argument("--save", action="store", default=None, help="Path to store results as baseline JSON")
+    parser.add_argument("--compare", action="store", default=None, help="Path to baseline JSON to compare with")
+    parser.add_argument(
+        "--tolerance",
+        action="store",
+        type=float,
+        default=None,
+        help="Allowed drop of lines/sec against baseline in percents (exit code 1 when exceeded)",
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    if args.log:
+        results = run_benchmark(args.log, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            log_path = os.path.join(temp_dir, "compile-log.txt")
+            with open(log_path, "w", encoding="utf-8", buffering=1024 * 1024) as log_file:
+                write_log(log_file, LogGenerator(args.seed), size=parse_size(args.size))
+            results = run_benchmark(log_path, args.repeat)
+
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as results_file:
+            json.dump(results, results_file, indent=4)
+
+    if baseline is not None and args.tolerance is not None:
+        base_speed = baseline.get("lines_per_sec")
+        if base_speed and results["lines_per_sec"] < base_speed * (1.0 - args.tolerance / 100.0):
+            print(f"throughput dropped more than {args.tolerance}% against baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
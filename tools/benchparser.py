@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Script compares speed of line classification: per-line regex calls (get_after and get_build_timestamp)
+# against precompiled LineClassifier.
+#
+
+import sys
+import os
+import re
+import time
+from datetime import datetime
+
+import argparse
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.append(os.path.abspath(os.path.join(SCRIPT_DIR, "..", "src")))
+
+
+# pylint: disable=C0413
+from maketime.parser import LineClassifier, MICROSECONDS_PER_DAY
+
+
+def generate_lines(targets_num, objects_num):
+    lines = []
+    seconds = 0
+    for target_index in range(targets_num):
+        target_name = f"target_{target_index}"
+        for object_index in range(objects_num):
+            seconds += 1
+            time_text = f"{seconds // 3600 % 24:02}:{seconds // 60 % 60:02}:{seconds % 60:02}.{seconds % 1000000:06}"
+            object_name = f"CMakeFiles/{target_name}.dir/src/obj_{object_index}.cpp.o"
+            lines.append(f"[{time_text}] [ 50%] Building CXX object {object_name}")
+            lines.append(f"[{time_text}] In file included from /usr/include/c++/bits/stl_algo.h:{object_index}:")
+        lines.append(f"[{time_text}] [ 50%] Linking CXX static library lib{target_name}.a")
+        lines.append(f"[{time_text}] [ 50%] Built target {target_name}")
+    return lines
+
+
+## implementation before LineClassifier: regex compiled and searched for each line and marker
+def get_after(content, substring):
+    found = re.search(rf"({substring})(.*)$", content)
+    if not found:
+        # not found
+        return None
+    found_groups = found.groups()
+    if not found_groups:
+        # not found
+        return None
+    last_group = found_groups[-1]
+    return last_group
+
+
+def get_build_timestamp(content):
+    time_list = re.findall(r"\[(.*?)\] \[", content)
+    if len(time_list) != 1:
+        return None
+    return decode_timestamp(time_list[0])
+
+
+def decode_timestamp(time_text):
+    try:
+        return datetime.strptime(time_text, "%H:%M:%S.%f")
+    except ValueError:
+        # content does not match format
+        pass
+    try:
+        return datetime.strptime(time_text, "%Y-%m-%d %H:%M:%S.%f")
+    except ValueError:
+        # content does not match format
+        pass
+
+    raise RuntimeError(f"unable to get time form content: {time_text}")
+
+
+def classify_legacy(line):
+    line = line.strip()
+    line_time = get_build_timestamp(line)
+    object_name = get_after(line, r"Building \S+ object ")
+    if object_name:
+        return line_time, 1, object_name
+    linking_name = get_after(line, "Linking ")
+    if linking_name:
+        return line_time, 2, linking_name
+    target_name = get_after(line, "Built target ")
+    if target_name:
+        return line_time, 3, target_name
+    return line_time, 0, None
+
+
+## convert results to comparable form (time of day in microseconds)
+def normalize(results):
+    ret_list = []
+    for line_time, kind, payload in results:
+        if line_time is None:
+            ret_list.append((None, kind, payload))
+            continue
+        if not isinstance(line_time, int):
+            seconds = (line_time.hour * 60 + line_time.minute) * 60 + line_time.second
+            line_time = seconds * 1000000 + line_time.microsecond
+        ret_list.append((line_time % MICROSECONDS_PER_DAY, kind, payload))
+    return ret_list
+
+
+def measure(label, classify, lines):
+    start_time = time.perf_counter()
+    results = [classify(line) for line in lines]
+    duration = time.perf_counter() - start_time
+    print(f"{label: <12} {duration:9.3f} sec {len(lines) / duration:12.0f} lines/sec")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark of log line classification")
+    parser.add_argument("--targets", action="store", type=int, default=100, help="Number of targets")
+    parser.add_argument("--objects", action="store", type=int, default=500, help="Number of objects per target")
+    args = parser.parse_args()
+
+    lines = generate_lines(args.targets, args.objects)
+    print("lines:", len(lines))
+    before = measure("before:", classify_legacy, lines)
+    after = measure("after:", LineClassifier().classify, lines)
+    if normalize(before) != normalize(after):
+        print("results differ")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
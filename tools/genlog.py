@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2024, Arkadiusz Netczuk <dev.arnet@gmail.com>
+# All rights reserved.
+#
+# This source code is licensed under the BSD 3-Clause license found in the
+# LICENSE file in the root directory of this source tree.
+#
+
+#
+# Script generates synthetic compile log of CMake project timestamped by 'ts' (e.g. for benchmarks).
+# Output is deterministic for given seed and arguments.
+#
+
+import sys
+import random
+import datetime
+
+import argparse
+
+
+TIME_FORMATS = ["time", "datetime"]
+
+SIZE_UNITS = {"KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+START_DATE = datetime.date(2024, 1, 15)
+
+LIBRARY_KINDS = ["static library lib{}.a", "shared library lib{}.so", "executable {}"]
+
+
+class LogGenerator:
+    """Generator of lines of compile log.
+
+    Objects count of target is random around given mean, compilation and link times are log-normal.
+    Besides progress lines there are noise lines (make, dependencies scanning) and compiler warnings.
+    """
+
+    def __init__(self, seed=0, *, objects=50, noise=0.5, warnings=0.05, time_format="time", start_secs=8 * 3600):
+        self.random = random.Random(seed)
+        self.objects = objects
+        self.noise = noise
+        self.warnings = warnings
+        self.time_format = time_format
+        self.usecs = start_secs * 1000000
+        self._day_index = None
+        self._day_prefix = ""
+
+    ## generate log of given number of targets or of size (in bytes) at least given
+    def generate_lines(self, targets_num=None, size=None):
+        if targets_num is None and size is None:
+            raise ValueError("number of targets or size has to be given")
+        counts_list = None
+        total_objects = 1
+        if targets_num is not None:
+            counts_list = [self.get_objects_num() for _ in range(targets_num)]
+            total_objects = max(sum(counts_list), 1)
+        done_objects = 0
+        written_size = 0
+        target_index = 0
+        while True:
+            if counts_list is not None:
+                if target_index >= len(counts_list):
+                    break
+                objects_num = counts_list[target_index]
+            else:
+                if written_size >= size:
+                    break
+                objects_num = self.get_objects_num()
+            if counts_list is not None:
+                progress = done_objects * 100 // total_objects
+            else:
+                progress = min(written_size * 100 // size, 99)
+            lines_list = self.generate_target(target_index, objects_num, progress)
+            for line in lines_list:
+                written_size += len(line) + 1
+            yield from lines_list
+            done_objects += objects_num
+            target_index += 1
+
+    def get_objects_num(self):
+        if self.random.random() < 0.05:
+            ## custom target (e.g. generating code)
+            return 0
+        return self.random.randint(1, max(2 * self.objects - 1, 1))
+
+    def generate_target(self, target_index, objects_num, progress):
+        rand = self.random
+        target_name = f"module_{target_index}"
+        target_dir = f"src/{target_name}"
+        lines_list = []
+        append = lines_list.append
+        append(f"{self.format_time()} Scanning dependencies of target {target_name}")
+        self.advance(0.05)
+        append(f"{self.format_time()} Consolidate compiler generated dependencies of target {target_name}")
+        self.advance(0.02)
+        if objects_num == 0 or rand.random() < 0.1:
+            append(f"{self.format_time()} [{progress:3}%] Generating {target_name}_config.h")
+            self.advance(rand.lognormvariate(-1.0, 0.5))
+        for object_index in range(objects_num):
+            language, extension = ("C", "c") if rand.random() < 0.1 else ("CXX", "cpp")
+            source_name = f"source_{object_index}.{extension}"
+            object_name = f"{target_dir}/CMakeFiles/{target_name}.dir/{source_name}.o"
+            append(f"{self.format_time()} [{progress:3}%] Building {language} object {object_name}")
+            duration = rand.lognormvariate(0.0, 0.8)
+            if rand.random() < self.warnings:
+                self.advance(duration * 0.8)
+                line_num = rand.randint(1, 999)
+                time_text = self.format_time()
+                append(
+                    f"{time_text} /home/user/project/{target_dir}/{source_name}:{line_num}:9: "
+                    "warning: unused variable 'value' [-Wunused-variable]"
+                )
+                append(f"{time_text} {line_num:5} |     int value = 0;")
+                append(f"{time_text}       |         ^~~~~")
+                duration *= 0.2
+            self.advance(duration)
+            if rand.random() < self.noise:
+                append(f"{self.format_time()} make[2]: Leaving directory '/home/user/project/build'")
+        if objects_num > 0:
+            link_kind = LIBRARY_KINDS[target_index % len(LIBRARY_KINDS)].format(target_name)
+            append(f"{self.format_time()} [{progress:3}%] Linking {language} {link_kind}")
+            self.advance(rand.lognormvariate(0.5, 0.8))
+        append(f"{self.format_time()} [{progress:3}%] Built target {target_name}")
+        self.advance(0.01)
+        return lines_list
+
+    ## seconds: float
+    def advance(self, seconds):
+        self.usecs += int(seconds * 1000000)
+
+    def format_time(self):
+        usecs = self.usecs
+        secs = usecs // 1000000
+        time_text = f"{secs // 3600 % 24:02}:{secs // 60 % 60:02}:{secs % 60:02}.{usecs % 1000000:06}"
+        if self.time_format == "time":
+            return f"[{time_text}]"
+        day_index = secs // 86400
+        if day_index != self._day_index:
+            self._day_index = day_index
+            self._day_prefix = (START_DATE + datetime.timedelta(days=day_index)).isoformat()
+        return f"[{self._day_prefix} {time_text}]"
+
+
+## size: text, e.g. "200MB" or "1GB" or number of bytes
+def parse_size(size_text):
+    size_text = size_text.strip().upper()
+    for unit, multiplier in SIZE_UNITS.items():
+        if size_text.endswith(unit):
+            return int(float(size_text[: -len(unit)]) * multiplier)
+    return int(size_text)
+
+
+def write_log(out_file, generator, targets_num=None, size=None, batch_size=4096):
+    lines_list = []
+    for line in generator.generate_lines(targets_num, size):
+        lines_list.append(line)
+        if len(lines_list) >= batch_size:
+            lines_list.append("")
+            out_file.write("\n".join(lines_list))
+            lines_list.clear()
+    if lines_list:
+        lines_list.append("")
+        out_file.write("\n".join(lines_list))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="generate synthetic compile log of CMake project timestamped by 'ts'",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument("--seed", action="store", type=int, default=0, help="Seed of random generator")
+    parser.add_argument("--targets", action="store", type=int, default=100, help="Number of targets")
+    parser.add_argument(
+        "--size", action="store", default=None, help="Minimal size of log (e.g. 500KB, 200MB, 1GB), overrides targets"
+    )
+    parser.add_argument("--objects", action="store", type=int, default=50, help="Mean number of objects per target")
+    parser.add_argument("--noise", action="store", type=float, default=0.5, help="Probability of noise line per object")
+    parser.add_argument(
+        "--warnings", action="store", type=float, default=0.05, help="Probability of warning per object"
+    )
+    parser.add_argument(
+        "--timeformat", action="store", choices=TIME_FORMATS, default="time", help="Format of timestamps"
+    )
+    parser.add_argument("--outfile", action="store", default="", help="Path to output file (if not given then stdout)")
+    args = parser.parse_args()
+
+    generator = LogGenerator(
+        args.seed, objects=args.objects, noise=args.noise, warnings=args.warnings, time_format=args.timeformat
+    )
+    targets_num = args.targets
+    size = None
+    if args.size:
+        targets_num = None
+        size = parse_size(args.size)
+    if not args.outfile:
+        write_log(sys.stdout, generator, targets_num, size)
+        return 0
+    with open(args.outfile, "w", encoding="utf-8", buffering=1024 * 1024) as out_file:
+        write_log(out_file, generator, targets_num, size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())